@@ -29,6 +29,10 @@ class Aircraft :
 
         self.engine_thrust      = 0.0
         self.required_thrust    = 0.0
+
+        # Callable returning the atmosphere at an altitude in m,
+        # an Atmosphere_Table.AtmosphereTable avoids rebuilding ambiance every step
+        self.atmosphere = Atmosphere
         
         pass
 
@@ -54,7 +58,7 @@ class Aircraft :
 
     def fly_aircraft(self, time, speed, altitude, engine:TurboFanEngine, flight_mode = 'cruise') :
 
-        air = Atmosphere(altitude)
+        air = self.atmosphere(altitude)
         
         engine.performAnalysis(speed, air)
 
@@ -64,7 +68,7 @@ class Aircraft :
 
         C_D = self.getDragCoefficient(C_L)
 
-        self.mass_fuel = self.mass_fuel - self.getMass() * (1.0 - np.exp(- C_L * air.grav_accel * time / (C_D * self.getTSFC())))
+        self.mass_fuel = self.mass_fuel - self.getMass() * (1.0 - np.exp(- C_L * air.grav_accel * time / (C_D * self.getTSFC(engine))))
 
         self.required_thrust = 0.5 * C_D * dynamic_pressure * self.area_wing
 
@@ -0,0 +1,134 @@
+import numpy as np
+
+from Aircraft import Aircraft
+from Turbofan_Engine import TurboFanEngine, EngineSpecification
+from Turbofan_Cycle import CycleParameters
+
+class AircraftFleet(Aircraft) :
+    '''N airframe variants held as one Aircraft whose attributes are arrays
+       of shape (N,) (the load factors too, per flight mode).
+
+       The methods of Aircraft then evaluate every variant at once :
+       fly_aircraft() advances the whole fleet by one time step, at speeds
+       and altitudes that are scalars or arrays of shape (N,), with an engine
+       whose parameters are arrays of shape (N,) (see stackEngines()), one
+       engine per variant, or scalars, the same engine for all. Works with
+       Mission as a single aircraft does, its flags being arrays of shape (N,).'''
+
+    _attributes = (
+        'area_inlet',
+        'area_wing',
+        'mass_structure',
+        'mass_payload',
+        'mass_fuel',
+        'C_D0',
+        'k_1',
+        'k_2',
+        'phi_inlet',
+        'phi_nozzle',
+    )
+
+    def __init__(self, size) -> None:
+
+        super().__init__()
+
+        if size >= 1 :
+
+            self.size = int(size)
+
+        else :
+
+            raise ValueError('Fleet size must be at least 1. Given value : ' + str(size))
+
+        for attribute in self._attributes :
+
+            setattr(self, attribute, np.full(self.size, getattr(self, attribute), dtype=float))
+
+        self.load_factor = {mode : np.full(self.size, value, dtype=float) for mode, value in self.load_factor.items()}
+
+        self.engine_thrust      = np.zeros(self.size)
+        self.required_thrust    = np.zeros(self.size)
+
+        pass
+
+    def __len__(self) :
+
+        return self.size
+
+    @staticmethod
+    def fromAircraft(aircraft) :
+        '''Returns the fleet of the given sequence of Aircraft, in order,
+           with the atmosphere of the first one'''
+
+        fleet = AircraftFleet(len(aircraft))
+
+        for attribute in AircraftFleet._attributes :
+
+            # Attributes of aircraft that flew are arrays of a single element
+            setattr(fleet, attribute, np.array([np.squeeze(getattr(variant, attribute)) for variant in aircraft], dtype=float))
+
+        fleet.load_factor = {
+            mode : np.array([np.squeeze(variant.load_factor[mode]) for variant in aircraft], dtype=float)
+            for mode in aircraft[0].load_factor
+        }
+
+        fleet.atmosphere = aircraft[0].atmosphere
+
+        return fleet
+
+    def getAircraft(self, index) -> Aircraft :
+        '''Returns variant index as an Aircraft'''
+
+        aircraft = Aircraft()
+
+        for attribute in self._attributes + ('engine_thrust', 'required_thrust') :
+
+            setattr(aircraft, attribute, float(np.broadcast_to(getattr(self, attribute), self.size)[index]))
+
+        aircraft.load_factor = {mode : float(np.broadcast_to(values, self.size)[index]) for mode, values in self.load_factor.items()}
+
+        aircraft.atmosphere = self.atmosphere
+
+        return aircraft
+
+def stackEngines(engines) -> TurboFanEngine :
+    '''Returns an engine whose parameters are arrays of shape (N,) holding
+       those of the N given engines, in order, to fly an AircraftFleet with
+       one engine per variant. Every engine needs scalar parameters, and the
+       same precision, exit rectification and masked validation settings.'''
+
+    specifications = [engine.getSpecification() for engine in engines]
+
+    settings = set(specification[1:] for specification in specifications)
+
+    if len(settings) != 1 :
+
+        raise ValueError('Engines must share their precision, exit rectification and masked validation settings. Given settings : ' + str(settings))
+
+    parameters = {}
+
+    for field in CycleParameters._fields :
+
+        values = [getattr(specification.parameters, field) for specification in specifications]
+
+        if all(value is None for value in values) :
+
+            parameters[field] = None
+
+        elif any(value is None for value in values) :
+
+            raise ValueError(field + ' must be set on every engine or on none.')
+
+        elif all(np.ndim(value) == 0 for value in values) :
+
+            parameters[field] = np.array(values)
+
+        else :
+
+            raise ValueError('Parameters of stacked engines must be scalars. Given value of ' + field + ' : ' + str(values))
+
+    engine = TurboFanEngine()
+
+    engine.setSpecification(EngineSpecification(CycleParameters(**parameters), *specifications[0][1:]))
+
+    return engine
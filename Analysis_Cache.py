@@ -0,0 +1,277 @@
+import os
+import hashlib
+import zipfile
+import tempfile
+import numpy as np
+
+from ambiance import Atmosphere
+
+from Turbofan_Cycle import getFlightConditions
+from Turbofan_Engine import TurboFanEngine
+
+class AnalysisCache :
+	'''On-disk cache of the getter outputs of TurboFanEngine analyses.
+
+	   Every analysis is stored in directory as an .npz file named by the
+	   SHA-256 of the engine specification (every parameter, the precision,
+	   the exit rectification and masked validation settings) and of the
+	   flight speed and conditions, so equal analyses share an entry across
+	   processes and sessions. Reading an entry refreshes its modification time, and once
+	   the entries exceed max_bytes the least recently used ones are removed.'''
+
+	_extension = '.npz'
+
+	def __init__(self, directory, max_bytes = 2 ** 30) :
+
+		if max_bytes > 0 :
+
+			self.max_bytes = int(max_bytes)
+
+		else :
+
+			raise ValueError('Cache size must be positive. Given value : ' + str(max_bytes))
+
+		self.directory = directory
+
+		os.makedirs(directory, exist_ok=True)
+
+		self.resetStatistics()
+
+		pass
+
+	@staticmethod
+	def _update(digest, value) :
+		'''Feeds value, an ndarray, a number, a string or None, into digest
+		   with its type, dtype and shape, so that different values cannot
+		   produce the same bytes'''
+
+		if value is None or isinstance(value, (str, bool)) :
+
+			digest.update(repr(value).encode())
+
+		else :
+
+			value = np.ascontiguousarray(value)
+
+			digest.update((value.dtype.str + str(value.shape)).encode())
+			digest.update(value.tobytes())
+
+		pass
+
+	def getKey(self, engine:TurboFanEngine, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+		'''Returns the key of the analysis of engine at the given flight speed and conditions'''
+
+		digest = hashlib.sha256()
+
+		specification = engine.getSpecification()
+
+		for name, value in specification.parameters._asdict().items() :
+
+			self._update(digest, name)
+			self._update(digest, value)
+
+		for value in specification[1:] :
+
+			self._update(digest, value)
+
+		# Flight speeds a masked engine accepts are keyed like any other
+		for name, value in getFlightConditions(flight_speed, flight_conditions, not specification.masked)._asdict().items() :
+
+			self._update(digest, name)
+			self._update(digest, np.asarray(value, dtype=float))
+
+		return digest.hexdigest()
+
+	def _getPath(self, key) :
+
+		return os.path.join(self.directory, key + self._extension)
+
+	def _read(self, key) :
+		'''Returns the outputs stored under key, None if there are none or they cannot be read'''
+
+		path = self._getPath(key)
+
+		try :
+
+			with np.load(path) as file :
+
+				outputs = {getter : file[getter] for getter in file.files}
+
+		except (OSError, ValueError, EOFError, zipfile.BadZipFile) :
+
+			return None
+
+		# Marks the entry as the most recently used one
+		os.utime(path)
+
+		return outputs
+
+	def _write(self, key, outputs) :
+
+		path = self._getPath(key)
+
+		# Written to a file of its own, so concurrent writers of the same
+		# entry do not interleave, then replaced atomically, so readers
+		# never see a partly written entry
+		descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+
+		try :
+
+			with os.fdopen(descriptor, 'wb') as file :
+
+				np.savez(file, **outputs)
+
+			os.replace(temporary_path, path)
+
+		except BaseException :
+
+			os.remove(temporary_path)
+
+			raise
+
+		pass
+
+	def _evict(self, keep) :
+		'''Removes the least recently used entries but keep until the entries fit in max_bytes'''
+
+		entries = []
+
+		for name in os.listdir(self.directory) :
+
+			if name.endswith(self._extension) :
+
+				try :
+
+					status = os.stat(os.path.join(self.directory, name))
+
+				except FileNotFoundError :
+
+					continue
+
+				entries.append((status.st_mtime, status.st_size, name))
+
+		total = sum(size for mtime, size, name in entries)
+
+		for mtime, size, name in sorted(entries) :
+
+			if total <= self.max_bytes :
+
+				break
+
+			if name == keep + self._extension :
+
+				continue
+
+			try :
+
+				os.remove(os.path.join(self.directory, name))
+
+			except FileNotFoundError :
+
+				pass
+
+			total -= size
+
+			self._evictions += 1
+
+		pass
+
+	def performAnalysis(self, engine:TurboFanEngine, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+		'''Returns a dict mapping the name of every getter of the quantities of
+		   TurboFanEngine.getQuantities(), e.g. getSpecificThrusts, to the array
+		   it returns after engine.performAnalysis(flight_speed, flight_conditions).
+		   On a hit the outputs are read from disk and engine is not used,
+		   on a miss the analysis is performed on engine and stored.'''
+
+		key = self.getKey(engine, flight_speed, flight_conditions)
+
+		outputs = self._read(key)
+
+		if outputs is not None :
+
+			self._hits += 1
+
+			return outputs
+
+		self._misses += 1
+
+		engine.performAnalysis(flight_speed, flight_conditions)
+
+		outputs = {getter : getattr(engine, getter)() for getter in engine._sweep_quantities}
+
+		self._write(key, outputs)
+		self._evict(key)
+
+		return outputs
+
+	def getStatistics(self) :
+		'''Returns the hits, misses and evictions since the cache was created
+		   or reset, and the number and total size in bytes of the entries on disk'''
+
+		sizes = [
+			entry.stat().st_size for entry in os.scandir(self.directory)
+			if entry.name.endswith(self._extension)
+		]
+
+		return {
+			'hits'		: self._hits,
+			'misses'	: self._misses,
+			'evictions'	: self._evictions,
+			'entries'	: len(sizes),
+			'bytes'		: sum(sizes),
+		}
+
+	def resetStatistics(self) :
+
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+		pass
+
+	def clear(self) :
+		'''Removes every entry'''
+
+		for name in os.listdir(self.directory) :
+
+			if name.endswith(self._extension) :
+
+				os.remove(os.path.join(self.directory, name))
+
+		pass
+
+if __name__ == '__main__' :
+
+	engine = TurboFanEngine()
+
+	engine.setFuelProperties(42.7984E6, 1.33, 1155.5568)
+	engine.setInletOutletProperties(0.99, 0.99, 0.99)
+	engine.setBurnerProperties(0.96, 0.99)
+	engine.setCompressorProperties(36, 0.9)
+	engine.setFanProperties(1.7, 0.89)
+	engine.setTurbineProperties(1666.67, 0.89, 0.99)
+	engine.setBypassRatio(8)
+
+	engine.initializeProblem()
+
+	# The first point is invalid, so only a masked engine can analyse it
+	engine.setMaskedValidation()
+
+	flight_conditions = Atmosphere(np.array([12E3, 12E3]))
+	flight_speed = np.array([-10.0, 0.8 * flight_conditions.speed_of_sound[1]])
+
+	with tempfile.TemporaryDirectory() as directory :
+
+		cache = AnalysisCache(directory)
+
+		stored = cache.performAnalysis(engine, flight_speed, flight_conditions)
+		read = cache.performAnalysis(engine, flight_speed, flight_conditions)
+
+		assert cache.getStatistics()['hits'] == 1
+		assert all(np.array_equal(stored[getter], read[getter], equal_nan=True) for getter in stored)
+
+		print('Validity :', engine.getValidity())
+		print('Specific Thrust :', read['getSpecificThrusts'][..., :1], 'N / (kg/s)')
+		print('Cache statistics :', cache.getStatistics())
+
+	pass
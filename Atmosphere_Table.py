@@ -0,0 +1,120 @@
+import numpy as np
+
+from ambiance import CONST, Atmosphere
+
+class AtmosphereConditions :
+	'''Free stream state returned by AtmosphereTable lookups.
+	   Exposes the attributes of ambiance.Atmosphere used in this package,
+	   so it can be passed wherever an Atmosphere is expected.'''
+
+	__slots__ = ('h', 'temperature', 'pressure', 'density', 'speed_of_sound', 'grav_accel')
+
+	def __init__(self, h, temperature, pressure, density, speed_of_sound, grav_accel) :
+
+		self.h = h
+		self.temperature = temperature
+		self.pressure = pressure
+		self.density = density
+		self.speed_of_sound = speed_of_sound
+		self.grav_accel = grav_accel
+
+		pass
+
+class AtmosphereTable :
+	'''ambiance.Atmosphere precomputed on a uniform altitude grid.
+
+	   Temperature and gravity are interpolated linearly, pressure and density
+	   linearly in their logarithm (exact within isothermal layers) and the
+	   speed of sound is evaluated from the interpolated temperature as
+	   ambiance does. The largest relative error against ambiance, measured
+	   at the cell midpoints and layer boundaries when the table is built,
+	   is stored per property in max_relative_error. With the default 10 m
+	   step it is below 1E-4 for temperature and density, 5E-5 for the
+	   speed of sound, 5E-6 for pressure and 1E-11 for gravity; the error
+	   comes from the cells containing a layer boundary and grows linearly
+	   with the step.
+
+	   Instances are callable with altitudes in m, like Atmosphere, and
+	   return an AtmosphereConditions of the same shape (at least 1-D).'''
+
+	_properties = ('temperature', 'pressure', 'density', 'grav_accel')
+
+	def __init__(self, h_min = CONST.h_min, h_max = CONST.h_max, step = 10.0) :
+		'''Enter altitudes in m. The grid must lie within the limits of ambiance.'''
+
+		if step <= 0 :
+
+			raise ValueError('Step must be positive. Given value : ' + str(step))
+
+		if h_min < CONST.h_min or h_max > CONST.h_max or h_min >= h_max :
+
+			raise ValueError('Altitude range must be increasing and within [' + str(CONST.h_min) + ', ' + str(CONST.h_max) + ']. Given range : ' + str((h_min, h_max)))
+
+		num_cells = int(np.ceil((h_max - h_min) / step))
+
+		self.h_min = float(h_min)
+		self.step = (h_max - h_min) / num_cells
+		self.h_max = self.h_min + num_cells * self.step
+
+		altitude = np.linspace(self.h_min, self.h_max, num_cells + 1)
+
+		self._tables = self._tabulate(Atmosphere(altitude))
+
+		# Error of the interpolation at the cell midpoints and on either side
+		# of the layer boundaries, where the temperature lapse rate changes
+		# and the tabulated base pressures of ambiance leave small jumps
+		boundaries = Atmosphere.geop2geom_height(np.array([layer['H_base'] for layer in CONST.LAYER_DICTS.values()]))
+		boundaries = np.concatenate((np.nextafter(boundaries, -np.inf), boundaries, np.nextafter(boundaries, np.inf)))
+		boundaries = boundaries[(boundaries >= self.h_min) & (boundaries <= self.h_max)]
+
+		probes = np.concatenate((0.5 * (altitude[1:] + altitude[:-1]), boundaries))
+
+		exact = Atmosphere(probes)
+		interpolated = self(probes)
+
+		self.max_relative_error = {
+			name : float(np.max(np.abs(getattr(interpolated, name) / getattr(exact, name) - 1.0)))
+			for name in self._properties + ('speed_of_sound',)
+		}
+
+		pass
+
+	def _tabulate(self, air:Atmosphere) :
+
+		return {
+			'temperature'	: air.temperature,
+			'pressure'		: np.log(air.pressure),
+			'density'		: np.log(air.density),
+			'grav_accel'	: air.grav_accel,
+		}
+
+	def __call__(self, h) :
+
+		h = np.atleast_1d(np.asarray(h, dtype=float))
+
+		if np.any(h < self.h_min) or np.any(h > self.h_max) :
+
+			raise ValueError('Altitude out of the range of the table [' + str(self.h_min) + ', ' + str(self.h_max) + ']. Given value : ' + str(h))
+
+		position = (h - self.h_min) / self.step
+
+		i = np.minimum(position.astype(np.intp), len(self._tables['temperature']) - 2)
+		w = position - i
+
+		values = {}
+
+		for name, table in self._tables.items() :
+
+			values[name] = table[i] + w * (table[i + 1] - table[i])
+
+		values['pressure'] = np.exp(values['pressure'])
+		values['density'] = np.exp(values['density'])
+
+		return AtmosphereConditions(
+			h,
+			values['temperature'],
+			values['pressure'],
+			values['density'],
+			np.sqrt(CONST.kappa * CONST.R * values['temperature']),
+			values['grav_accel']
+		)
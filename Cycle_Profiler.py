@@ -0,0 +1,149 @@
+import time
+import tracemalloc
+import numpy as np
+
+class CycleProfiler :
+	'''Accumulates the wall time, number of calls and memory allocated by
+	   named calls, e.g. the cycle stages and getters of a TurboFanEngine
+	   with profiling enabled, and the solver iterations of the rectification.
+
+	   Times include nested calls. With trace_memory the allocations are
+	   traced with tracemalloc (started if it is not already tracing, and
+	   stopped by close() then), and peak_bytes is the largest memory
+	   allocated during one call, nested calls included. Tracing slows down
+	   allocations, so it is off by default.'''
+
+	def __init__(self, trace_memory = False) :
+
+		self.trace_memory = bool(trace_memory)
+
+		# Tracing started here is stopped by close(), tracing started
+		# elsewhere is left to its owner
+		self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+
+		if self._started_tracing :
+
+			tracemalloc.start()
+
+		self._statistics = {}
+
+		# Largest traced memory seen so far by every call in progress
+		self._peaks = []
+
+		pass
+
+	def _getEntry(self, name) :
+
+		if name not in self._statistics :
+
+			self._statistics[name] = {
+				'calls'				: 0,
+				'seconds'			: 0.0,
+				'peak_bytes'		: 0,
+				'points'			: 0,
+				'iterations'		: 0,
+				'max_iterations'	: 0,
+			}
+
+		return self._statistics[name]
+
+	def call(self, name, function, *arguments) :
+		'''Returns function(*arguments), recording the call under name'''
+
+		if self.trace_memory :
+
+			current, peak = tracemalloc.get_traced_memory()
+
+			# The peak is reset for this call, keep the one of the enclosing call
+			if self._peaks :
+
+				self._peaks[-1] = max(self._peaks[-1], peak)
+
+			tracemalloc.reset_peak()
+
+			self._peaks.append(current)
+
+		start = time.perf_counter()
+
+		try :
+
+			return function(*arguments)
+
+		finally :
+
+			seconds = time.perf_counter() - start
+
+			entry = self._getEntry(name)
+
+			entry['calls'] += 1
+			entry['seconds'] += seconds
+
+			if self.trace_memory :
+
+				peak = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+
+				if self._peaks :
+
+					self._peaks[-1] = max(self._peaks[-1], peak)
+
+				entry['peak_bytes'] = max(entry['peak_bytes'], peak - current)
+
+	def recordIterations(self, name, iterations) :
+		'''Adds the iteration counts of the points solved by a solver call to name'''
+
+		iterations = np.asarray(iterations)
+
+		entry = self._getEntry(name)
+
+		if iterations.size > 0 :
+
+			entry['points'] += iterations.size
+			entry['iterations'] += int(np.sum(iterations))
+			entry['max_iterations'] = max(entry['max_iterations'], int(np.max(iterations)))
+
+		pass
+
+	def getStatistics(self) :
+		'''Returns a dict mapping every name recorded to a dict of its calls,
+		   seconds (total), peak_bytes, and for solvers the points solved,
+		   iterations (total over the points) and max_iterations (of a point)'''
+
+		return {name : dict(entry) for name, entry in self._statistics.items()}
+
+	def getTable(self) :
+		'''Returns the statistics as a text table, slowest first'''
+
+		lines = ['{:40s} {:>8s} {:>12s} {:>12s} {:>12s} {:>20s}'.format('Name', 'Calls', 'Total [s]', 'Mean [s]', 'Peak [MB]', 'Iterations / point')]
+
+		for name, entry in sorted(self._statistics.items(), key=lambda item : -item[1]['seconds']) :
+
+			lines.append('{:40s} {:8d} {:12.4g} {:12.4g} {:12.4g} {:>20s}'.format(
+				name,
+				entry['calls'],
+				entry['seconds'],
+				entry['seconds'] / max(entry['calls'], 1),
+				entry['peak_bytes'] / 1E6 if self.trace_memory else np.nan,
+				'{:.3g} (max {:d})'.format(entry['iterations'] / entry['points'], entry['max_iterations']) if entry['points'] else '-'
+			))
+
+		return '\n'.join(lines)
+
+	def reset(self) :
+
+		self._statistics = {}
+
+		pass
+
+	def close(self) :
+		'''Stops tracemalloc if this profiler started it. The statistics are
+		   kept, and no more memory is traced by later calls.'''
+
+		if self._started_tracing :
+
+			tracemalloc.stop()
+
+			self._started_tracing = False
+
+		self.trace_memory = False
+
+		pass
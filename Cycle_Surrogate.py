@@ -0,0 +1,327 @@
+import bisect
+import itertools
+import numpy as np
+
+from shutil import ExecError
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine, SweepResult
+
+class CycleSurrogate :
+	'''Multilinear interpolant of every quantity of TurboFanEngine.getQuantities()
+	   over a regular grid of sweep axes (Mach and altitude with any design
+	   axes of TurboFanEngine.performSweep()), built from a sweep of the
+	   cycle with build(), saved with save() and reloaded with load().
+
+	   Queries gather the 2^n corners of the grid cell of every point from
+	   the table of every quantity needed, so their cost does not depend on
+	   the cycle settings, e.g. exit rectification, and a getter interpolates
+	   only the quantities it returns. Points outside the grid, and points of cells with a corner
+	   the cycle could not evaluate, give NaN.
+
+	   Used like a TurboFanEngine : performAnalysis() with the axis values
+	   as keywords, then the getters of the engine. evaluateScalar() looks
+	   up a single point with plain floats, much faster for one point.
+	   errors maps every quantity to the max and mean absolute error against
+	   the cycle at the test points of build(), when built there.'''
+
+	def __init__(self, axes, coordinates, quantities, errors = None) :
+
+		self.axes = tuple(axes)
+		self.coordinates = {axis : np.asarray(coordinates[axis], dtype=float) for axis in self.axes}
+		self.names = tuple(quantities.keys())
+		self.errors = errors
+
+		for axis, values in self.coordinates.items() :
+
+			if values.ndim == 1 and values.size >= 2 and np.all(np.diff(values) > 0) :
+
+				pass
+
+			else :
+
+				raise ValueError('Coordinates of axis ' + axis + ' must be 1-D, increasing, with at least 2 points. Given value : ' + str(values))
+
+		self.shape = tuple(self.coordinates[axis].size for axis in self.axes)
+
+		# One flat table per quantity, so a query gathers only the quantities it needs
+		self._tables = {name : np.ascontiguousarray(np.broadcast_to(quantities[name], self.shape)).reshape(-1) for name in self.names}
+
+		strides = np.cumprod((self.shape + (1,))[:0:-1])[::-1]
+
+		# Offsets in the flat tables of the corners of a cell from its lower
+		# corner, the corners being 0 (lower) or 1 (upper) along every axis
+		self._offsets = np.array(list(itertools.product((0, 1), repeat=len(self.axes)))) @ strides
+
+		self._strides = strides
+
+		# Per axis lookup of evaluateScalar() : the first coordinate and the
+		# step of uniform axes, whose cell index is computed arithmetically
+		# like AtmosphereTable does, or None to bisect the coordinates
+		self._scalar_axes = []
+
+		for axis, stride in zip(self.axes, strides) :
+
+			values = self.coordinates[axis]
+			step = float(values[-1] - values[0]) / (values.size - 1)
+
+			uniform = np.allclose(np.diff(values), step, rtol=1E-9, atol=0.0)
+
+			self._scalar_axes.append((axis, float(values[0]), float(values[-1]), step if uniform else None, values.tolist(), int(stride)))
+
+		self._cells = None
+
+		pass
+
+	@staticmethod
+	def build(engine:TurboFanEngine, atmosphere = Atmosphere, precision = None, test_points = 1000, seed = 0, **axes) :
+		'''Samples the cycle of engine over the outer product of the axes, given
+		   as keywords mapped to increasing 1-D coordinates as for performSweep(),
+		   whose bounds make the box the surrogate is valid in. Its error is
+		   then measured at test_points random points of the box.'''
+
+		sweep = engine.performSweep(atmosphere, precision, **axes)
+
+		surrogate = CycleSurrogate(sweep.axes, sweep.coordinates, sweep.quantities)
+
+		if test_points > 0 :
+
+			generator = np.random.default_rng(seed)
+
+			points = {
+				axis : generator.uniform(values[0], values[-1], test_points)
+				for axis, values in sweep.coordinates.items()
+			}
+
+			exact = engine.evaluatePoints(atmosphere, precision, **points)
+			interpolated = surrogate.evaluate(**points)
+
+			surrogate.errors = {}
+
+			for name in surrogate.names :
+
+				error = np.abs(np.broadcast_to(interpolated[name], test_points) - np.broadcast_to(exact[name], test_points))
+				error = error[np.isfinite(error)]
+
+				surrogate.errors[name] = {
+					'max'	: float(np.max(error)) if error.size else np.nan,
+					'mean'	: float(np.mean(error)) if error.size else np.nan,
+				}
+
+		return surrogate
+
+	def _locate(self, **values) :
+		'''Returns the flat index of the lower corner of the cell of every point,
+		   the weights of the corners of the cell along a leading axis and
+		   whether every point lies inside the grid'''
+
+		for axis in self.axes :
+
+			if axis not in values :
+
+				raise ValueError(axis + ' must be given. Axes of the surrogate : ' + str(self.axes))
+
+		x = np.broadcast_arrays(*(np.asarray(values[axis], dtype=float) for axis in self.axes))
+
+		shape = x[0].shape
+
+		base = np.zeros(shape, dtype=int)
+		weights = np.ones((1,) + shape)
+		inside = np.ones(shape, dtype=bool)
+
+		for k, (axis, values) in enumerate(zip(self.axes, x)) :
+
+			coordinates = self.coordinates[axis]
+
+			i = np.clip(np.searchsorted(coordinates, values, 'right') - 1, 0, coordinates.size - 2)
+			t = (values - coordinates[i]) / (coordinates[i + 1] - coordinates[i])
+
+			base += i * self._strides[k]
+
+			# The weight of a corner is the product over the axes of t or 1 - t
+			# for its upper or lower end, built up axis by axis in corner order
+			weights = np.stack((weights * (1.0 - t), weights * t), 1).reshape((-1,) + shape)
+
+			inside &= (values >= coordinates[0]) & (values <= coordinates[-1])
+
+		return base, weights, inside
+
+	def _interpolate(self, name, cells) :
+
+		base, weights, inside = cells
+
+		values = np.sum(weights * self._tables[name][base + self._offsets.reshape((-1,) + (1,) * base.ndim)], axis=0)
+
+		return np.where(inside, values, np.nan)
+
+	def evaluateScalar(self, names = None, **values) :
+		'''Returns a dict mapping every quantity (or the given names) to its
+		   interpolated value as a float at the single point given by every
+		   axis as a keyword mapped to a scalar. Agrees with evaluate() to
+		   round-off, without the array overhead of locating the point.'''
+
+		base = 0
+		weights = [1.0]
+
+		for axis, first, last, step, coordinates, stride in self._scalar_axes :
+
+			try :
+
+				x = float(values[axis])
+
+			except KeyError :
+
+				raise ValueError(axis + ' must be given. Axes of the surrogate : ' + str(self.axes))
+
+			if not first <= x <= last :
+
+				return dict.fromkeys(self.names if names is None else names, np.nan)
+
+			if step is not None :
+
+				position = (x - first) / step
+
+				i = min(int(position), len(coordinates) - 2)
+
+				t = position - i
+
+			else :
+
+				i = min(bisect.bisect_right(coordinates, x) - 1, len(coordinates) - 2)
+
+				t = (x - coordinates[i]) / (coordinates[i + 1] - coordinates[i])
+
+			base += i * stride
+
+			# The weight of a corner is the product over the axes of t or
+			# 1 - t for its upper or lower end, in the corner order of _offsets
+			weights = [weight * u for weight in weights for u in (1.0 - t, t)]
+
+		corners = base + self._offsets
+		weights = np.array(weights)
+
+		return {name : float(self._tables[name][corners] @ weights) for name in (self.names if names is None else names)}
+
+	def evaluate(self, names = None, **values) :
+		'''Returns a dict mapping every quantity (or the given names) to its
+		   interpolated values at the points given by every axis as a keyword
+		   mapped to an array, the arrays broadcasting against each other'''
+
+		cells = self._locate(**values)
+
+		return {name : self._interpolate(name, cells) for name in (self.names if names is None else names)}
+
+	def performAnalysis(self, **values) :
+		'''Locates the given points (see evaluate()) in the grid, the getters
+		   then interpolate the quantities they return'''
+
+		self._cells = self._locate(**values)
+
+		pass
+
+	def _getQuantities(self, getter) :
+
+		if self._cells is None :
+
+			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+
+		names = TurboFanEngine._sweep_quantities[getter]
+
+		if len(names) == 1 :
+
+			return self._interpolate(names[0], self._cells)
+
+		else :
+
+			return np.stack([self._interpolate(name, self._cells) for name in names], -1)
+
+	def getSpecificThrusts(self) :
+
+		return self._getQuantities('getSpecificThrusts')
+
+	def getSpecificFuelConsumtionRates(self) :
+
+		return self._getQuantities('getSpecificFuelConsumtionRates')
+
+	def getEfficiencies(self) :
+
+		return self._getQuantities('getEfficiencies')
+
+	def getReferenceRatios(self) :
+
+		return self._getQuantities('getReferenceRatios')
+
+	def getTurbineOperatingRatios(self) :
+
+		return self._getQuantities('getTurbineOperatingRatios')
+
+	def getCompressorOperatingRatios(self) :
+
+		return self._getQuantities('getCompressorOperatingRatios')
+
+	def getFanOperatingRatios(self) :
+
+		return self._getQuantities('getFanOperatingRatios')
+
+	def getCoreExitState(self) :
+
+		return self._getQuantities('getCoreExitState')
+
+	def getFanExitState(self) :
+
+		return self._getQuantities('getFanExitState')
+
+	def getBurnerEnthalpyRatio(self) :
+
+		return self._getQuantities('getBurnerEnthalpyRatio')
+
+	def getQuantities(self) :
+
+		if self._cells is None :
+
+			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+
+		return {name : self._interpolate(name, self._cells) for name in self.names}
+
+	def getSweepResult(self) -> SweepResult :
+		'''Returns the grid the surrogate interpolates as a SweepResult'''
+
+		return SweepResult(self.axes, self.coordinates, {name : table.reshape(self.shape) for name, table in self._tables.items()})
+
+	def save(self, path) :
+		'''Saves the surrogate to an .npz file'''
+
+		arrays = {'axes' : np.array(self.axes), 'names' : np.array(self.names)}
+
+		arrays.update(('quantity_' + name, table.reshape(self.shape)) for name, table in self._tables.items())
+
+		arrays.update(('coordinates_' + axis, values) for axis, values in self.coordinates.items())
+
+		if self.errors is not None :
+
+			arrays['errors'] = np.array([[self.errors[name]['max'], self.errors[name]['mean']] for name in self.names])
+
+		np.savez(path, **arrays)
+
+		pass
+
+	@staticmethod
+	def load(path) :
+		'''Loads a surrogate saved with save()'''
+
+		with np.load(path) as file :
+
+			axes = tuple(str(axis) for axis in file['axes'])
+			names = tuple(str(name) for name in file['names'])
+
+			coordinates = {axis : file['coordinates_' + axis] for axis in axes}
+
+			errors = None
+
+			if 'errors' in file :
+
+				errors = {name : {'max' : float(row[0]), 'mean' : float(row[1])} for name, row in zip(names, file['errors'])}
+
+			quantities = {name : file['quantity_' + name] for name in names}
+
+		return CycleSurrogate(axes, coordinates, quantities, errors)
@@ -0,0 +1,179 @@
+import numpy as np
+
+class Dual :
+	'''Forward-mode dual number over ndarrays.
+	   value is an ndarray and derivative holds its partial derivatives
+	   with respect to n variables along an extra last axis, so its shape
+	   is value.shape + (n,). Values and derivatives broadcast like the
+	   values do, and plain numbers and ndarrays act as constants.
+
+	   Supports the arithmetic operators and the numpy functions used by
+	   the cycle (sqrt, power, exp, log, absolute, fmax, fmin, maximum,
+	   minimum, comparisons, where, all, any, shape and ndim).'''
+
+	__array_priority__ = 100
+
+	def __init__(self, value, derivative) :
+
+		self.value = np.asarray(value)
+		self.derivative = np.asarray(derivative)
+
+		pass
+
+	@property
+	def shape(self) :
+
+		return self.value.shape
+
+	@property
+	def ndim(self) :
+
+		return self.value.ndim
+
+	def __repr__(self) :
+
+		return 'Dual(' + repr(self.value) + ', ' + repr(self.derivative) + ')'
+
+	# Arithmetic operators, dispatched through the ufuncs below
+
+	def __add__(self, other) :			return np.add(self, other)
+	def __radd__(self, other) :			return np.add(other, self)
+	def __sub__(self, other) :			return np.subtract(self, other)
+	def __rsub__(self, other) :			return np.subtract(other, self)
+	def __mul__(self, other) :			return np.multiply(self, other)
+	def __rmul__(self, other) :			return np.multiply(other, self)
+	def __truediv__(self, other) :		return np.true_divide(self, other)
+	def __rtruediv__(self, other) :		return np.true_divide(other, self)
+	def __pow__(self, other) :			return np.power(self, other)
+	def __rpow__(self, other) :			return np.power(other, self)
+	def __neg__(self) :					return np.negative(self)
+	def __pos__(self) :					return self
+	def __abs__(self) :					return np.absolute(self)
+
+	def __lt__(self, other) :			return np.less(self, other)
+	def __le__(self, other) :			return np.less_equal(self, other)
+	def __gt__(self, other) :			return np.greater(self, other)
+	def __ge__(self, other) :			return np.greater_equal(self, other)
+
+	def __array_ufunc__(self, ufunc, method, *inputs, **kwargs) :
+
+		if method != '__call__' or kwargs :
+
+			return NotImplemented
+
+		values = [_getValue(x) for x in inputs]
+
+		if ufunc in _comparisons :
+
+			return ufunc(*values)
+
+		if ufunc not in _derivatives :
+
+			return NotImplemented
+
+		value = ufunc(*values)
+
+		derivative = _derivatives[ufunc](value, values, [_getDerivative(x) for x in inputs])
+
+		return Dual(value, derivative)
+
+	def __array_function__(self, function, types, args, kwargs) :
+
+		if function not in _functions :
+
+			return NotImplemented
+
+		return _functions[function](*args, **kwargs)
+
+def _getValue(x) :
+
+	return x.value if isinstance(x, Dual) else x
+
+def _getDerivative(x) :
+	'''Derivative of x, None for constants'''
+
+	return x.derivative if isinstance(x, Dual) else None
+
+def _scale(factor, derivative) :
+	'''factor (shaped like the values) times derivative, None if derivative is None'''
+
+	if derivative is None :
+
+		return None
+
+	# Python numbers are multiplied as they are, so they do not promote the derivatives
+	elif np.ndim(factor) == 0 :
+
+		return factor * derivative
+
+	else :
+
+		return np.expand_dims(factor, -1) * derivative
+
+def _sum(*terms) :
+
+	terms = [term for term in terms if term is not None]
+
+	total = terms[0]
+
+	for term in terms[1:] :
+
+		total = total + term
+
+	return total
+
+def _power(value, values, derivatives) :
+
+	(a, b), (da, db) = values, derivatives
+
+	return _sum(
+		_scale(b * np.power(a, b - 1.0), da),
+		# log(a) is only needed, and only finite for a > 0, where b varies
+		None if db is None else _scale(value * np.log(a), db)
+	)
+
+def _select(condition, da, db) :
+	'''Derivative of np.where(condition, a, b) from those of a and b'''
+
+	condition = np.expand_dims(condition, -1)
+
+	return np.where(condition, 0.0 if da is None else da, 0.0 if db is None else db)
+
+_derivatives = {
+	np.add			: lambda value, x, d : _sum(d[0], d[1]),
+	np.subtract		: lambda value, x, d : _sum(d[0], None if d[1] is None else -d[1]),
+	np.multiply		: lambda value, x, d : _sum(_scale(x[1], d[0]), _scale(x[0], d[1])),
+	np.true_divide	: lambda value, x, d : _sum(_scale(1.0 / x[1], d[0]), _scale(-value / x[1], d[1])),
+	np.power		: _power,
+	np.negative		: lambda value, x, d : -d[0],
+	np.sqrt			: lambda value, x, d : _scale(0.5 / value, d[0]),
+	np.exp			: lambda value, x, d : _scale(value, d[0]),
+	np.log			: lambda value, x, d : _scale(1.0 / x[0], d[0]),
+	np.absolute		: lambda value, x, d : _scale(np.sign(x[0]), d[0]),
+	np.fmax			: lambda value, x, d : _select(x[0] >= x[1], d[0], d[1]),
+	np.maximum		: lambda value, x, d : _select(x[0] >= x[1], d[0], d[1]),
+	np.fmin			: lambda value, x, d : _select(x[0] <= x[1], d[0], d[1]),
+	np.minimum		: lambda value, x, d : _select(x[0] <= x[1], d[0], d[1]),
+}
+
+_comparisons = (np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal)
+
+def _where(condition, x, y) :
+
+	condition = _getValue(condition)
+
+	value = np.where(condition, _getValue(x), _getValue(y))
+
+	if _getDerivative(x) is None and _getDerivative(y) is None :
+
+		return value
+
+	return Dual(value, _select(condition, _getDerivative(x), _getDerivative(y)))
+
+_functions = {
+	np.where	: _where,
+	np.all		: lambda a, *args, **kwargs : np.all(_getValue(a), *args, **kwargs),
+	np.any		: lambda a, *args, **kwargs : np.any(_getValue(a), *args, **kwargs),
+	np.shape	: lambda a : np.shape(_getValue(a)),
+	np.ndim		: lambda a : np.ndim(_getValue(a)),
+}
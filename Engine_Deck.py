@@ -0,0 +1,212 @@
+import os
+import json
+import tempfile
+import numpy as np
+
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine
+from Cycle_Surrogate import CycleSurrogate
+
+class EngineDeck :
+	'''Engine deck : every quantity of TurboFanEngine.getQuantities() tabulated
+	   over an altitude x Mach (x throttle) grid and stored in a file, which
+	   is opened as a read-only numpy.memmap and interpolated multilinearly
+	   like a CycleSurrogate.
+
+	   Opening a deck only reads its header, and the pages of the table are
+	   read when a lookup first touches them. Every process opening the same
+	   file shares those pages through the page cache instead of loading
+	   its own copy.
+
+	   throttle is the turbine inlet temperature as a fraction of the one
+	   of the engine the deck was built from. Used like a TurboFanEngine by
+	   Aircraft.fly_aircraft() and Mission : performAnalysis() with the
+	   flight speed and conditions, at the throttle set with setThrottle(),
+	   then getSpecificThrusts() and getSpecificFuelConsumtionRates().'''
+
+	# File layout : the magic bytes, the size of the JSON header as 8 bytes
+	# little-endian, the header, then the table from the offset it gives
+	_magic = b'TURBOFAN ENGINE DECK\n'
+	_version = 1
+
+	# Offset of the table is aligned to a page
+	_alignment = 4096
+
+	def __init__(self, path) :
+
+		with open(path, 'rb') as file :
+
+			if file.read(len(self._magic)) != self._magic :
+
+				raise ValueError('Not an engine deck : ' + str(path))
+
+			header_size = int.from_bytes(file.read(8), 'little')
+			header = json.loads(file.read(header_size))
+
+		if header['version'] != self._version :
+
+			raise ValueError('Unsupported engine deck version : ' + str(header['version']) + '. Supported version : ' + str(self._version))
+
+		self.path = path
+		self.header = header
+
+		self.axes = tuple(header['axes'])
+		self.names = tuple(header['quantities'])
+
+		coordinates = {axis : np.array(header['coordinates'][axis]) for axis in self.axes}
+
+		shape = tuple(coordinates[axis].size for axis in self.axes)
+
+		self.table = np.memmap(path, dtype=np.dtype(header['dtype']), mode='r', offset=header['offset'], shape=(len(self.names),) + shape)
+
+		# The surrogate interpolates views of the memmap, which are not copied
+		self.surrogate = CycleSurrogate(self.axes, coordinates, dict(zip(self.names, self.table)))
+
+		self._throttle = 1.0
+
+		pass
+
+	@staticmethod
+	def build(engine:TurboFanEngine, path, Mach, altitude, throttle = None, atmosphere = Atmosphere, precision = None) :
+		'''Tabulates engine over the outer product of the 1-D increasing
+		   altitudes (in m), Mach numbers and, if given, throttles, writes
+		   the deck to path and returns it opened. The parameters of engine
+		   must be scalars. atmosphere and precision are passed to
+		   performSweep().'''
+
+		axes = {'altitude' : altitude, 'Mach' : Mach}
+
+		T_t4 = engine.getParameters().T_t4
+
+		if throttle is not None :
+
+			if np.ndim(T_t4) == 0 :
+
+				axes['T_t4'] = T_t4 * np.asarray(throttle, dtype=float)
+
+			else :
+
+				raise ValueError('A deck with a throttle axis needs a single turbine inlet temperature. Given value : ' + str(T_t4))
+
+		sweep = engine.performSweep(atmosphere, precision, **axes)
+
+		names = tuple(sweep.quantities.keys())
+
+		table = np.stack([sweep.quantities[name] for name in names])
+
+		coordinates = dict(
+			('throttle', np.asarray(throttle, dtype=float)) if axis == 'T_t4' else (axis, values)
+			for axis, values in sweep.coordinates.items()
+		)
+
+		# Grids a surrogate cannot interpolate are rejected before writing
+		CycleSurrogate(coordinates.keys(), coordinates, dict(zip(names, table)))
+
+		specification = engine.getSpecification()
+
+		header = {
+			'version'		: EngineDeck._version,
+			'axes'			: list(coordinates.keys()),
+			'coordinates'	: {axis : values.tolist() for axis, values in coordinates.items()},
+			'quantities'	: list(names),
+			'dtype'			: table.dtype.str,
+			'parameters'	: {
+				name : None if value is None else np.asarray(value).tolist()
+				for name, value in specification.parameters._asdict().items()
+			},
+			'rectify'		: bool(specification.rectify),
+			'masked'		: bool(specification.masked),
+		}
+
+		# The offset depends on the size of the header holding it, so the
+		# header is sized with the largest offset it could need first
+		header['offset'] = 0
+		size = len(EngineDeck._magic) + 8 + len(json.dumps(header).encode()) + 32
+
+		header['offset'] = -(-size // EngineDeck._alignment) * EngineDeck._alignment
+
+		encoded = json.dumps(header).encode()
+
+		# Written to a file of its own next to path, so concurrent builds do
+		# not interleave, then replaced atomically, so readers never see a
+		# partly written deck
+		descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(path)))
+
+		try :
+
+			with os.fdopen(descriptor, 'wb') as file :
+
+				file.write(EngineDeck._magic)
+				file.write(len(encoded).to_bytes(8, 'little'))
+				file.write(encoded)
+				file.write(bytes(header['offset'] - file.tell()))
+				file.write(np.ascontiguousarray(table).tobytes())
+
+			os.replace(temporary_path, path)
+
+		except BaseException :
+
+			os.remove(temporary_path)
+
+			raise
+
+		return EngineDeck(path)
+
+	def setThrottle(self, throttle) :
+		'''Sets the throttle of the next analyses, an array broadcasting
+		   against the flight conditions. Needs a deck with a throttle axis.'''
+
+		if 'throttle' not in self.axes :
+
+			raise ValueError('The deck has no throttle axis. Axes of the deck : ' + str(self.axes))
+
+		if np.all(np.asarray(throttle) > 0) :
+
+			self._throttle = throttle
+
+		else :
+
+			raise ValueError('Throttle must be positive. Given value : ' + str(throttle))
+
+		pass
+
+	def getThrottle(self) :
+
+		return self._throttle
+
+	def evaluate(self, names = None, **values) :
+		'''Returns a dict mapping every quantity (or the given names) to its
+		   interpolated values at the points given by every axis of the deck
+		   as a keyword, see CycleSurrogate.evaluate()'''
+
+		return self.surrogate.evaluate(names, **values)
+
+	def performAnalysis(self, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+		'''Locates the flight conditions, whose altitude is their h attribute,
+		   in the deck at the current throttle'''
+
+		values = {
+			'altitude'	: flight_conditions.h,
+			'Mach'		: np.asarray(flight_speed) / flight_conditions.speed_of_sound,
+		}
+
+		if 'throttle' in self.axes :
+
+			values['throttle'] = self._throttle
+
+		self.surrogate.performAnalysis(**values)
+
+		pass
+
+	def getSpecificThrusts(self) :
+
+		return self.surrogate.getSpecificThrusts()
+
+	def getSpecificFuelConsumtionRates(self) :
+
+		return self.surrogate.getSpecificFuelConsumtionRates()
+
+	def getQuantities(self) :
+
+		return self.surrogate.getQuantities()
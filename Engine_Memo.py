@@ -0,0 +1,174 @@
+import operator
+import collections
+import numpy as np
+
+from shutil import ExecError
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine
+
+class EngineMemo :
+	'''Memo of the specific thrusts and fuel consumption rates of a
+	   TurboFanEngine per flight state, used in place of the engine by
+	   Aircraft.fly_aircraft() and Mission.
+
+	   performAnalysis() keys the flight speed and the altitude of the flight
+	   conditions (their h attribute) rounded to speed_resolution (in m / s)
+	   and altitude_resolution (in m). A state already seen only moves the
+	   getters to its stored outputs, so repeated states, e.g. cruise, skip
+	   the cycle; a new state runs engine.performAnalysis() and stores the
+	   outputs of getSpecificThrusts() and getSpecificFuelConsumtionRates().
+	   States within the resolutions share the outputs of the first one seen.
+	   At most max_entries states are kept, the least recently used ones
+	   being removed first. The memo is cleared whenever a parameter or a
+	   setting of the engine is replaced by a setter, or a parameter array
+	   is modified in place.'''
+
+	# Attributes of the engine the outputs depend on besides the flight state
+	_engine_attributes = TurboFanEngine._parameter_attributes + (
+		'_dtype',
+		'_rectify',
+		'_rectification_tolerance',
+		'_rectification_max_iterations',
+		'_masked',
+	)
+
+	def __init__(self, engine:TurboFanEngine, speed_resolution = 0.01, altitude_resolution = 1.0, max_entries = 4096) :
+
+		if speed_resolution > 0 and altitude_resolution > 0 :
+
+			self.speed_resolution = float(speed_resolution)
+			self.altitude_resolution = float(altitude_resolution)
+
+		else :
+
+			raise ValueError('Resolutions must be positive. Given values : ' + str((speed_resolution, altitude_resolution)))
+
+		if max_entries >= 1 :
+
+			self.max_entries = int(max_entries)
+
+		else :
+
+			raise ValueError('Maximum number of entries must be at least 1. Given value : ' + str(max_entries))
+
+		self.engine = engine
+
+		self._entries = collections.OrderedDict()
+		self._engine_state = None
+		self._engine_arrays = ()
+		self._outputs = None
+
+		self.resetStatistics()
+
+		pass
+
+	def _isEngineUnchanged(self, engine_state) :
+		'''Whether the engine holds the values the stored states were analysed
+		   with : setters replace the values, so identity tells whether any was
+		   set, and the arrays are compared with their copies in case they were
+		   modified in place'''
+
+		if self._engine_state is None or not all(map(operator.is_, engine_state, self._engine_state)) :
+
+			return False
+
+		arrays = (value for value in engine_state if isinstance(value, np.ndarray))
+
+		return all(np.array_equal(value, copy, equal_nan=True) for value, copy in zip(arrays, self._engine_arrays))
+
+	def getKey(self, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+		'''Returns the key of the flight state, the rounded speed and altitude
+		   as bytes with their shapes, so arrays of states are keyed as a whole'''
+
+		speed = np.rint(np.asarray(flight_speed, dtype=float) / self.speed_resolution)
+		altitude = np.rint(np.asarray(flight_conditions.h, dtype=float) / self.altitude_resolution)
+
+		return (speed.shape, speed.tobytes(), altitude.shape, altitude.tobytes())
+
+	def performAnalysis(self, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+
+		engine_state = tuple(map(self.engine.__dict__.get, self._engine_attributes))
+
+		if not self._isEngineUnchanged(engine_state) :
+
+			self._entries.clear()
+			self._engine_state = engine_state
+
+			# Copies of the arrays, which may be modified in place
+			self._engine_arrays = tuple(np.copy(value) for value in engine_state if isinstance(value, np.ndarray))
+
+		key = self.getKey(flight_speed, flight_conditions)
+
+		outputs = self._entries.get(key)
+
+		if outputs is not None :
+
+			self._entries.move_to_end(key)
+
+			self._hits += 1
+
+		else :
+
+			self._misses += 1
+
+			self.engine.performAnalysis(flight_speed, flight_conditions)
+
+			# Getters return views of the output block of this analysis,
+			# which the next analysis replaces instead of overwriting
+			outputs = (self.engine.getSpecificThrusts(), self.engine.getSpecificFuelConsumtionRates())
+
+			self._entries[key] = outputs
+
+			if len(self._entries) > self.max_entries :
+
+				self._entries.popitem(last=False)
+
+				self._evictions += 1
+
+		self._outputs = outputs
+
+		pass
+
+	def getSpecificThrusts(self) :
+
+		if self._outputs is None :
+
+			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+
+		return self._outputs[0]
+
+	def getSpecificFuelConsumtionRates(self) :
+
+		if self._outputs is None :
+
+			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+
+		return self._outputs[1]
+
+	def getStatistics(self) :
+		'''Returns the hits, misses and evictions since the memo was created
+		   or reset, and the number of states held'''
+
+		return {
+			'hits'		: self._hits,
+			'misses'	: self._misses,
+			'evictions'	: self._evictions,
+			'entries'	: len(self._entries),
+		}
+
+	def resetStatistics(self) :
+
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+		pass
+
+	def clear(self) :
+		'''Removes every state'''
+
+		self._entries.clear()
+		self._outputs = None
+
+		pass
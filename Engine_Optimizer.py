@@ -0,0 +1,310 @@
+import numpy as np
+
+from typing import NamedTuple, Any
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine
+
+class DesignOptimum(NamedTuple) :
+	'''Designs found by DesignOptimizer.optimize(), one per problem.
+	   feasible is False where no design meeting the minimum specific thrust
+	   was found, converged is False where the search ran out of iterations.'''
+
+	pi_c		: Any
+	pi_f		: Any
+	alpha		: Any
+
+	TSFC		: Any
+	ST			: Any
+
+	feasible	: Any
+	converged	: Any
+	iterations	: Any
+
+class FanOptimum(NamedTuple) :
+	'''Optimal fan pressure ratios found by DesignOptimizer.optimizeFanPressureRatio(),
+	   the quantities of TurboFanEngine.getQuantities() at them, and the
+	   number of vectorized cycle evaluations the search took'''
+
+	pi_f		: Any
+	quantities	: Any
+	evaluations	: int
+
+class DesignOptimizer :
+	'''Finds the compressor pressure ratio, fan pressure ratio and bypass ratio
+	   minimizing TSFC subject to a minimum specific thrust and bounds on the
+	   three, for a whole array of problems (flight conditions, tech levels,
+	   thrust requirements) at once.
+
+	   Every problem runs a compass search in the design space scaled to the
+	   unit cube by the bounds : all the problems poll their 6 neighbouring
+	   designs in one vectorized evaluation of the cycle, move to the best one
+	   that improves on their design, or halve their step otherwise, until
+	   the step falls below tolerance. Infeasible designs (specific thrust
+	   below the minimum, or no valid cycle) are ranked by their shortfall,
+	   so problems starting infeasible are driven towards the constraint.
+	   The search needs no derivatives and is not affected by the NaN of the
+	   designs the cycle cannot evaluate, but it finds local minima only.'''
+
+	_variables = ('pi_c', 'pi_f', 'alpha')
+
+	_golden_ratio = 0.5 * (np.sqrt(5.0) - 1.0)
+
+	_default_bounds = {
+		'pi_c'	: (2.0, 40.0),
+		'pi_f'	: (1.05, 3.0),
+		'alpha'	: (0.0, 12.0),
+	}
+
+	# Smallest lower bound of every variable accepted by the engine setters
+	_smallest_bounds = {
+		'pi_c'	: 1.0,
+		'pi_f'	: 1.0,
+		'alpha'	: 0.0,
+	}
+
+	def __init__(self, engine:TurboFanEngine, atmosphere = Atmosphere, tolerance = 1E-4, max_iterations = 500) :
+		'''tolerance is the smallest step, as a fraction of the bounds of every variable.
+		   atmosphere is called with the altitudes, e.g. an AtmosphereTable.'''
+
+		self.engine = engine
+		self.atmosphere = atmosphere
+
+		if tolerance > 0 and tolerance < 1 :
+
+			self.tolerance = tolerance
+
+		else :
+
+			raise ValueError('Tolerance must belong to the interval (0, 1). Given value : ' + str(tolerance))
+
+		if max_iterations >= 1 :
+
+			self.max_iterations = int(max_iterations)
+
+		else :
+
+			raise ValueError('Maximum number of iterations must be at least 1. Given value : ' + str(max_iterations))
+
+		self._bounds = dict(self._default_bounds)
+
+		pass
+
+	def setBounds(self, **bounds) :
+		'''Sets the bounds of any of pi_c, pi_f and alpha, given as keywords
+		   mapped to (lower, upper) pairs. Bounds may be arrays broadcasting
+		   against the problems, e.g. one range per tech level.'''
+
+		for variable, (lower, upper) in bounds.items() :
+
+			if variable not in self._variables :
+
+				raise ValueError('Unknown design variable : ' + variable + '. Valid variables : ' + str(self._variables))
+
+			lower = np.asarray(lower, dtype=float)
+			upper = np.asarray(upper, dtype=float)
+
+			if np.all(lower >= self._smallest_bounds[variable]) and np.all(upper > lower) :
+
+				self._bounds[variable] = (lower, upper)
+
+			else :
+
+				raise ValueError('Bounds of ' + variable + ' must satisfy ' + str(self._smallest_bounds[variable]) + ' <= lower < upper. Given value : ' + str((lower, upper)))
+
+		pass
+
+	def getBounds(self) :
+
+		return dict(self._bounds)
+
+	def _getDesign(self, x) :
+		'''Design variables of the points x of the unit cube, x[i] for variable i'''
+
+		return {
+			variable : lower + x[i] * (upper - lower)
+			for i, (variable, (lower, upper)) in enumerate((variable, self._bounds[variable]) for variable in self._variables)
+		}
+
+	def _evaluate(self, x, flight_speed, flight_conditions, min_specific_thrust, values) :
+		'''Returns the TSFC, specific thrust and constraint violation of the designs x'''
+
+		engine = self.engine.getSweepEngine(**values, **self._getDesign(x))
+
+		result = engine.evaluate(flight_speed, flight_conditions)
+
+		valid = np.isfinite(result.ST) & np.isfinite(result.TSFC) & (result.TSFC > 0)
+
+		violation = np.where(valid, np.fmax(min_specific_thrust - result.ST, 0.0), np.inf)
+
+		return result.TSFC, result.ST, violation
+
+	def optimize(self, Mach, altitude, min_specific_thrust, initial = None, **values) -> DesignOptimum :
+		'''Mach, altitude (in m), min_specific_thrust (in N / (kg / s)) and
+		   any other design axes of TurboFanEngine.performSweep() given as
+		   keywords (e.g. T_t4) are arrays broadcasting against each other,
+		   their broadcast shape being the shape of the array of problems.
+		   Parameters that are not given keep the values set on the engine.
+		   initial optionally maps variables to starting designs, which
+		   default to the middle of the bounds. Returns a DesignOptimum.'''
+
+		for variable in values :
+
+			if variable in self._variables :
+
+				raise ValueError(variable + ' is a design variable, set its bounds with setBounds().')
+
+		shape = np.broadcast_shapes(
+			np.shape(Mach),
+			np.shape(altitude),
+			np.shape(min_specific_thrust),
+			*(np.shape(value) for value in values.values()),
+			*(np.shape(bound) for bounds in self._bounds.values() for bound in bounds)
+		)
+
+		flight_conditions = self.atmosphere(np.broadcast_to(altitude, shape))
+		flight_speed = np.broadcast_to(Mach, shape) * flight_conditions.speed_of_sound
+
+		# Position of every problem in the unit cube, x[i] for variable i
+		x = np.empty((len(self._variables),) + shape)
+
+		for i, variable in enumerate(self._variables) :
+
+			lower, upper = self._bounds[variable]
+
+			if initial is not None and variable in initial :
+
+				x[i] = np.clip((initial[variable] - lower) / (upper - lower), 0.0, 1.0)
+
+			else :
+
+				x[i] = 0.5
+
+		TSFC, ST, violation = self._evaluate(x, flight_speed, flight_conditions, min_specific_thrust, values)
+
+		step = np.full(shape, 0.25)
+		iterations = np.zeros(shape, dtype=int)
+
+		# Poll directions, +- every unit vector, along a leading axis
+		directions = np.concatenate((np.eye(len(self._variables)), -np.eye(len(self._variables))))
+		directions = directions.reshape(directions.shape + (1,) * len(shape))
+
+		active = step >= self.tolerance
+
+		while np.any(active) and np.max(iterations) < self.max_iterations :
+
+			candidates = np.clip(x + directions * step, 0.0, 1.0)
+
+			# Candidates are evaluated as a leading axis of the problems
+			candidate_TSFC, candidate_ST, candidate_violation = (
+				np.broadcast_to(value, candidates.shape[:1] + shape)
+				for value in self._evaluate(np.moveaxis(candidates, 1, 0), flight_speed, flight_conditions, min_specific_thrust, values)
+			)
+
+			# Least violation first, then least TSFC among the feasible ones
+			least_violation = np.min(candidate_violation, axis=0)
+
+			key = np.where(
+				candidate_violation == least_violation,
+				np.where(least_violation == 0.0, candidate_TSFC, candidate_violation),
+				np.inf
+			)
+
+			best = np.expand_dims(np.argmin(np.nan_to_num(key, nan=np.inf), axis=0), 0)
+
+			best_TSFC = np.take_along_axis(candidate_TSFC, best, 0)[0]
+			best_ST = np.take_along_axis(candidate_ST, best, 0)[0]
+
+			improved = active & (
+				(least_violation < violation) |
+				((least_violation == 0.0) & (violation == 0.0) & (best_TSFC < TSFC))
+			)
+
+			x = np.where(improved, np.take_along_axis(candidates, np.expand_dims(best, 1), 0)[0], x)
+
+			TSFC = np.where(improved, best_TSFC, TSFC)
+			ST = np.where(improved, best_ST, ST)
+			violation = np.where(improved, least_violation, violation)
+
+			step = np.where(active & ~improved, 0.5 * step, step)
+
+			iterations += active
+
+			active = step >= self.tolerance
+
+		design = self._getDesign(x)
+
+		return DesignOptimum(
+			*(np.broadcast_to(design[variable], shape).copy() for variable in self._variables),
+			np.broadcast_to(TSFC, shape).copy(),
+			np.broadcast_to(ST, shape).copy(),
+			violation == 0.0,
+			~active,
+			iterations
+		)
+
+	def optimizeFanPressureRatio(self, Mach, altitude, **values) -> FanOptimum :
+		'''Finds the fan pressure ratio within its bounds maximizing the specific
+		   thrust at every point given by Mach, altitude (in m) and any design
+		   axes of TurboFanEngine.performSweep() but pi_f given as keywords
+		   (e.g. alpha), all arrays broadcasting against each other, e.g. an
+		   open mesh of alpha x Mach x altitude.
+		   The fuel ratio does not depend on the fan, so the same pressure ratio
+		   minimizes TSFC. Runs a golden-section search on all the points at
+		   once, with one cycle evaluation per iteration, until the bracket is
+		   narrower than tolerance times the bounds. The specific thrust is
+		   assumed to have a single maximum within the bounds.'''
+
+		if 'pi_f' in values :
+
+			raise ValueError('pi_f is the variable optimized, set its bounds with setBounds().')
+
+		lower, upper = self._bounds['pi_f']
+
+		shape = np.broadcast_shapes(np.shape(Mach), np.shape(altitude), np.shape(lower), np.shape(upper), *(np.shape(value) for value in values.values()))
+
+		flight_conditions = self.atmosphere(np.broadcast_to(altitude, shape))
+		flight_speed = np.broadcast_to(Mach, shape) * flight_conditions.speed_of_sound
+
+		def getSpecificThrust(pi_f) :
+
+			ST = self.engine.getSweepEngine(**values, pi_f=pi_f).evaluate(flight_speed, flight_conditions).ST
+
+			# Fan pressure ratios the cycle cannot evaluate rank last
+			return np.broadcast_to(np.where(np.isfinite(ST), ST, -np.inf), shape)
+
+		a = np.broadcast_to(lower, shape)
+		b = np.broadcast_to(upper, shape)
+
+		c = b - self._golden_ratio * (b - a)
+		d = a + self._golden_ratio * (b - a)
+
+		ST_c = getSpecificThrust(c)
+		ST_d = getSpecificThrust(d)
+
+		evaluations = 2
+
+		while np.max((b - a) / (upper - lower)) > self.tolerance and evaluations < self.max_iterations :
+
+			# The maximum lies in [a, d] if ST_c >= ST_d, in [c, b] otherwise
+			left = ST_c >= ST_d
+
+			a, b = np.where(left, a, c), np.where(left, d, b)
+
+			point = np.where(left, b - self._golden_ratio * (b - a), a + self._golden_ratio * (b - a))
+			ST_point = getSpecificThrust(point)
+
+			evaluations += 1
+
+			c, d, ST_c, ST_d = (
+				np.where(left, point, d),
+				np.where(left, c, point),
+				np.where(left, ST_point, ST_d),
+				np.where(left, ST_c, ST_point)
+			)
+
+		pi_f = np.where(ST_c >= ST_d, c, d)
+
+		quantities = self.engine.evaluatePoints(self.atmosphere, Mach=Mach, altitude=altitude, pi_f=pi_f, **values)
+
+		return FanOptimum(pi_f, quantities, evaluations + 1)
@@ -1,6 +1,7 @@
 import ipywidgets as widgets
 
-from Turbofan_Engine import TurboFanEngine, Atmosphere
+from Turbofan_Engine import TurboFanEngine
+from Atmosphere_Table import AtmosphereTable
 
 flight_mach_number_tbox = widgets.FloatText(
     value   = 0.85,
@@ -336,6 +337,8 @@ def on_fuel_select(change) :
 
 fuel_dropdown.observe(on_fuel_select, names='value')
 
+atmosphere_table = AtmosphereTable()
+
 def setUpEngine(engine : TurboFanEngine) :
 
 	engine.setFuelProperties(
@@ -375,7 +378,7 @@ def setUpEngine(engine : TurboFanEngine) :
 	
 	engine.initializeProblem()
 
-	flight_conditions = Atmosphere(flight_altitude_slider.value)
+	flight_conditions = atmosphere_table(flight_altitude_slider.value)
 	flight_speed = flight_mach_number_tbox.value * flight_conditions.speed_of_sound
 
 	engine.performAnalysis(flight_speed, flight_conditions)
@@ -28,7 +28,7 @@ class Mission :
 
         time_takeoff = self.altitude * np.sqrt(ratio_ascent**2 + 1.0) / speed_takeoff
 
-        num_iter = np.max(time_takeoff / delta_t)
+        num_iter = int(np.ceil(np.max(time_takeoff / delta_t)))
 
         delta_t = time_takeoff / num_iter
 
@@ -54,7 +54,7 @@ class Mission :
 
         time_landing = self.altitude * np.sqrt(ratio_descent**2 + 1.0) / speed_landing
 
-        num_iter = np.max(time_landing / delta_t)
+        num_iter = int(np.ceil(np.max(time_landing / delta_t)))
 
         delta_t = time_landing / num_iter
 
@@ -75,31 +75,3 @@ class Mission :
             self.time_flight = self.time_flight + delta_t
 
         return self.flag
-
-    def landing(self, aircraft:Aircraft, engine:TurboFanEngine, delta_t = 1.0) :
-
-        time_landing = self.altitude * np.sqrt(ratio_descent**2 + 1.0) / speed_landing
-
-        num_iter = np.max(time_landing / delta_t)
-
-        delta_t = time_landing / num_iter
-
-        altitude = 0.0
-
-        for i in range(num_iter) :
-
-            initial_fuel_level = aircraft.mass_fuel
-
-            self.flag = np.bitwise_and(aircraft.fly_aircraft(delta_t, speed_landing, altitude, engine, 'landing'), self.flag)
-
-            altitude = altitude + speed_landing * delta_t / np.sqrt(ratio_descent**2 + 1.0)
-
-            final_fuel_level = aircraft.mass_fuel
-
-            self.fuel_consumed = initial_fuel_level - final_fuel_level
-
-            self.time_flight = self.time_flight + delta_t
-
-        return self.flag
-
-    
\ No newline at end of file
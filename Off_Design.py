@@ -0,0 +1,259 @@
+import numpy as np
+
+from typing import NamedTuple, Any
+from ambiance import CONST, Atmosphere
+
+from Root_Solver import RootResult, solveBracketedRoots
+from Turbofan_Engine import TurboFanEngine
+from Turbofan_Cycle import (
+	getHeatCapacity,
+	getStagnationTemperatureRatio,
+	getStagnationPressureRatio,
+	getRamRecovery,
+	CycleResult,
+	getFlightConditions,
+	castInputs,
+	evaluateCycle,
+	evaluateCycleMasked,
+	rectifyExitConditions
+)
+
+_c_p0 = getHeatCapacity(CONST.kappa, CONST.R)
+
+_fan_exit_critical_pressure_ratio = float(getStagnationPressureRatio(CONST.kappa, 1.0))
+
+# Exponent of the stagnation temperature ratio in the mass flow parameter
+_mass_flow_parameter_exponent = -0.5 * (CONST.kappa + 1.0) / (CONST.kappa - 1.0)
+
+def getMassFlowParameter(mach_number) :
+	'''Mass flow per unit area of a perfect gas, up to a factor depending
+	   only on the total pressure and temperature'''
+
+	return mach_number * np.power(getStagnationTemperatureRatio(CONST.kappa, mach_number), _mass_flow_parameter_exponent)
+
+class OffDesignResult(NamedTuple) :
+	'''Result of OffDesignEngine.evaluate().
+	   cycle is the CycleResult of the operating points, whose parameters
+	   hold the pi_c, pi_f and alpha the engine settles at, mass_flow_ratio
+	   the engine mass flow over the one at the design point and matching
+	   the per-point RootResult of the component matching, whose converged
+	   property masks the points that matched.'''
+
+	cycle			: CycleResult
+	mass_flow_ratio	: Any
+	matching		: RootResult
+
+class OffDesignEngine :
+	'''A fixed engine, sized at the design point of a completed on-design
+	   analysis of a TurboFanEngine, evaluated at other flight conditions and
+	   turbine inlet temperatures (the throttle setting).
+
+	   Follows the turbofan performance analysis of Mattingly : the turbine
+	   inlet and the core nozzle are choked, so the turbine temperature and
+	   pressure ratios keep their design values. The fan compresses the core
+	   flow ahead of the high pressure compressor, and the turbine drives the
+	   high pressure compressor and the fan on separate shafts, which keeps
+	   the work split of the design point. The bypass ratio then follows from
+	   the mass flows through the choked turbine inlet and the fan nozzle.
+	   For every operating point these give a single equation in the fan
+	   temperature ratio, solved by a batched bracketed root solve over all
+	   the points at once. The compressor and fan efficiencies, component
+	   pressure ratios and the fuel keep their design values.
+
+	   The design point may be an array of designs, which then broadcast
+	   against the operating points.'''
+
+	def __init__(self, engine:TurboFanEngine, tolerance = 1E-10, max_iterations = 50) :
+		'''tolerance applies to the fan temperature ratio of the matching'''
+
+		self.specification = engine.getSpecification()
+		self.design = engine.getResult()
+
+		if np.all(self.design.parameters.pi_c >= self.design.parameters.pi_f) :
+
+			pass
+
+		else :
+
+			raise ValueError('The fan precedes the compressor, compression ratio must be greater than or equal to that of the fan. Given value : ' + str(self.design.parameters.pi_c))
+
+		if tolerance > 0 :
+
+			self.tolerance = tolerance
+
+		else :
+
+			raise ValueError('Tolerance must be positive. Given value : ' + str(tolerance))
+
+		if max_iterations >= 1 :
+
+			self.max_iterations = int(max_iterations)
+
+		else :
+
+			raise ValueError('Maximum number of iterations must be at least 1. Given value : ' + str(max_iterations))
+
+		pass
+
+	def _getFanExitMachNumber(self, p, pi_r, pi_d, pi_f) :
+
+		product_pi = pi_r * pi_d * pi_f * p['pi_fn']
+
+		if p['P0_by_P19'] is not None :
+
+			product_pi = product_pi * p['P0_by_P19']
+
+		else :
+
+			product_pi = np.fmin(product_pi, _fan_exit_critical_pressure_ratio)
+
+		# Total pressures below the ambient one give no flow
+		return np.sqrt(np.fmax(
+			(2.0 / (CONST.kappa - 1.0)) * (np.power(product_pi, (CONST.kappa - 1.0) / CONST.kappa) - 1.0),
+			0.0
+		))
+
+	def _matchComponents(self, tau_f, s, p, d) :
+		'''Returns the compressor temperature ratio, fuel ratio and bypass ratio
+		   of the operating points s, with parameters p and design quantities d,
+		   at the fan temperature ratios tau_f'''
+
+		# Temperature ratio of the burner to the fan inlet, relative to design
+		theta = (s['tau_l'] / s['tau_r']) / (d['tau_l'] / d['tau_r'])
+
+		# High pressure spool : tau_cH - 1 proportional to (1 + f) tau_l / (tau_r tau_f),
+		# with f linear in tau_c = tau_f tau_cH, solved for tau_cH
+		tau_cH_R = d['tau_c'] / d['tau_f']
+		K = (tau_cH_R - 1.0) * theta * d['tau_f'] / (1.0 + d['f'])
+		D = p['eta_b'] * p['h_PR'] / (_c_p0 * s['T_0']) - s['tau_l']
+
+		tau_cH = (1.0 + K * (1.0 + s['tau_l'] / D) / tau_f) / (1.0 + K * s['tau_r'] / D)
+		tau_c = tau_f * tau_cH
+
+		f = (s['tau_l'] - s['tau_r'] * tau_c) / D
+
+		pi_c = np.power(tau_c, CONST.kappa * p['e_c'] / (CONST.kappa - 1.0))
+		pi_f = np.power(tau_f, CONST.kappa * p['e_f'] / (CONST.kappa - 1.0))
+
+		# Bypass ratio : fan nozzle flow over the flow through the choked turbine inlet
+		alpha = d['alpha'] * (pi_f / d['pi_f']) * (d['pi_c'] / pi_c) * np.sqrt(theta * d['tau_f'] / tau_f) * (
+			getMassFlowParameter(self._getFanExitMachNumber(p, s['pi_r'], s['pi_d'], pi_f)) /
+			getMassFlowParameter(self._getFanExitMachNumber(p, d['pi_r'], d['pi_d'], d['pi_f']))
+		) * (1.0 + f) / (1.0 + d['f'])
+
+		return tau_c, f, alpha
+
+	def _getFanWorkLimit(self, s, d) :
+		'''Fan temperature ratio - 1 at the operating points s per unit (1 + f) / (1 + alpha),
+		   from the low pressure spool'''
+
+		theta = (s['tau_l'] / s['tau_r']) / (d['tau_l'] / d['tau_r'])
+
+		return (d['tau_f'] - 1.0) * (1.0 + d['alpha']) / (1.0 + d['f']) * theta
+
+	def evaluate(self, flight_speed:np.ndarray, flight_conditions:Atmosphere, T_t4 = None) -> OffDesignResult :
+		'''Evaluates the engine at the given flight conditions and turbine
+		   inlet temperatures in kelvin (the design one if None), all arrays
+		   broadcasting against each other and against the design point.
+		   With masked validation on the engine the operating points are
+		   evaluated with evaluateCycleMasked(), see setMaskedValidation().'''
+
+		design = self.design
+		parameters = design.parameters
+
+		if T_t4 is None :
+
+			T_t4 = parameters.T_t4
+
+		elif self.specification.masked or np.all(np.asarray(T_t4) > 0) :
+
+			pass
+
+		else :
+
+			raise ValueError('Temperature must be positive. Given value : ' + str(T_t4))
+
+		flight_conditions = castInputs(getFlightConditions(flight_speed, flight_conditions, not self.specification.masked), self.specification.precision)
+
+		M_0, T_0 = flight_conditions.M_0, flight_conditions.T_0
+
+		s = {
+			'T_0'	: T_0,
+			'tau_r'	: getStagnationTemperatureRatio(CONST.kappa, M_0),
+			'pi_r'	: getStagnationPressureRatio(CONST.kappa, M_0),
+			'pi_d'	: parameters.pi_dmax * getRamRecovery(M_0),
+			'tau_l'	: parameters.c_pt * T_t4 / (_c_p0 * T_0),
+		}
+
+		d = {
+			name : getattr(design, name)
+			for name in ('tau_r', 'pi_r', 'pi_d', 'tau_l', 'tau_c', 'tau_f', 'f')
+		}
+
+		d.update(alpha=parameters.alpha, pi_c=parameters.pi_c, pi_f=parameters.pi_f)
+
+		p = parameters._asdict()
+
+		shape = np.broadcast_shapes(*(np.shape(value) for value in (*s.values(), *d.values(), *(value for value in p.values() if value is not None))))
+
+		# Every point solved is gathered from flat copies of its inputs
+		flatten = lambda values : {name : None if value is None else np.broadcast_to(value, shape).reshape(-1) for name, value in values.items()}
+
+		s_points, p_points, d_points = flatten(s), flatten(p), flatten(d)
+
+		gather = lambda values, active : {name : None if value is None else value[active] for name, value in values.items()}
+
+		def getResidual(tau_f, active) :
+
+			s_active, d_active = gather(s_points, active), gather(d_points, active)
+
+			tau_c, f, alpha = self._matchComponents(tau_f, s_active, gather(p_points, active), d_active)
+
+			return tau_f - 1.0 - self._getFanWorkLimit(s_active, d_active) * (1.0 + f) / (1.0 + alpha)
+
+		# alpha >= 0 and f <= tau_l / D bound the fan work from above
+		limit = self._getFanWorkLimit(s_points, d_points)
+		D = p_points['eta_b'] * p_points['h_PR'] / (_c_p0 * s_points['T_0']) - s_points['tau_l']
+
+		matching = solveBracketedRoots(
+			getResidual,
+			np.ones(limit.shape),
+			1.0 + limit * (1.0 + s_points['tau_l'] / D),
+			self.tolerance,
+			max_iterations = self.max_iterations
+		)
+
+		tau_f = matching.root.reshape(-1)
+		tau_c, f, alpha = self._matchComponents(tau_f, s_points, p_points, d_points)
+
+		operating = parameters._replace(
+			T_t4	= np.broadcast_to(T_t4, shape),
+			pi_c	= np.power(tau_c, CONST.kappa * p_points['e_c'] / (CONST.kappa - 1.0)).reshape(shape),
+			pi_f	= np.power(tau_f, CONST.kappa * p_points['e_f'] / (CONST.kappa - 1.0)).reshape(shape),
+			alpha	= alpha.reshape(shape),
+		)
+
+		operating = castInputs(operating, self.specification.precision)
+
+		if self.specification.masked :
+
+			cycle = evaluateCycleMasked(operating, flight_conditions)[0]
+
+		else :
+
+			cycle = evaluateCycle(operating, flight_conditions)
+
+		if self.specification.rectify :
+
+			cycle = rectifyExitConditions(cycle, self.specification.rectification_tolerance, self.specification.rectification_max_iterations)
+
+		# Flow through the choked turbine inlet, proportional to P_t4 / sqrt(T_t4)
+		mass_flow_ratio = (
+			((1.0 + operating.alpha) / (1.0 + parameters.alpha)) *
+			(flight_conditions.P_0 * cycle.pi_r * cycle.pi_d * operating.pi_c) /
+			(design.flight_conditions.P_0 * design.pi_r * design.pi_d * parameters.pi_c) *
+			np.sqrt(parameters.T_t4 / operating.T_t4) *
+			(1.0 + design.f) / (1.0 + cycle.f)
+		)
+
+		return OffDesignResult(cycle, mass_flow_ratio, matching)
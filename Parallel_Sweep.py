@@ -0,0 +1,259 @@
+import os
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from ambiance import Atmosphere
+
+from Turbofan_Cycle import CycleParameters
+from Turbofan_Engine import TurboFanEngine, EngineSpecification, SweepResult
+
+class SharedSweepResult(SweepResult) :
+	'''SweepResult whose quantities are views of one shared memory block,
+	   written in place by the worker processes. The block is unlinked by
+	   close(), on leaving a with statement or when the result is collected;
+	   quantity arrays still referenced elsewhere keep it mapped until they
+	   are released.'''
+
+	def __init__(self, axes, coordinates, quantities, shared_memory:SharedMemory) :
+
+		super().__init__(axes, coordinates, quantities)
+
+		self._shared_memory = shared_memory
+
+		pass
+
+	def close(self) :
+
+		if self._shared_memory is not None :
+
+			# The mapping itself is released with the last quantity array
+			self.quantities = {}
+
+			self._shared_memory.unlink()
+			self._shared_memory = None
+
+		pass
+
+	def __enter__(self) :
+
+		return self
+
+	def __exit__(self, *exception) :
+
+		self.close()
+
+		pass
+
+	def __del__(self) :
+
+		self.close()
+
+		pass
+
+class _SharedArray :
+	'''Array interface of a shared memory block, holding the block and a view
+	   of it, so arrays created from it keep the block mapped while they are
+	   referenced. numpy itself only keeps a reference to the mapping, which
+	   SharedMemory.close() (also called when it is collected) would unmap.'''
+
+	def __init__(self, shared_memory:SharedMemory, shape, dtype) :
+
+		# Released in this order, the view before the block is closed
+		self._view = memoryview(shared_memory.buf)
+		self._shared_memory = shared_memory
+
+		self.__array_interface__ = np.ndarray(shape, dtype=dtype, buffer=self._view).__array_interface__
+
+		pass
+
+def _getBlock(value, block) :
+	'''Part of an open mesh array (or scalar) inside a block of the grid,
+	   given as a tuple of slices, itself an open mesh'''
+
+	if value is None or np.ndim(value) == 0 :
+
+		return value
+
+	value = np.reshape(value, (1,) * (len(block) - np.ndim(value)) + np.shape(value))
+
+	return value[tuple(part if size > 1 else slice(None) for part, size in zip(block, value.shape))]
+
+def _evaluateBlock(specification:EngineSpecification, atmosphere, Mach, altitude, memory_name, shape, names, block) :
+	'''Worker task : evaluates the points inside a block of the grid and
+	   writes their quantities into the shared memory block'''
+
+	parameters = CycleParameters(*(_getBlock(value, block) for value in specification.parameters))
+
+	engine = TurboFanEngine()
+	engine.setSpecification(specification._replace(parameters=parameters))
+
+	flight_conditions = atmosphere(_getBlock(altitude, block))
+	flight_speed = _getBlock(Mach, block) * flight_conditions.speed_of_sound
+
+	engine.performAnalysis(flight_speed, flight_conditions)
+
+	quantities = engine.getQuantities()
+
+	shared_memory = SharedMemory(name=memory_name)
+
+	try :
+
+		outputs = np.ndarray((len(names),) + shape, dtype=engine.getPrecision(), buffer=shared_memory.buf)
+
+		for j, name in enumerate(names) :
+
+			outputs[j][block] = quantities[name]
+
+		del outputs
+
+	finally :
+
+		shared_memory.close()
+
+	pass
+
+class ParallelSweepExecutor :
+	'''Evaluates sweeps (see TurboFanEngine.performSweep()) on a pool of worker
+	   processes. The grid is split into rectangular blocks of at most
+	   chunk_size points, so the swept parameters stay open meshes in every
+	   worker as they do in performSweep(). Every task ships the
+	   EngineSpecification of the swept engine, whose parameters are no larger
+	   than the axes, and the worker writes its block straight into a shared
+	   memory block holding every quantity, so no result is pickled back.
+	   The pool is kept between sweeps and shut down by shutdown() (or on
+	   leaving a with statement).'''
+
+	# Upper bound of the points per block, which bounds the memory of a worker
+	_max_chunk_size = 65536
+
+	# Blocks per worker when the chunk size is not given, for load balancing
+	_chunks_per_worker = 4
+
+	def __init__(self, workers = None) :
+
+		if workers is None :
+
+			workers = os.cpu_count()
+
+		if workers >= 1 :
+
+			self.workers = int(workers)
+
+		else :
+
+			raise ValueError('Number of workers must be at least 1. Given value : ' + str(workers))
+
+		self._pool = ProcessPoolExecutor(self.workers)
+
+		pass
+
+	def _getBlocks(self, shape, chunk_size) :
+		'''Splits the grid into blocks of single indices along the leading axes,
+		   a range along one axis and the full trailing axes'''
+
+		if chunk_size is None :
+
+			cap = self._max_chunk_size
+
+		elif chunk_size >= 1 :
+
+			cap = int(chunk_size)
+
+		else :
+
+			raise ValueError('Chunk size must be at least 1. Given value : ' + str(chunk_size))
+
+		# Without a chunk size there should be enough blocks to balance the load
+		blocks = 1 if chunk_size is not None else self.workers * self._chunks_per_worker
+
+		# Fewest leading axes to split over for the trailing ones to fit in a block
+		k = next((k for k in range(1, len(shape)) if np.prod(shape[k:], dtype=int) <= cap and np.prod(shape[:k], dtype=int) >= blocks), len(shape))
+
+		tail = int(np.prod(shape[k:], dtype=int))
+		rows = shape[k - 1]
+
+		total_rows = int(np.prod(shape[:k], dtype=int))
+		rows_per_block = max(min(cap // tail, -(-total_rows // blocks)), 1)
+
+		return [
+			tuple(slice(i, i + 1) for i in lead) + (slice(start, min(start + rows_per_block, rows)),) + (slice(None),) * (len(shape) - k)
+			for lead in np.ndindex(*shape[:k - 1])
+			for start in range(0, rows, rows_per_block)
+		]
+
+	def performSweep(self, engine:TurboFanEngine, atmosphere = Atmosphere, precision = None, chunk_size = None, **axes) -> SharedSweepResult :
+		'''Same as engine.performSweep(atmosphere, precision, **axes), evaluated
+		   in parallel. atmosphere must be picklable, like ambiance.Atmosphere
+		   or an AtmosphereTable.'''
+
+		coordinates = engine.getSweepCoordinates(**axes)
+
+		grids = {}
+
+		for i, (axis, values) in enumerate(coordinates.items()) :
+
+			grid_shape = [1] * len(coordinates)
+			grid_shape[i] = values.size
+
+			grids[axis] = values.reshape(grid_shape)
+
+		shape = tuple(values.size for values in coordinates.values())
+
+		sweep_engine = engine.getSweepEngine(precision, **grids)
+		specification = sweep_engine.getSpecification()
+
+		names = sweep_engine.getQuantityNames()
+		dtype = sweep_engine.getPrecision()
+
+		blocks = self._getBlocks(shape, chunk_size)
+
+		shared_memory = SharedMemory(create=True, size=max(len(names) * int(np.prod(shape, dtype=int)) * dtype.itemsize, 1))
+
+		try :
+
+			tasks = [
+				self._pool.submit(
+					_evaluateBlock,
+					specification,
+					atmosphere,
+					grids['Mach'],
+					grids['altitude'],
+					shared_memory.name,
+					shape,
+					names,
+					block
+				)
+				for block in blocks
+			]
+
+			for task in tasks :
+
+				task.result()
+
+		except :
+
+			shared_memory.close()
+			shared_memory.unlink()
+
+			raise
+
+		outputs = np.asarray(_SharedArray(shared_memory, (len(names),) + shape, dtype))
+
+		return SharedSweepResult(coordinates.keys(), coordinates, {name : outputs[j] for j, name in enumerate(names)}, shared_memory)
+
+	def shutdown(self) :
+
+		self._pool.shutdown()
+
+		pass
+
+	def __enter__(self) :
+
+		return self
+
+	def __exit__(self, *exception) :
+
+		self.shutdown()
+
+		pass
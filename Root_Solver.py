@@ -0,0 +1,117 @@
+import numpy as np
+
+from typing import NamedTuple, Any
+
+# Per-point status codes of solveBracketedRoots()
+CONVERGED		= 0
+MAX_ITERATIONS	= 1
+NO_BRACKET		= 2
+
+class RootResult(NamedTuple) :
+	'''Per-point outcome of solveBracketedRoots().
+	   status holds CONVERGED, MAX_ITERATIONS or NO_BRACKET and
+	   iterations the number of function evaluations spent on each point
+	   after the initial bracket.'''
+
+	root		: Any
+	residual	: Any
+	status		: Any
+	iterations	: Any
+
+	@property
+	def converged(self) :
+
+		return self.status == CONVERGED
+
+def solveBracketedRoots(function, lower, upper, tolerance = 1E-8, x_tolerance = 1E-12, max_iterations = 50) :
+	'''Finds a root of function inside [lower, upper] for every point of a batch.
+
+	   function(x, points) must return the residuals at the 1-D abscissae x for
+	   the flat point indices points, so only the still unconverged points are
+	   evaluated. Uses the Illinois variant of regula falsi, which keeps the
+	   root bracketed while converging superlinearly, falling back to
+	   bisection whenever the secant step does not land inside the bracket.
+	   A point converges once |residual| <= tolerance or the bracket is
+	   narrower than x_tolerance. Points whose bracket ends do not differ in
+	   sign are reported as NO_BRACKET and are not iterated.'''
+
+	lower, upper = np.broadcast_arrays(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+
+	shape = lower.shape
+
+	a = lower.reshape(-1).copy()
+	b = upper.reshape(-1).copy()
+
+	points = np.arange(a.size)
+
+	f_a = np.asarray(function(a, points), dtype=float)
+	f_b = np.asarray(function(b, points), dtype=float)
+
+	root = np.where(np.abs(f_a) <= np.abs(f_b), a, b)
+	residual = np.where(np.abs(f_a) <= np.abs(f_b), f_a, f_b)
+
+	status = np.full(a.size, MAX_ITERATIONS, dtype=np.int8)
+	iterations = np.zeros(a.size, dtype=np.int32)
+
+	status[np.abs(residual) <= tolerance] = CONVERGED
+	status[(status != CONVERGED) & ~(np.sign(f_a) * np.sign(f_b) < 0)] = NO_BRACKET
+
+	# Which end was kept on the previous step : -1 for a, +1 for b, 0 for neither
+	kept = np.zeros(a.size, dtype=np.int8)
+
+	active = np.flatnonzero(status == MAX_ITERATIONS)
+
+	for i in range(max_iterations) :
+
+		if active.size == 0 :
+
+			break
+
+		a_i, b_i = a[active], b[active]
+		f_a_i, f_b_i = f_a[active], f_b[active]
+
+		x = b_i - f_b_i * (b_i - a_i) / (f_b_i - f_a_i)
+
+		# Bisect when the secant step is not strictly inside the bracket (or NaN)
+		bisect = ~((x > np.fmin(a_i, b_i)) & (x < np.fmax(a_i, b_i)))
+		x = np.where(bisect, 0.5 * (a_i + b_i), x)
+
+		f_x = np.asarray(function(x, active), dtype=float)
+
+		iterations[active] += 1
+
+		root[active] = x
+		residual[active] = f_x
+
+		# Keep the sub-interval over which the residual changes sign
+		replace_b = np.sign(f_x) == np.sign(f_b_i)
+
+		a_new = np.where(replace_b, a_i, x)
+		b_new = np.where(replace_b, x, b_i)
+
+		f_a_new = np.where(replace_b, f_a_i, f_x)
+		f_b_new = np.where(replace_b, f_x, f_b_i)
+
+		# Illinois step : halve the residual at an end kept twice in a row
+		kept_now = np.where(replace_b, -1, 1).astype(np.int8)
+		repeated = (kept_now == kept[active]) & ~bisect
+
+		f_a_new = np.where(repeated & (kept_now == -1), 0.5 * f_a_new, f_a_new)
+		f_b_new = np.where(repeated & (kept_now == 1), 0.5 * f_b_new, f_b_new)
+
+		a[active], b[active] = a_new, b_new
+		f_a[active], f_b[active] = f_a_new, f_b_new
+		kept[active] = kept_now
+
+		done = (np.abs(f_x) <= tolerance) | (np.abs(b_new - a_new) <= x_tolerance)
+
+		status[active[done]] = CONVERGED
+
+		active = active[~done]
+
+	return RootResult(
+		root.reshape(shape),
+		residual.reshape(shape),
+		status.reshape(shape),
+		iterations.reshape(shape)
+	)
@@ -0,0 +1,199 @@
+import os
+import json
+import tempfile
+import numpy as np
+
+from typing import NamedTuple
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine, SweepResult
+
+class SweepProgress(NamedTuple) :
+	'''Progress of a SweepRunner, yielded after every chunk'''
+
+	chunks_completed	: int
+	chunks_total		: int
+	points_completed	: int
+	points_total		: int
+
+	@property
+	def fraction(self) :
+
+		return self.points_completed / self.points_total
+
+class SweepRunner :
+	'''Evaluates the outer product of sweep axes (see TurboFanEngine.performSweep())
+	   in chunks of chunk_size points, in C order of the grid, and writes every
+	   quantity into a memory-mapped .npy file of the full grid shape in directory.
+
+	   Only one chunk of points is held in memory at a time, so the peak memory
+	   is bounded by chunk_size and not by the size of the grid. The number of
+	   completed chunks is stored in sweep.json once their outputs are flushed,
+	   and a runner created on the same directory with the same engine
+	   parameters, axes and chunk size resumes from the last completed chunk.'''
+
+	_manifest_name = 'sweep.json'
+
+	def __init__(self, engine:TurboFanEngine, directory, chunk_size = 65536, atmosphere = Atmosphere, precision = None, **axes) :
+
+		if chunk_size >= 1 :
+
+			self.chunk_size = int(chunk_size)
+
+		else :
+
+			raise ValueError('Chunk size must be at least 1. Given value : ' + str(chunk_size))
+
+		self.engine = engine
+		self.directory = directory
+		self.atmosphere = atmosphere
+		self.precision = precision
+
+		self.coordinates = engine.getSweepCoordinates(**axes)
+		self.shape = tuple(values.size for values in self.coordinates.values())
+
+		self.points_total = int(np.prod(self.shape))
+		self.chunks_total = -(-self.points_total // self.chunk_size)
+
+		# Identifies the sweep, a resumed run must match it
+		self._specification = {
+			'axes'			: {axis : values.tolist() for axis, values in self.coordinates.items()},
+			'chunk_size'	: self.chunk_size,
+			'precision'		: None if precision is None else np.dtype(precision).name,
+			'parameters'	: {field : None if value is None else np.asarray(value).tolist() for field, value in engine.getParameters()._asdict().items()},
+		}
+
+		self.chunks_completed = 0
+		self.quantities = None
+
+		os.makedirs(directory, exist_ok=True)
+
+		manifest = self._readManifest()
+
+		if manifest is not None :
+
+			if manifest['specification'] != self._specification :
+
+				raise ValueError('Directory ' + str(directory) + ' holds a different sweep. Use an empty directory.')
+
+			self.chunks_completed = manifest['chunks_completed']
+			self.quantities = manifest['quantities']
+
+		pass
+
+	def _getManifestPath(self) :
+
+		return os.path.join(self.directory, self._manifest_name)
+
+	def _getQuantityPath(self, name) :
+
+		return os.path.join(self.directory, name + '.npy')
+
+	def _readManifest(self) :
+
+		if os.path.exists(self._getManifestPath()) :
+
+			with open(self._getManifestPath()) as file :
+
+				return json.load(file)
+
+		else :
+
+			return None
+
+	def _writeManifest(self) :
+
+		path = self._getManifestPath()
+
+		# Written to a file of its own, so runners sharing the directory do
+		# not clobber each other, then replaced atomically, so a crash
+		# leaves either the old or the new count
+		descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+
+		try :
+
+			with os.fdopen(descriptor, 'w') as file :
+
+				json.dump({
+					'specification'		: self._specification,
+					'chunks_completed'	: self.chunks_completed,
+					'quantities'		: self.quantities,
+				}, file)
+
+			os.replace(temporary_path, path)
+
+		except BaseException :
+
+			os.remove(temporary_path)
+
+			raise
+
+		pass
+
+	def getProgress(self) -> SweepProgress :
+
+		return SweepProgress(
+			self.chunks_completed,
+			self.chunks_total,
+			min(self.chunks_completed * self.chunk_size, self.points_total),
+			self.points_total
+		)
+
+	def isComplete(self) :
+
+		return self.chunks_completed == self.chunks_total
+
+	def run(self) :
+		'''Generator evaluating the remaining chunks, yielding the SweepProgress
+		   after every chunk. Stopping the iteration early (or a crash) loses at
+		   most the chunk being evaluated.'''
+
+		outputs = None
+
+		if self.quantities is not None :
+
+			outputs = {name : np.load(self._getQuantityPath(name), mmap_mode='r+') for name in self.quantities}
+
+		for chunk in range(self.chunks_completed, self.chunks_total) :
+
+			start = chunk * self.chunk_size
+			stop = min(start + self.chunk_size, self.points_total)
+
+			index = np.unravel_index(np.arange(start, stop), self.shape)
+
+			values = {axis : coordinates[i] for (axis, coordinates), i in zip(self.coordinates.items(), index)}
+
+			quantities = self.engine.evaluatePoints(self.atmosphere, self.precision, **values)
+
+			if outputs is None :
+
+				outputs = {
+					name : np.lib.format.open_memmap(self._getQuantityPath(name), mode='w+', dtype=value.dtype, shape=self.shape)
+					for name, value in quantities.items()
+				}
+
+				self.quantities = list(outputs.keys())
+
+			for name, output in outputs.items() :
+
+				output.reshape(-1)[start:stop] = quantities[name]
+				output.flush()
+
+			self.chunks_completed = chunk + 1
+			self._writeManifest()
+
+			yield self.getProgress()
+
+		pass
+
+	def getResult(self) -> SweepResult :
+		'''Returns a SweepResult whose quantities are read-only memory maps
+		   of the output files'''
+
+		if not self.isComplete() :
+
+			raise ValueError('Sweep incomplete, ' + str(self.chunks_completed) + ' of ' + str(self.chunks_total) + ' chunks evaluated. Run run() to completion.')
+
+		quantities = {name : np.load(self._getQuantityPath(name), mmap_mode='r') for name in self.quantities}
+
+		return SweepResult(self.coordinates.keys(), self.coordinates, quantities)
@@ -0,0 +1,1336 @@
+import math
+import numpy as np
+
+from typing import NamedTuple, Any
+from ambiance import CONST
+
+from Root_Solver import RootResult, NO_BRACKET, solveBracketedRoots
+from Dual_Numbers import Dual
+
+def getGasConstant(gamma, c_p) :
+	'''Enter c_p in J / kg - K'''
+	return (gamma - 1.0) * c_p / gamma
+
+def getHeatCapacity(gamma, R) :
+	'''Enter R in J / kg - K'''
+	return gamma * R / (gamma - 1.0)
+
+def getSonicSpeed(gamma, gas_constant, temperature) :
+	'''Enter gas_constant in J / kg - K and temperature in kelvin'''
+	return np.sqrt(gamma * gas_constant * temperature)
+
+def getStagnationTemperatureRatio(gamma, mach_number) :
+
+	return 1.0 + 0.5 * (gamma - 1.0) * (mach_number**2)
+
+def getStagnationPressureRatio(gamma, mach_number) :
+
+	return np.power(
+		getStagnationTemperatureRatio(gamma, mach_number),
+		gamma / (gamma - 1)
+	)
+
+def getRamRecovery(mach_number) :
+	'''Vectorized for array input.
+	   Mach number should be an ndarray.'''
+
+	# if mach_number <= 1.0 :
+
+	#     return 1.0
+
+	# elif mach_number <= 5.0 :
+
+	#     return 1.0 - 0.075 * np.float_power((mach_number - 1.0), 1.35)
+
+	# else :
+
+	#     return 800.0 / (np.power(mach_number, 4) + 935.0)
+
+	return  np.where(mach_number <= 1.0,
+				1.0,
+			# else
+				np.where(mach_number <= 5.0,
+					1.0 - 0.075 * np.power((np.fmax(mach_number, 1.0) - 1.0), 1.35),
+				# else
+					800.0 / (np.power(mach_number, 4) + 935.0)
+				)
+			)
+
+# Loop-invariant constants of the free stream air
+_c_p0 = getHeatCapacity(CONST.kappa, CONST.R)
+
+_ram_temperature_coefficient = 0.5 * (CONST.kappa - 1.0)
+_ram_pressure_exponent = CONST.kappa / (CONST.kappa - 1.0)
+
+_fan_exit_exponent = (CONST.kappa - 1.0) / CONST.kappa
+_fan_exit_critical_pressure_ratio = float(getStagnationPressureRatio(CONST.kappa, 1.0))
+
+# The constants above are Python floats, which numpy does not let promote
+# float32 arrays, so the cycle keeps the precision of its inputs
+
+class CycleParameters(NamedTuple) :
+	'''Immutable record of every engine parameter used by the cycle.
+	   Any field may be an ndarray, fields broadcast against each other
+	   and against the flight conditions. The exit pressure ratios are
+	   None when the nozzles are to be treated as ideally expanded or choked.'''
+
+	h_PR	: Any
+	gamma_t	: Any
+	c_pt	: Any
+	T_t4	: Any
+	e_t		: Any
+	eta_m	: Any
+	pi_c	: Any
+	e_c		: Any
+	pi_f	: Any
+	e_f		: Any
+	pi_dmax	: Any
+	pi_fn	: Any
+	pi_n	: Any
+	pi_b	: Any
+	eta_b	: Any
+	alpha	: Any
+
+	P0_by_P9	: Any = None
+	P0_by_P19	: Any = None
+
+class FlightConditions(NamedTuple) :
+	'''Immutable record of the free stream.
+	   Speed in m / s, temperature in kelvin and pressure in Pa.'''
+
+	V_0	: Any
+	M_0	: Any
+	T_0	: Any
+	P_0	: Any
+	a_0	: Any
+
+def getFlightConditions(flight_speed, air, validate = True) :
+	'''air is any object with temperature, pressure and speed_of_sound
+	   attributes, e.g. an ambiance.Atmosphere. Without validate, flight
+	   speeds that are not positive are left to be masked by evaluateCycleMasked()'''
+
+	if not validate or np.all(flight_speed > 0) :
+
+		return FlightConditions(
+			flight_speed,
+			flight_speed / air.speed_of_sound,
+			air.temperature,
+			air.pressure,
+			air.speed_of_sound
+		)
+
+	else :
+
+		raise ValueError('Flight speed must be positive. Given value : ' + str(flight_speed))
+
+def castInputs(record, dtype) :
+	'''Returns a CycleParameters or FlightConditions record with every field
+	   (but None) converted to an ndarray of the given floating point dtype.
+	   The cycle evaluates in the precision of its inputs, so records cast to
+	   float32 are evaluated entirely in float32.'''
+
+	return type(record)(*(None if value is None else np.asarray(value, dtype=dtype) for value in record))
+
+class CycleResult(NamedTuple) :
+	'''Immutable record of every quantity computed by evaluateCycle(),
+	   together with the parameters and flight conditions it was computed for.
+	   rectification is None unless the exit conditions were rectified.'''
+
+	parameters			: CycleParameters
+	flight_conditions	: FlightConditions
+
+	tau_r	: Any
+	pi_r	: Any
+	pi_d	: Any
+	tau_l	: Any
+	tau_c	: Any
+	tau_f	: Any
+
+	f		: Any
+
+	tau_t	: Any
+	pi_t	: Any
+
+	P_9		: Any
+	M_9		: Any
+	T_9		: Any
+	V_9		: Any
+
+	P_19	: Any
+	M_19	: Any
+	T_19	: Any
+	V_19	: Any
+
+	ST_core	: Any
+	ST_fan	: Any
+	ST		: Any
+
+	thrust_power_core	: Any
+	thrust_power_fan	: Any
+	thrust_power		: Any
+
+	Delta_KE_fan	: Any
+	Delta_KE_core	: Any
+	Delta_KE		: Any
+
+	thermal_energy	: Any
+
+	TSFC		: Any
+	eta_P		: Any
+	eta_P_fan	: Any
+	eta_P_core	: Any
+	eta_T		: Any
+
+	rectification	: Any = None
+
+# Names of the computed quantities of a CycleResult
+_cycle_outputs = CycleResult._fields[2:-1]
+
+# Every stage takes the parameters and the quantities computed so far
+# (flight conditions included) and returns a dict of new quantities
+
+def _initializeRatios(p:CycleParameters, s) :
+
+	return {
+		'tau_r'	: getStagnationTemperatureRatio(CONST.kappa, s['M_0']),
+		'pi_r'	: getStagnationPressureRatio(CONST.kappa, s['M_0']),
+		'pi_d'	: p.pi_dmax * getRamRecovery(s['M_0']),
+		'tau_l'	: p.c_pt * p.T_t4 / (_c_p0 * s['T_0']),
+		'tau_c'	: np.power(p.pi_c, (CONST.kappa - 1.0) / (CONST.kappa * p.e_c)),
+		'tau_f'	: np.power(p.pi_f, (CONST.kappa - 1.0) / (CONST.kappa * p.e_f)),
+	}
+
+def _calculateFuelRatio(p:CycleParameters, s) :
+
+	return {
+		'f' : (s['tau_l'] - s['tau_r'] * s['tau_c']) / ((p.eta_b * p.h_PR / (_c_p0 * s['T_0'])) - s['tau_l'])
+	}
+
+def _performTurbineEnergyBalance(p:CycleParameters, s) :
+
+	tau_t = 1.0 - (1.0 / (p.eta_m * (1 + s['f']))) * (s['tau_r'] / s['tau_l']) * (s['tau_c'] - 1.0 + p.alpha * (s['tau_f'] - 1.0))
+
+	return {
+		'tau_t'	: tau_t,
+		'pi_t'	: np.power(tau_t, p.gamma_t / ((p.gamma_t - 1.0) * p.e_t)),
+	}
+
+def _getCoreProductPi(p:CycleParameters, s) :
+
+	return s['pi_r'] * s['pi_d'] * p.pi_c * p.pi_b * s['pi_t'] * p.pi_n
+
+def _getFanProductPi(p:CycleParameters, s) :
+
+	return s['pi_r'] * s['pi_d'] * p.pi_f * p.pi_fn
+
+def _getCoreExitState(p:CycleParameters, s, M_9) :
+	'''Static temperature and velocity at the core exit for a given exit Mach number'''
+
+	T_9 = s['T_0'] * (s['tau_l'] * s['tau_t'] / getStagnationTemperatureRatio(p.gamma_t, M_9)) * (_c_p0 / p.c_pt)
+	V_9 = M_9 * getSonicSpeed(p.gamma_t, getGasConstant(p.gamma_t, p.c_pt), T_9)
+
+	return T_9, V_9
+
+def _getFanExitState(p:CycleParameters, s, M_19) :
+	'''Static temperature and velocity at the fan exit for a given exit Mach number'''
+
+	T_19 = s['T_0'] * (s['tau_r'] * s['tau_f'] / getStagnationTemperatureRatio(CONST.kappa, M_19))
+	V_19 = M_19 * s['a_0'] * np.sqrt(T_19 / s['T_0'])
+
+	return T_19, V_19
+
+def _calculateCoreExitConditions(p:CycleParameters, s) :
+
+	product_pi = _getCoreProductPi(p, s)
+
+	if p.P0_by_P9 is not None :
+
+		P_9 = s['P_0'] / p.P0_by_P9
+		M_9 = np.sqrt(
+			(2.0 / (p.gamma_t - 1.0)) *
+			(np.power(product_pi * p.P0_by_P9, (p.gamma_t - 1.0) / p.gamma_t) - 1.0)
+		)
+
+	else :
+
+		P_9 = s['P_0'] * product_pi / getStagnationPressureRatio(p.gamma_t, 1.0)
+
+		condition = P_9 < s['P_0']
+
+		M_9 = np.where(condition,
+				np.sqrt(
+					(2.0 / (p.gamma_t - 1.0)) *
+					(np.power(product_pi, (p.gamma_t - 1.0) / p.gamma_t) - 1.0)
+				),
+			# else
+				1.0
+		)
+
+		P_9 = np.where(condition, s['P_0'], P_9)
+
+	T_9, V_9 = _getCoreExitState(p, s, M_9)
+
+	return {'P_9' : P_9, 'M_9' : M_9, 'T_9' : T_9, 'V_9' : V_9}
+
+def _calculateFanExitConditions(p:CycleParameters, s) :
+
+	product_pi = _getFanProductPi(p, s)
+
+	if p.P0_by_P19 is not None :
+
+		P_19 = s['P_0'] / p.P0_by_P19
+
+		M_19 = np.sqrt(
+			(2.0 / (CONST.kappa - 1.0)) *
+			(np.power(product_pi * p.P0_by_P19, (CONST.kappa - 1.0) / CONST.kappa) - 1.0)
+		)
+
+	else :
+
+		P_19 = s['P_0'] * product_pi / _fan_exit_critical_pressure_ratio
+
+		condition = P_19 < s['P_0']
+
+		M_19 = np.where(condition,
+				np.sqrt(
+					(2.0 / (CONST.kappa - 1.0)) *
+					(np.power(product_pi, (CONST.kappa - 1.0) / CONST.kappa) - 1.0)
+				),
+			# else
+				1.0
+		)
+
+		P_19 = np.where(condition, s['P_0'], P_19)
+
+	T_19, V_19 = _getFanExitState(p, s, M_19)
+
+	return {'P_19' : P_19, 'M_19' : M_19, 'T_19' : T_19, 'V_19' : V_19}
+
+def _calculateThrust(p:CycleParameters, s) :
+
+	V_0 = s['V_0']
+
+	ST_core = (1.0 / (1.0 + p.alpha)) * (
+		(1.0 + s['f']) * s['V_9'] - V_0 +
+		(1.0 + s['f']) * getGasConstant(p.gamma_t, p.c_pt) * (s['a_0'] ** 2) * s['T_9'] * (1.0 - (s['P_0'] / s['P_9'])) / (CONST.kappa * CONST.R * s['T_0'] * s['V_9'])
+	)
+
+	ST_fan = (p.alpha / (1.0 + p.alpha)) * (
+		s['V_19'] - V_0 +
+		(s['a_0'] ** 2) * s['T_19'] * (1.0 - (s['P_0'] / s['P_19'])) / (CONST.kappa * s['T_0'] * s['V_19'])
+	)
+
+	return {'ST_core' : ST_core, 'ST_fan' : ST_fan, 'ST' : ST_core + ST_fan}
+
+def _calculateEnergies(p:CycleParameters, s) :
+
+	V_0 = s['V_0']
+
+	thrust_power_core	= s['ST_core'] * V_0
+	thrust_power_fan	= s['ST_fan'] * V_0
+
+	Delta_KE_fan	= 0.5 * p.alpha * ((s['V_19'] - V_0) ** 2) / (1.0 + p.alpha)
+	Delta_KE_core	= 0.5 * ((s['V_9'] - V_0) ** 2) / (1.0 + p.alpha)
+
+	return {
+		'thrust_power_core'	: thrust_power_core,
+		'thrust_power_fan'	: thrust_power_fan,
+		'thrust_power'		: thrust_power_core + thrust_power_fan,
+		'Delta_KE_fan'		: Delta_KE_fan,
+		'Delta_KE_core'		: Delta_KE_core,
+		'Delta_KE'			: Delta_KE_core + Delta_KE_fan,
+		'thermal_energy'	: s['f'] * p.h_PR / (1.0 + p.alpha),
+	}
+
+def _calculateSpecificFuelConsumption(p:CycleParameters, s) :
+
+	return {
+		'TSFC' : s['f'] / ((1.0 + p.alpha) * s['ST'])
+	}
+
+def _calculatePerformanceParameters(p:CycleParameters, s) :
+
+	return {
+		'eta_P'			: s['thrust_power'] / (s['thrust_power'] + s['Delta_KE']),
+		'eta_P_fan'		: s['thrust_power_fan'] / (s['thrust_power_fan'] + s['Delta_KE_fan']),
+		'eta_P_core'	: s['thrust_power_core'] / (s['thrust_power_core'] + s['Delta_KE_core']),
+		'eta_T'			: (s['thrust_power'] + s['Delta_KE']) / s['thermal_energy'],
+	}
+
+# Stages in the order they are evaluated
+CYCLE_STAGES = (
+	('initializeRatios',				_initializeRatios),
+	('calculateFuelRatio',				_calculateFuelRatio),
+	('performTurbineEnergyBalance',		_performTurbineEnergyBalance),
+	('calculateCoreExitConditions',		_calculateCoreExitConditions),
+	('calculateFanExitConditions',		_calculateFanExitConditions),
+	('calculateThrust',					_calculateThrust),
+	('calculateSpecificFuelConsumption',	_calculateSpecificFuelConsumption),
+	('calculateEnergies',				_calculateEnergies),
+	('calculatePerformanceParameters',	_calculatePerformanceParameters),
+)
+
+# Stages downstream of the exit conditions, rerun when those are rectified
+_exit_dependent_stages = (
+	'calculateThrust',
+	'calculateSpecificFuelConsumption',
+	'calculateEnergies',
+	'calculatePerformanceParameters',
+)
+
+# Parameters, state inputs (flight conditions or outputs of earlier
+# stages) and outputs of every stage, used to find the stages a change invalidates
+STAGE_DEPENDENCIES = {
+	'initializeRatios' : (
+		('pi_dmax', 'c_pt', 'T_t4', 'pi_c', 'e_c', 'pi_f', 'e_f'),
+		('M_0', 'T_0'),
+		('tau_r', 'pi_r', 'pi_d', 'tau_l', 'tau_c', 'tau_f')
+	),
+	'calculateFuelRatio' : (
+		('eta_b', 'h_PR'),
+		('T_0', 'tau_l', 'tau_r', 'tau_c'),
+		('f',)
+	),
+	'performTurbineEnergyBalance' : (
+		('eta_m', 'alpha', 'gamma_t', 'e_t'),
+		('f', 'tau_r', 'tau_l', 'tau_c', 'tau_f'),
+		('tau_t', 'pi_t')
+	),
+	'calculateCoreExitConditions' : (
+		('pi_c', 'pi_b', 'pi_n', 'gamma_t', 'c_pt', 'P0_by_P9'),
+		('P_0', 'T_0', 'pi_r', 'pi_d', 'pi_t', 'tau_l', 'tau_t'),
+		('P_9', 'M_9', 'T_9', 'V_9')
+	),
+	'calculateFanExitConditions' : (
+		('pi_f', 'pi_fn', 'P0_by_P19'),
+		('P_0', 'T_0', 'a_0', 'pi_r', 'pi_d', 'tau_r', 'tau_f'),
+		('P_19', 'M_19', 'T_19', 'V_19')
+	),
+	'calculateThrust' : (
+		('alpha', 'gamma_t', 'c_pt'),
+		('V_0', 'P_0', 'T_0', 'a_0', 'f', 'P_9', 'T_9', 'V_9', 'P_19', 'T_19', 'V_19'),
+		('ST_core', 'ST_fan', 'ST')
+	),
+	'calculateSpecificFuelConsumption' : (
+		('alpha',),
+		('f', 'ST'),
+		('TSFC',)
+	),
+	'calculateEnergies' : (
+		('alpha', 'h_PR'),
+		('V_0', 'f', 'V_9', 'V_19', 'ST_core', 'ST_fan'),
+		('thrust_power_core', 'thrust_power_fan', 'thrust_power', 'Delta_KE_fan', 'Delta_KE_core', 'Delta_KE', 'thermal_energy')
+	),
+	'calculatePerformanceParameters' : (
+		(),
+		('thrust_power', 'thrust_power_fan', 'thrust_power_core', 'Delta_KE', 'Delta_KE_fan', 'Delta_KE_core', 'thermal_energy'),
+		('eta_P', 'eta_P_fan', 'eta_P_core', 'eta_T')
+	),
+}
+
+def _isUnchanged(new, old) :
+
+	if new is old :
+
+		return True
+
+	elif new is None or old is None :
+
+		return False
+
+	else :
+
+		return np.shape(new) == np.shape(old) and np.result_type(new) == np.result_type(old) and np.array_equal(new, old)
+
+def getStaleStages(previous, parameters:CycleParameters, flight_conditions:FlightConditions) :
+	'''Names of the stages, in evaluation order, whose outputs stored in the
+	   CycleResult previous are invalidated by the given parameters and flight
+	   conditions. Inputs are compared by value, so the arrays held by
+	   previous must not have been modified in place since it was computed.
+	   Every stage is stale when previous is None, and so is every stage
+	   whose outputs previous does not hold (see evaluateCycle outputs).'''
+
+	if previous is None :
+
+		return tuple(name for name, stage in CYCLE_STAGES)
+
+	changed = set()
+
+	changed.update(field for field, new, old in zip(CycleParameters._fields, parameters, previous.parameters) if not _isUnchanged(new, old))
+	changed.update(field for field, new, old in zip(FlightConditions._fields, flight_conditions, previous.flight_conditions) if not _isUnchanged(new, old))
+
+	stale = []
+
+	for name, stage in CYCLE_STAGES :
+
+		stage_parameters, stage_inputs, stage_outputs = STAGE_DEPENDENCIES[name]
+
+		if changed.intersection(stage_parameters) or changed.intersection(stage_inputs) or getattr(previous, stage_outputs[0]) is None :
+
+			stale.append(name)
+			changed.update(stage_outputs)
+
+	return tuple(stale)
+
+def getRequiredStages(outputs) :
+	'''Names of the stages, in evaluation order, needed to compute the given quantities'''
+
+	producers = {output : name for name, (stage_parameters, stage_inputs, stage_outputs) in STAGE_DEPENDENCIES.items() for output in stage_outputs}
+
+	required = set()
+	pending = [producers[output] for output in outputs]
+
+	while pending :
+
+		name = pending.pop()
+
+		if name not in required :
+
+			required.add(name)
+			pending.extend(producers[value] for value in STAGE_DEPENDENCIES[name][1] if value in producers)
+
+	return tuple(name for name, stage in CYCLE_STAGES if name in required)
+
+# Target of the exit rectification, applied where the propulsive
+# efficiency of a stream exceeds 1, and the upper exit Mach number searched
+_rectified_propulsive_efficiency = 0.99
+_rectified_exit_mach_number_limit = 2.0
+
+# Status of the points that did not need rectifying
+RECTIFICATION_NOT_NEEDED = -1
+
+class ExitRectification(NamedTuple) :
+	'''Per-point outcome of rectifyExitConditions() for both streams, as
+	   RootResult records of the full result shape. Points that did not
+	   need rectifying have status RECTIFICATION_NOT_NEEDED.'''
+
+	core	: RootResult
+	fan		: RootResult
+
+def _getState(result:CycleResult) :
+
+	state = result.flight_conditions._asdict()
+
+	state.update((field, getattr(result, field)) for field in _cycle_outputs)
+
+	return state
+
+def _rectifyExitConditions(p:CycleParameters, s, stream, tolerance, max_iterations) :
+	'''Solves for the exit Mach number of the given stream ('core' or 'fan')
+	   at which its propulsive efficiency is 0.99, at the points where it
+	   exceeds 1. Only those points are gathered and iterated.'''
+
+	if stream == 'core' :
+
+		eta_P, M, P = 'eta_P_core', 'M_9', 'P_9'
+		thrust_power_key, Delta_KE_key = 'thrust_power_core', 'Delta_KE_core'
+		getExitState, getProductPi = _getCoreExitState, _getCoreProductPi
+		getGamma = lambda p : p.gamma_t
+
+	else :
+
+		eta_P, M, P = 'eta_P_fan', 'M_19', 'P_19'
+		thrust_power_key, Delta_KE_key = 'thrust_power_fan', 'Delta_KE_fan'
+		getExitState, getProductPi = _getFanExitState, _getFanProductPi
+		getGamma = lambda p : CONST.kappa
+
+	condition = s[eta_P] > 1
+	shape = condition.shape
+
+	report = RootResult(
+		np.array(np.broadcast_to(s[M], shape)),
+		np.array(np.broadcast_to(s[eta_P], shape)) - _rectified_propulsive_efficiency,
+		np.full(shape, RECTIFICATION_NOT_NEEDED, dtype=np.int8),
+		np.zeros(shape, dtype=np.int32)
+	)
+
+	points = np.flatnonzero(condition)
+
+	if points.size == 0 :
+
+		return s, report
+
+	index = np.unravel_index(points, shape)
+
+	p_points = CycleParameters(*(None if value is None else np.broadcast_to(value, shape)[index] for value in p))
+	s_points = {name : np.broadcast_to(value, shape)[index] for name, value in s.items()}
+
+	product_pi = getProductPi(p_points, s_points)
+
+	def evaluateExit(M_exit, active) :
+
+		p_active = CycleParameters(*(None if value is None else value[active] for value in p_points))
+		s_active = {name : value[active] for name, value in s_points.items()}
+
+		s_active[M] = M_exit
+		s_active[P] = s_active['P_0'] * product_pi[active] / getStagnationPressureRatio(getGamma(p_active), M_exit)
+
+		T_exit, V_exit = getExitState(p_active, s_active, M_exit)
+
+		s_active['T' + M[1:]] = T_exit
+		s_active['V' + M[1:]] = V_exit
+
+		for name, stage in CYCLE_STAGES :
+
+			if name in _exit_dependent_stages :
+
+				s_active.update(stage(p_active, s_active))
+
+		return s_active
+
+	def getResidual(M_exit, active) :
+
+		# eta_P - 0.99 multiplied through by the (normalized) denominator,
+		# which unlike eta_P itself has no pole where thrust power + Delta KE vanishes
+		s_active = evaluateExit(M_exit, active)
+
+		thrust_power, Delta_KE = s_active[thrust_power_key], s_active[Delta_KE_key]
+
+		return (thrust_power - _rectified_propulsive_efficiency * (thrust_power + Delta_KE)) / (np.abs(thrust_power) + Delta_KE)
+
+	solution = solveBracketedRoots(
+		getResidual,
+		s_points[M],
+		np.full(points.size, _rectified_exit_mach_number_limit),
+		tolerance,
+		max_iterations = max_iterations
+	)
+
+	report.status[index] = solution.status
+	report.iterations[index] = solution.iterations
+	report.root[index] = solution.root
+	report.residual[index] = solution.residual
+
+	# Points without a bracket keep their original exit state
+	update = np.flatnonzero(solution.status != NO_BRACKET)
+	s_update = evaluateExit(solution.root[update], update)
+	index = tuple(i[update] for i in index)
+
+	s = dict(s)
+
+	for name in _cycle_outputs :
+
+		if name in s_update :
+
+			s[name] = np.array(np.broadcast_to(s[name], shape))
+			s[name][index] = s_update[name]
+
+	return s, report
+
+def rectifyExitConditions(result:CycleResult, tolerance = 1E-6, max_iterations = 50, profiler = None) -> CycleResult :
+	'''Returns a new CycleResult in which the exit Mach numbers of the points
+	   with a core or fan propulsive efficiency above 1 are raised until that
+	   efficiency is 0.99, by a batched bracketed root solve over those points
+	   only. tolerance applies to the efficiency and max_iterations bounds the
+	   work per point. The per-point outcome is stored in result.rectification.
+	   Given a CycleProfiler, the solve of every stream and its iterations are
+	   recorded as rectifyExitConditions.core and rectifyExitConditions.fan.'''
+
+	p = result.parameters
+	state = _getState(result)
+
+	if profiler is None :
+
+		state, core = _rectifyExitConditions(p, state, 'core', tolerance, max_iterations)
+		state, fan = _rectifyExitConditions(p, state, 'fan', tolerance, max_iterations)
+
+	else :
+
+		state, core = profiler.call('rectifyExitConditions.core', _rectifyExitConditions, p, state, 'core', tolerance, max_iterations)
+		state, fan = profiler.call('rectifyExitConditions.fan', _rectifyExitConditions, p, state, 'fan', tolerance, max_iterations)
+
+		profiler.recordIterations('rectifyExitConditions.core', core.iterations[core.status != RECTIFICATION_NOT_NEEDED])
+		profiler.recordIterations('rectifyExitConditions.fan', fan.iterations[fan.status != RECTIFICATION_NOT_NEEDED])
+
+	return CycleResult(p, result.flight_conditions, *(state[field] for field in _cycle_outputs), ExitRectification(core, fan))
+
+def evaluateCycle(parameters:CycleParameters, flight_conditions:FlightConditions, rectify = False, tolerance = 1E-6, max_iterations = 50, previous:CycleResult = None, outputs = None, profiler = None) :
+	'''Pure, reentrant evaluation of the parametric cycle.
+	   Does not modify its arguments, so it may be called concurrently
+	   from several threads with the same parameters. With rectify the
+	   result is passed through rectifyExitConditions().
+	   Given the unrectified CycleResult of an earlier evaluation as previous,
+	   only the stages returned by getStaleStages() are recomputed and the
+	   outputs of the others are reused from previous.
+	   Given a list of quantity names as outputs, only the stages needed for
+	   them are evaluated and the quantities of the other stages are None.
+	   Given a CycleProfiler, every stage evaluated is recorded under its name.'''
+
+	if previous is not None and previous.rectification is not None :
+
+		raise ValueError('Stage outputs of a rectified result cannot be reused.')
+
+	if outputs is None :
+
+		required = tuple(name for name, stage in CYCLE_STAGES)
+
+	elif rectify :
+
+		raise ValueError('Rectification needs every stage, outputs cannot be restricted.')
+
+	else :
+
+		required = getRequiredStages(outputs)
+
+	stale = getStaleStages(previous, parameters, flight_conditions)
+
+	state = flight_conditions._asdict()
+
+	for name, stage in CYCLE_STAGES :
+
+		if name not in required :
+
+			continue
+
+		elif name in stale :
+
+			if profiler is None :
+
+				state.update(stage(parameters, state))
+
+			else :
+
+				state.update(profiler.call(name, stage, parameters, state))
+
+		else :
+
+			state.update((output, getattr(previous, output)) for output in STAGE_DEPENDENCIES[name][2])
+
+	result = CycleResult(parameters, flight_conditions, *(state.get(field) for field in _cycle_outputs))
+
+	if rectify :
+
+		return rectifyExitConditions(result, tolerance, max_iterations, profiler)
+
+	else :
+
+		return result
+
+# Reasons of the invalid points of evaluateCycleMasked(), combined as bit flags
+POINT_VALID			= 0
+INVALID_INPUT		= 1
+NEGATIVE_FUEL_RATIO	= 2
+TURBINE_OVERLOADED	= 4
+CORE_NOZZLE_UNDEREXPANDED	= 8
+FAN_NOZZLE_UNDEREXPANDED	= 16
+
+_unit_interval = lambda value : (value > 0) & (value <= 1)
+
+# Valid values of the inputs, as checked by the setters of TurboFanEngine
+_valid_inputs = {
+	'h_PR'		: lambda value : value > 0,
+	'gamma_t'	: lambda value : value > 0,
+	'c_pt'		: lambda value : value > 0,
+	'T_t4'		: lambda value : value > 0,
+	'e_t'		: _unit_interval,
+	'eta_m'		: _unit_interval,
+	'pi_c'		: lambda value : value >= 1,
+	'e_c'		: _unit_interval,
+	'pi_f'		: lambda value : value >= 1,
+	'e_f'		: _unit_interval,
+	'pi_dmax'	: _unit_interval,
+	'pi_fn'		: _unit_interval,
+	'pi_n'		: _unit_interval,
+	'pi_b'		: _unit_interval,
+	'eta_b'		: _unit_interval,
+	'alpha'		: lambda value : value >= 0,
+	'P0_by_P9'	: lambda value : value > 0,
+	'P0_by_P19'	: lambda value : value > 0,
+	'V_0'		: lambda value : value > 0,
+	'T_0'		: lambda value : value > 0,
+	'P_0'		: lambda value : value > 0,
+	'a_0'		: lambda value : value > 0,
+}
+
+# Stages after which points with a negative fuel ratio or turbine temperature
+# ratio, or nozzles that cannot expand, are known and removed from the ones
+# left to evaluate
+_feasibility_stages = ('initializeRatios', 'calculateFuelRatio', 'performTurbineEnergyBalance')
+
+def getInvalidInputs(parameters:CycleParameters, flight_conditions:FlightConditions) :
+	'''Returns a boolean ndarray of the broadcast shape of the inputs, True
+	   where any of them is out of the range the engine setters accept'''
+
+	records = parameters._asdict()
+	records.update(flight_conditions._asdict())
+
+	invalid = np.zeros(np.broadcast_shapes(*(np.shape(value) for value in records.values() if value is not None)), dtype=bool)
+
+	for name, value in records.items() :
+
+		if value is not None and name in _valid_inputs :
+
+			# NaN inputs fail every comparison, so they are invalid too
+			invalid |= ~_valid_inputs[name](value)
+
+	return invalid
+
+def _gatherPoints(record, shape, index) :
+	'''Values of every field of record (a dict) at the points index of shape,
+	   single values being kept as they are'''
+
+	return {
+		name : value if value is None or np.size(value) == 1 and np.ndim(value) == 0 else np.broadcast_to(value, shape)[index]
+		for name, value in record.items()
+	}
+
+def evaluateCycleMasked(parameters:CycleParameters, flight_conditions:FlightConditions, profiler = None) :
+	'''Evaluates the unrectified cycle at the valid points only and returns
+	   the CycleResult, whose quantities are NaN at the other points, with an
+	   ndarray of the reasons every point is invalid : POINT_VALID or the bit
+	   flags INVALID_INPUT (any input out of the range of the engine setters),
+	   NEGATIVE_FUEL_RATIO (the compressor exit is hotter than the burner
+	   exit), TURBINE_OVERLOADED (the compressor and fan need more work
+	   than the turbine can give, i.e. tau_t <= 0), CORE_NOZZLE_UNDEREXPANDED
+	   and FAN_NOZZLE_UNDEREXPANDED (the total pressure at the nozzle is not
+	   above its exit pressure, so no flow leaves it).
+	   The points with valid inputs are gathered before the first stage, and
+	   only the feasible ones among them are carried past the turbine energy
+	   balance into the nozzle stages. No stage runs once no point is left.
+	   Given a CycleProfiler, every stage is recorded under its name.'''
+
+	shape = np.broadcast_shapes(*(np.shape(value) for value in parameters + flight_conditions if value is not None))
+
+	# Points are indexed in at least 1-D, a single point being reshaped back at the end
+	grid = shape if len(shape) > 0 else (1,)
+
+	reasons = np.where(getInvalidInputs(parameters, flight_conditions), INVALID_INPUT, POINT_VALID).astype(np.uint8).reshape(grid)
+
+	points = np.flatnonzero(reasons == POINT_VALID)
+	index = np.unravel_index(points, grid)
+
+	p = CycleParameters(**_gatherPoints(parameters._asdict(), grid, index))
+	s = _gatherPoints(flight_conditions._asdict(), grid, index)
+
+	for name, stage in CYCLE_STAGES :
+
+		# Single values are kept as they are when gathered, so with no point
+		# left the stages would still run on the invalid ones
+		if points.size == 0 :
+
+			break
+
+		# Infeasible points are dropped after the turbine energy balance, so
+		# the invalid values they give up to there are not reported
+		with np.errstate(invalid='ignore' if name in _feasibility_stages else None) :
+
+			if profiler is None :
+
+				s.update(stage(p, s))
+
+			else :
+
+				s.update(profiler.call(name, stage, p, s))
+
+		if name == _feasibility_stages[-1] :
+
+			# Total over exit pressure ratios of the nozzles, the exit pressure
+			# being the ambient one unless the exit pressure ratio is given
+			core_pressure_ratio = _getCoreProductPi(p, s) * (1.0 if p.P0_by_P9 is None else p.P0_by_P9)
+			fan_pressure_ratio = _getFanProductPi(p, s) * (1.0 if p.P0_by_P19 is None else p.P0_by_P19)
+
+			f, tau_t, core_pressure_ratio, fan_pressure_ratio = np.broadcast_arrays(
+				s['f'], s['tau_t'], core_pressure_ratio, fan_pressure_ratio, np.empty(points.size)
+			)[:4]
+
+			# Comparisons with NaN are False, so NaN points are infeasible too
+			negative_fuel_ratio = ~(f > 0)
+			turbine_overloaded = ~(tau_t > 0)
+
+			# The core nozzle pressure is only known where the turbine can run
+			core_underexpanded = ~turbine_overloaded & ~(core_pressure_ratio > 1)
+			fan_underexpanded = ~(fan_pressure_ratio > 1)
+
+			for infeasible, reason in (
+				(negative_fuel_ratio, NEGATIVE_FUEL_RATIO),
+				(turbine_overloaded, TURBINE_OVERLOADED),
+				(core_underexpanded, CORE_NOZZLE_UNDEREXPANDED),
+				(fan_underexpanded, FAN_NOZZLE_UNDEREXPANDED),
+			) :
+
+				reasons[index] |= np.where(infeasible, reason, 0).astype(np.uint8)
+
+			feasible = np.flatnonzero(~(negative_fuel_ratio | turbine_overloaded | core_underexpanded | fan_underexpanded))
+
+			points = points[feasible]
+			index = np.unravel_index(points, grid)
+
+			p = CycleParameters(**_gatherPoints(p._asdict(), f.shape, feasible))
+			s = _gatherPoints(s, f.shape, feasible)
+
+	dtype = np.result_type(*(value for value in parameters + flight_conditions if value is not None))
+
+	quantities = {}
+
+	for name in _cycle_outputs :
+
+		quantities[name] = np.full(grid, np.nan, dtype=dtype)
+
+		if points.size > 0 :
+
+			quantities[name][index] = s[name]
+
+	return CycleResult(parameters, flight_conditions, *(quantities[name].reshape(shape) for name in _cycle_outputs)), reasons.reshape(shape)
+
+# Variables evaluateCycleSensitivities() differentiates with respect to,
+# the parameters of these names and the flight Mach number
+SENSITIVITY_VARIABLES = ('pi_c', 'pi_f', 'alpha', 'T_t4', 'e_c', 'e_f', 'e_t', 'Mach')
+
+def evaluateCycleSensitivities(parameters:CycleParameters, flight_conditions:FlightConditions, variables = SENSITIVITY_VARIABLES) -> CycleResult :
+	'''Evaluates the unrectified cycle in one pass, propagating the partial
+	   derivatives of every quantity with respect to the given variables
+	   (any of SENSITIVITY_VARIABLES) with forward-mode dual numbers.
+	   Returns a CycleResult whose quantities are Duals : value holds the
+	   quantity and derivative its derivatives along an extra last axis,
+	   in the order of variables. Quantities that depend on none of the
+	   variables are plain ndarrays. The flight speed varies with Mach at
+	   the given altitude, i.e. at a fixed speed of sound.'''
+
+	for variable in variables :
+
+		if variable not in SENSITIVITY_VARIABLES :
+
+			raise ValueError('Unknown sensitivity variable : ' + variable + '. Valid variables : ' + str(SENSITIVITY_VARIABLES))
+
+	if len(set(variables)) != len(variables) :
+
+		raise ValueError('Sensitivity variables must be unique. Given : ' + str(tuple(variables)))
+
+	dtype = np.result_type(*(value for value in parameters + flight_conditions if value is not None))
+
+	# Every variable is seeded with its row of the identity
+	seeds = dict(zip(variables, np.eye(len(variables), dtype=dtype)))
+
+	parameters = parameters._replace(**{
+		variable : Dual(getattr(parameters, variable), seed)
+		for variable, seed in seeds.items() if variable != 'Mach'
+	})
+
+	if 'Mach' in seeds :
+
+		M_0 = Dual(flight_conditions.M_0, seeds['Mach'])
+
+		flight_conditions = flight_conditions._replace(M_0=M_0, V_0=Dual(flight_conditions.V_0, (M_0 * flight_conditions.a_0).derivative))
+
+	return evaluateCycle(parameters, flight_conditions)
+
+class CycleWorkspace :
+	'''Caller-owned buffers for evaluateCycleInto().
+	   Holds one array of the given shape for every quantity of a
+	   CycleResult plus a few scratch arrays, so repeated evaluations
+	   on the same shape reuse the same memory.'''
+
+	_outputs = _cycle_outputs
+
+	def __init__(self, shape, dtype = np.float64) :
+
+		self.shape = tuple(np.atleast_1d(shape).astype(int))
+		self.dtype = np.dtype(dtype)
+
+		for name in self._outputs :
+
+			setattr(self, name, np.empty(self.shape, self.dtype))
+
+		self._t1 = np.empty(self.shape, self.dtype)
+		self._t2 = np.empty(self.shape, self.dtype)
+
+		self._mask = np.empty(self.shape, bool)
+
+		pass
+
+def _calculateExitConditionsInto(P_exit, M_exit, product_pi, P0_by_P_exit, gamma, P_0, mask) :
+	'''In-place exit pressure and Mach number of a nozzle.
+	   product_pi is overwritten.'''
+
+	if P0_by_P_exit is not None :
+
+		np.divide(P_0, P0_by_P_exit, out=P_exit)
+		np.multiply(product_pi, P0_by_P_exit, out=product_pi)
+
+	else :
+
+		np.multiply(P_0, product_pi, out=P_exit)
+		np.divide(P_exit, getStagnationPressureRatio(gamma, 1.0), out=P_exit)
+
+	np.power(product_pi, (gamma - 1.0) / gamma, out=M_exit)
+	np.subtract(M_exit, 1.0, out=M_exit)
+	np.multiply(M_exit, 2.0 / (gamma - 1.0), out=M_exit)
+	np.sqrt(M_exit, out=M_exit)
+
+	if P0_by_P_exit is None :
+
+		# Expanded to ambient pressure where the flow is subsonic,
+		# choked everywhere else (including points that are already NaN)
+		np.less(P_exit, P_0, out=mask)
+		np.copyto(P_exit, P_0, where=mask)
+
+		np.logical_not(mask, out=mask)
+		np.copyto(M_exit, 1.0, where=mask)
+
+	pass
+
+def evaluateCycleInto(parameters:CycleParameters, flight_conditions:FlightConditions, workspace:CycleWorkspace) :
+	'''Fused evaluation of the cycle with in-place ufuncs.
+	   Every quantity is written into the buffers of workspace, whose
+	   shape must be the broadcast shape of the inputs, and the returned
+	   CycleResult holds those buffers. When the parameters are scalars no
+	   array is allocated; array parameters only allocate a few factors
+	   (exponents, 1 + alpha, R_t) of their own shape.
+	   The buffers are overwritten by the next call with the same workspace.'''
+
+	p = parameters
+	V_0, M_0, T_0, P_0, a_0 = flight_conditions
+	w = workspace
+
+	shape = np.broadcast_shapes(*(np.shape(value) for value in p if value is not None), *(np.shape(value) for value in flight_conditions))
+
+	if np.broadcast_shapes(shape, w.shape) != w.shape :
+
+		raise ValueError('Workspace of shape ' + str(w.shape) + ' cannot hold results of shape ' + str(shape))
+
+	t1, t2, mask = w._t1, w._t2, w._mask
+
+	# Parameter-only factors, hoisted out of the element-wise work
+	one_plus_alpha = 1.0 + p.alpha
+	R_t = getGasConstant(p.gamma_t, p.c_pt)
+
+	# Reference ratios
+	np.multiply(M_0, M_0, out=w.tau_r)
+	np.multiply(w.tau_r, _ram_temperature_coefficient, out=w.tau_r)
+	np.add(w.tau_r, 1.0, out=w.tau_r)
+
+	np.power(w.tau_r, _ram_pressure_exponent, out=w.pi_r)
+
+	np.fmax(M_0, 1.0, out=w.pi_d)
+	np.subtract(w.pi_d, 1.0, out=w.pi_d)
+	np.power(w.pi_d, 1.35, out=w.pi_d)
+	np.multiply(w.pi_d, -0.075, out=w.pi_d)
+	np.add(w.pi_d, 1.0, out=w.pi_d)
+
+	np.greater(M_0, 5.0, out=mask)
+	np.power(M_0, 4, out=t1)
+	np.add(t1, 935.0, out=t1)
+	np.divide(800.0, t1, out=t1)
+	np.copyto(w.pi_d, t1, where=mask)
+	np.multiply(w.pi_d, p.pi_dmax, out=w.pi_d)
+
+	np.multiply(p.c_pt, p.T_t4, out=w.tau_l)
+	np.divide(w.tau_l, T_0, out=w.tau_l)
+	np.divide(w.tau_l, _c_p0, out=w.tau_l)
+
+	np.power(p.pi_c, (CONST.kappa - 1.0) / (CONST.kappa * p.e_c), out=w.tau_c)
+	np.power(p.pi_f, (CONST.kappa - 1.0) / (CONST.kappa * p.e_f), out=w.tau_f)
+
+	# Fuel ratio
+	np.multiply(p.eta_b, p.h_PR, out=t1)
+	np.divide(t1, T_0, out=t1)
+	np.divide(t1, _c_p0, out=t1)
+	np.subtract(t1, w.tau_l, out=t1)
+
+	np.multiply(w.tau_r, w.tau_c, out=w.f)
+	np.subtract(w.tau_l, w.f, out=w.f)
+	np.divide(w.f, t1, out=w.f)
+
+	# Turbine energy balance
+	np.subtract(w.tau_f, 1.0, out=t1)
+	np.multiply(t1, p.alpha, out=t1)
+	np.add(t1, w.tau_c, out=t1)
+	np.subtract(t1, 1.0, out=t1)
+	np.multiply(t1, w.tau_r, out=t1)
+	np.divide(t1, w.tau_l, out=t1)
+
+	np.add(w.f, 1.0, out=t2)
+	np.multiply(t2, p.eta_m, out=t2)
+	np.divide(t1, t2, out=t1)
+
+	np.subtract(1.0, t1, out=w.tau_t)
+	np.power(w.tau_t, p.gamma_t / ((p.gamma_t - 1.0) * p.e_t), out=w.pi_t)
+
+	# Core exit
+	np.multiply(w.pi_r, w.pi_d, out=t1)
+	np.multiply(t1, p.pi_c, out=t1)
+	np.multiply(t1, p.pi_b, out=t1)
+	np.multiply(t1, w.pi_t, out=t1)
+	np.multiply(t1, p.pi_n, out=t1)
+
+	_calculateExitConditionsInto(w.P_9, w.M_9, t1, p.P0_by_P9, p.gamma_t, P_0, mask)
+
+	np.multiply(w.M_9, w.M_9, out=t1)
+	np.multiply(t1, 0.5 * (p.gamma_t - 1.0), out=t1)
+	np.add(t1, 1.0, out=t1)
+	np.multiply(w.tau_l, w.tau_t, out=w.T_9)
+	np.divide(w.T_9, t1, out=w.T_9)
+	np.multiply(w.T_9, T_0, out=w.T_9)
+	np.multiply(w.T_9, _c_p0 / p.c_pt, out=w.T_9)
+
+	np.multiply(w.T_9, p.gamma_t * R_t, out=w.V_9)
+	np.sqrt(w.V_9, out=w.V_9)
+	np.multiply(w.V_9, w.M_9, out=w.V_9)
+
+	# Fan exit
+	np.multiply(w.pi_r, w.pi_d, out=t1)
+	np.multiply(t1, p.pi_f, out=t1)
+	np.multiply(t1, p.pi_fn, out=t1)
+
+	_calculateExitConditionsInto(w.P_19, w.M_19, t1, p.P0_by_P19, CONST.kappa, P_0, mask)
+
+	np.multiply(w.M_19, w.M_19, out=t1)
+	np.multiply(t1, _ram_temperature_coefficient, out=t1)
+	np.add(t1, 1.0, out=t1)
+	np.multiply(w.tau_r, w.tau_f, out=w.T_19)
+	np.divide(w.T_19, t1, out=w.T_19)
+	np.multiply(w.T_19, T_0, out=w.T_19)
+
+	np.divide(w.T_19, T_0, out=w.V_19)
+	np.sqrt(w.V_19, out=w.V_19)
+	np.multiply(w.V_19, a_0, out=w.V_19)
+	np.multiply(w.V_19, w.M_19, out=w.V_19)
+
+	# Thrust
+	np.add(w.f, 1.0, out=t2)
+
+	np.divide(P_0, w.P_9, out=t1)
+	np.subtract(1.0, t1, out=t1)
+	np.multiply(t1, w.T_9, out=t1)
+	np.divide(t1, w.V_9, out=t1)
+	np.multiply(t1, a_0, out=t1)
+	np.multiply(t1, a_0, out=t1)
+	np.divide(t1, T_0, out=t1)
+	np.multiply(t1, R_t / (CONST.kappa * CONST.R), out=t1)
+	np.add(t1, w.V_9, out=t1)
+	np.multiply(t1, t2, out=t1)
+	np.subtract(t1, V_0, out=t1)
+	np.divide(t1, one_plus_alpha, out=w.ST_core)
+
+	np.divide(P_0, w.P_19, out=t1)
+	np.subtract(1.0, t1, out=t1)
+	np.multiply(t1, w.T_19, out=t1)
+	np.divide(t1, w.V_19, out=t1)
+	np.multiply(t1, a_0, out=t1)
+	np.multiply(t1, a_0, out=t1)
+	np.divide(t1, T_0, out=t1)
+	np.divide(t1, CONST.kappa, out=t1)
+	np.add(t1, w.V_19, out=t1)
+	np.subtract(t1, V_0, out=t1)
+	np.multiply(t1, p.alpha, out=t1)
+	np.divide(t1, one_plus_alpha, out=w.ST_fan)
+
+	np.add(w.ST_core, w.ST_fan, out=w.ST)
+
+	# Energies
+	np.multiply(w.ST_core, V_0, out=w.thrust_power_core)
+	np.multiply(w.ST_fan, V_0, out=w.thrust_power_fan)
+	np.add(w.thrust_power_core, w.thrust_power_fan, out=w.thrust_power)
+
+	np.subtract(w.V_19, V_0, out=w.Delta_KE_fan)
+	np.square(w.Delta_KE_fan, out=w.Delta_KE_fan)
+	np.multiply(w.Delta_KE_fan, p.alpha, out=w.Delta_KE_fan)
+	np.multiply(w.Delta_KE_fan, 0.5, out=w.Delta_KE_fan)
+	np.divide(w.Delta_KE_fan, one_plus_alpha, out=w.Delta_KE_fan)
+
+	np.subtract(w.V_9, V_0, out=w.Delta_KE_core)
+	np.square(w.Delta_KE_core, out=w.Delta_KE_core)
+	np.multiply(w.Delta_KE_core, 0.5, out=w.Delta_KE_core)
+	np.divide(w.Delta_KE_core, one_plus_alpha, out=w.Delta_KE_core)
+
+	np.add(w.Delta_KE_core, w.Delta_KE_fan, out=w.Delta_KE)
+
+	np.multiply(w.f, p.h_PR, out=w.thermal_energy)
+	np.divide(w.thermal_energy, one_plus_alpha, out=w.thermal_energy)
+
+	# Performance parameters
+	np.multiply(w.ST, one_plus_alpha, out=t1)
+	np.divide(w.f, t1, out=w.TSFC)
+
+	np.add(w.thrust_power, w.Delta_KE, out=t1)
+	np.divide(w.thrust_power, t1, out=w.eta_P)
+	np.divide(t1, w.thermal_energy, out=w.eta_T)
+
+	np.add(w.thrust_power_fan, w.Delta_KE_fan, out=t1)
+	np.divide(w.thrust_power_fan, t1, out=w.eta_P_fan)
+
+	np.add(w.thrust_power_core, w.Delta_KE_core, out=t1)
+	np.divide(w.thrust_power_core, t1, out=w.eta_P_core)
+
+	return CycleResult(parameters, flight_conditions, **{field : getattr(w, field) for field in w._outputs})
+
+# Constants of the scalar cycle, computed as the vectorized cycle computes them
+_kappa = CONST.kappa
+_fan_exit_mach_coefficient = 2.0 / (CONST.kappa - 1.0)
+_fan_thrust_denominator = CONST.kappa
+_core_thrust_denominator = CONST.kappa * CONST.R
+
+class CyclePoint :
+	'''Lightweight record of a single point of the cycle with the fields of a
+	   CycleResult as plain floats, returned by evaluateCyclePoint()'''
+
+	__slots__ = CycleResult._fields
+
+	_fields = CycleResult._fields
+
+	def __init__(self, *values) :
+
+		self.rectification = None
+
+		for name, value in zip(self.__slots__, values) :
+
+			setattr(self, name, value)
+
+		pass
+
+	@staticmethod
+	def fromResult(result:CycleResult) :
+		'''Converts a CycleResult of a single point'''
+
+		return CyclePoint(
+			result.parameters,
+			result.flight_conditions,
+			*(np.asarray(getattr(result, name)).item() for name in _cycle_outputs),
+			result.rectification
+		)
+
+	def _asdict(self) :
+
+		return {name : getattr(self, name) for name in self._fields}
+
+	def __repr__(self) :
+
+		return 'CyclePoint(' + ', '.join(name + '=' + repr(getattr(self, name)) for name in _cycle_outputs) + ')'
+
+def evaluateCyclePoint(parameters:CycleParameters, flight_conditions:FlightConditions) -> CyclePoint :
+	'''Evaluates the unrectified cycle at a single point with plain floats.
+	   Every field of parameters and flight_conditions must be a Python float
+	   (or None for the exit pressure ratios). Follows the stages of
+	   evaluateCycle() operation for operation, so both agree to round-off.
+	   Raises ValueError, ZeroDivisionError or OverflowError where the
+	   vectorized cycle would give NaN or inf.'''
+
+	h_PR, gamma_t, c_pt, T_t4, e_t, eta_m, pi_c, e_c, pi_f, e_f, pi_dmax, pi_fn, pi_n, pi_b, eta_b, alpha, P0_by_P9, P0_by_P19 = parameters
+	V_0, M_0, T_0, P_0, a_0 = flight_conditions
+
+	pow, sqrt = math.pow, math.sqrt
+
+	# Reference ratios
+	tau_r = 1.0 + _ram_temperature_coefficient * (M_0 * M_0)
+	pi_r = pow(tau_r, _ram_pressure_exponent)
+
+	if M_0 <= 1.0 :
+
+		pi_d = pi_dmax * 1.0
+
+	elif M_0 <= 5.0 :
+
+		pi_d = pi_dmax * (1.0 - 0.075 * pow(M_0 - 1.0, 1.35))
+
+	else :
+
+		pi_d = pi_dmax * (800.0 / (pow(M_0, 4) + 935.0))
+
+	tau_l = c_pt * T_t4 / (_c_p0 * T_0)
+	tau_c = pow(pi_c, (_kappa - 1.0) / (_kappa * e_c))
+	tau_f = pow(pi_f, (_kappa - 1.0) / (_kappa * e_f))
+
+	# Fuel ratio and turbine energy balance
+	f = (tau_l - tau_r * tau_c) / ((eta_b * h_PR / (_c_p0 * T_0)) - tau_l)
+
+	tau_t = 1.0 - (1.0 / (eta_m * (1 + f))) * (tau_r / tau_l) * (tau_c - 1.0 + alpha * (tau_f - 1.0))
+	pi_t = pow(tau_t, gamma_t / ((gamma_t - 1.0) * e_t))
+
+	# Core exit
+	R_t = (gamma_t - 1.0) * c_pt / gamma_t
+
+	product_pi = pi_r * pi_d * pi_c * pi_b * pi_t * pi_n
+
+	if P0_by_P9 is not None :
+
+		P_9 = P_0 / P0_by_P9
+		M_9 = sqrt((2.0 / (gamma_t - 1.0)) * (pow(product_pi * P0_by_P9, (gamma_t - 1.0) / gamma_t) - 1.0))
+
+	else :
+
+		P_9 = P_0 * product_pi / pow(1.0 + 0.5 * (gamma_t - 1.0) * 1.0, gamma_t / (gamma_t - 1))
+
+		if P_9 < P_0 :
+
+			M_9 = sqrt((2.0 / (gamma_t - 1.0)) * (pow(product_pi, (gamma_t - 1.0) / gamma_t) - 1.0))
+			P_9 = P_0
+
+		else :
+
+			M_9 = 1.0
+
+	T_9 = T_0 * (tau_l * tau_t / (1.0 + 0.5 * (gamma_t - 1.0) * (M_9 * M_9))) * (_c_p0 / c_pt)
+	V_9 = M_9 * sqrt(gamma_t * R_t * T_9)
+
+	# Fan exit
+	product_pi = pi_r * pi_d * pi_f * pi_fn
+
+	if P0_by_P19 is not None :
+
+		P_19 = P_0 / P0_by_P19
+		M_19 = sqrt(_fan_exit_mach_coefficient * (pow(product_pi * P0_by_P19, _fan_exit_exponent) - 1.0))
+
+	else :
+
+		P_19 = P_0 * product_pi / _fan_exit_critical_pressure_ratio
+
+		if P_19 < P_0 :
+
+			M_19 = sqrt(_fan_exit_mach_coefficient * (pow(product_pi, _fan_exit_exponent) - 1.0))
+			P_19 = P_0
+
+		else :
+
+			M_19 = 1.0
+
+	T_19 = T_0 * (tau_r * tau_f / (1.0 + _ram_temperature_coefficient * (M_19 * M_19)))
+	V_19 = M_19 * a_0 * sqrt(T_19 / T_0)
+
+	# Thrust
+	ST_core = (1.0 / (1.0 + alpha)) * (
+		(1.0 + f) * V_9 - V_0 +
+		(1.0 + f) * R_t * (a_0 * a_0) * T_9 * (1.0 - (P_0 / P_9)) / (_core_thrust_denominator * T_0 * V_9)
+	)
+
+	ST_fan = (alpha / (1.0 + alpha)) * (
+		V_19 - V_0 +
+		(a_0 * a_0) * T_19 * (1.0 - (P_0 / P_19)) / (_fan_thrust_denominator * T_0 * V_19)
+	)
+
+	ST = ST_core + ST_fan
+
+	# Energies and performance parameters
+	thrust_power_core = ST_core * V_0
+	thrust_power_fan = ST_fan * V_0
+	thrust_power = thrust_power_core + thrust_power_fan
+
+	Delta_KE_fan = 0.5 * alpha * ((V_19 - V_0) * (V_19 - V_0)) / (1.0 + alpha)
+	Delta_KE_core = 0.5 * ((V_9 - V_0) * (V_9 - V_0)) / (1.0 + alpha)
+	Delta_KE = Delta_KE_core + Delta_KE_fan
+
+	thermal_energy = f * h_PR / (1.0 + alpha)
+
+	# Fields are assigned directly, which is much faster than CyclePoint()
+	point = CyclePoint.__new__(CyclePoint)
+
+	point.parameters, point.flight_conditions, point.rectification = parameters, flight_conditions, None
+
+	point.tau_r, point.pi_r, point.pi_d, point.tau_l, point.tau_c, point.tau_f = tau_r, pi_r, pi_d, tau_l, tau_c, tau_f
+	point.f, point.tau_t, point.pi_t = f, tau_t, pi_t
+
+	point.P_9, point.M_9, point.T_9, point.V_9 = P_9, M_9, T_9, V_9
+	point.P_19, point.M_19, point.T_19, point.V_19 = P_19, M_19, T_19, V_19
+
+	point.ST_core, point.ST_fan, point.ST = ST_core, ST_fan, ST
+
+	point.thrust_power_core, point.thrust_power_fan, point.thrust_power = thrust_power_core, thrust_power_fan, thrust_power
+	point.Delta_KE_fan, point.Delta_KE_core, point.Delta_KE = Delta_KE_fan, Delta_KE_core, Delta_KE
+	point.thermal_energy = thermal_energy
+
+	point.TSFC = f / ((1.0 + alpha) * ST)
+	point.eta_P = thrust_power / (thrust_power + Delta_KE)
+	point.eta_P_fan = thrust_power_fan / (thrust_power_fan + Delta_KE_fan)
+	point.eta_P_core = thrust_power_core / (thrust_power_core + Delta_KE_core)
+	point.eta_T = (thrust_power + Delta_KE) / thermal_energy
+
+	return point
@@ -1,64 +1,228 @@
+import copy
+import functools
+import operator
 import numpy as np
 
+from typing import NamedTuple
 from shutil import ExecError
 from ambiance import CONST, Atmosphere
 
-def getGasConstant(gamma, c_p) :
-	'''Enter c_p in J / kg - K'''
-	return (gamma - 1.0) * c_p / gamma
+from Cycle_Profiler import CycleProfiler
+from Dual_Numbers import Dual
+from Turbofan_Cycle import (
+	getGasConstant,
+	getHeatCapacity,
+	getSonicSpeed,
+	getStagnationTemperatureRatio,
+	getStagnationPressureRatio,
+	getRamRecovery,
+	CycleParameters,
+	FlightConditions,
+	CycleResult,
+	CyclePoint,
+	CycleWorkspace,
+	getFlightConditions,
+	castInputs,
+	evaluateCycle,
+	evaluateCycleInto,
+	evaluateCycleSensitivities,
+	evaluateCycleMasked,
+	evaluateCyclePoint,
+	SENSITIVITY_VARIABLES,
+	rectifyExitConditions,
+	getStaleStages,
+	getRequiredStages,
+	CYCLE_STAGES,
+	STAGE_DEPENDENCIES
+)
+
+def _getFloat(value) :
+	'''Python float of a number or of an ndarray of a single element, e.g.
+	   the quantities of an ambiance.Atmosphere at one altitude'''
+
+	return value.item() if isinstance(value, np.ndarray) else float(value)
+
+class EngineSpecification(NamedTuple) :
+	'''Compact, picklable description of a TurboFanEngine : its CycleParameters,
+	   precision, exit rectification and masked validation settings, see
+	   getSpecification()'''
+
+	parameters					: CycleParameters
+	precision					: str
+	rectify						: bool
+	rectification_tolerance		: float
+	rectification_max_iterations	: int
+	masked						: bool
+
+class SweepResult :
+	'''Labeled result cube returned by TurboFanEngine.performSweep().
+	   axes holds the axis names in sweep order, coordinates maps every
+	   axis name to its 1-D coordinate array and every quantity is an
+	   ndarray of shape (len(coordinates[axes[0]]), ..., len(coordinates[axes[-1]])).'''
+
+	def __init__(self, axes, coordinates, quantities) :
+
+		self.axes = tuple(axes)
+		self.coordinates = coordinates
+		self.quantities = quantities
+
+		self.shape = tuple(len(coordinates[axis]) for axis in self.axes)
 
-def getHeatCapacity(gamma, R) :
-	'''Enter R in J / kg - K'''
-	return gamma * R / (gamma - 1.0)
+		pass
 
-def getSonicSpeed(gamma, gas_constant, temperature) :
-	'''Enter gas_constant in J / kg - K and temperature in kelvin'''
-	return np.sqrt(gamma * gas_constant * temperature)
+	def __getitem__(self, quantity) :
 
-def getStagnationTemperatureRatio(gamma, mach_number) :
+		return self.quantities[quantity]
 
-	return 1.0 + 0.5 * (gamma - 1.0) * (mach_number**2)
+	def __contains__(self, quantity) :
 
-def getStagnationPressureRatio(gamma, mach_number) :
+		return quantity in self.quantities
 
-	return np.float_power(
-		getStagnationTemperatureRatio(gamma, mach_number),
-		gamma / (gamma - 1)
-	)
+	def keys(self) :
 
-def getRamRecovery(mach_number) :
-	'''Vectorized for array input.
-	   Mach number should be an ndarray.'''
-	
-	# if mach_number <= 1.0 :
+		return self.quantities.keys()
 
-	#     return 1.0
+	def getAxisIndex(self, axis) :
 
-	# elif mach_number <= 5.0 :
+		if axis in self.axes :
 
-	#     return 1.0 - 0.075 * np.float_power((mach_number - 1.0), 1.35)
+			return self.axes.index(axis)
 
-	# else :
+		else :
 
-	#     return 800.0 / (np.power(mach_number, 4) + 935.0)
+			raise KeyError(axis + ' is not an axis of this sweep. Axes : ' + str(self.axes))
 
-	return  np.where(mach_number <= 1.0,
-				1.0,
-			# else
-				np.where(mach_number <= 5.0,
-					1.0 - 0.075 * np.float_power((np.fmax(mach_number, 1.0) - 1.0), 1.35),
-				# else
-					800.0 / (np.power(mach_number, 4) + 935.0)
-				)
-			)
+	def select(self, **coordinates) :
+		'''Returns a dict of every quantity at the coordinates nearest to the given
+		   axis values. Axes that are not given are kept whole.'''
+
+		index = [slice(None)] * len(self.axes)
+
+		for axis, value in coordinates.items() :
+
+			index[self.getAxisIndex(axis)] = int(np.argmin(np.abs(self.coordinates[axis] - value)))
+
+		index = tuple(index)
+
+		return {quantity : values[index] for quantity, values in self.quantities.items()}
+
+def _profiled(getter) :
+	'''Records the calls of a getter when profiling is enabled, see setProfiling()'''
+
+	@functools.wraps(getter)
+	def profiledGetter(self) :
+
+		if self._profiler is None :
+
+			return getter(self)
+
+		else :
+
+			return self._profiler.call(getter.__name__, getter, self)
+
+	return profiledGetter
+
+def _getBlockColumns(quantities) :
+	'''Columns of the quantities of every getter in the output block'''
+
+	columns, start = {}, 0
+
+	for getter, names in quantities.items() :
+
+		columns[getter] = slice(start, start + len(names))
+		start += len(names)
+
+	return columns
 
 class TurboFanEngine :
 
+	# Sweep axes over design parameters, mapped to the setter that validates
+	# them and the attributes passed as that setter's arguments
+	_sweep_design_axes = {
+		'h_PR'		:	('setFuelProperties',		('_h_PR', '_gamma_t', '_c_pt')),
+		'gamma_t'	:	('setFuelProperties',		('_h_PR', '_gamma_t', '_c_pt')),
+		'c_pt'		:	('setFuelProperties',		('_h_PR', '_gamma_t', '_c_pt')),
+		'T_t4'		:	('setTurbineProperties',	('_T_t4', '_e_t', '_eta_m')),
+		'e_t'		:	('setTurbineProperties',	('_T_t4', '_e_t', '_eta_m')),
+		'eta_m'		:	('setTurbineProperties',	('_T_t4', '_e_t', '_eta_m')),
+		'pi_c'		:	('setCompressorProperties',	('_pi_c', '_e_c')),
+		'e_c'		:	('setCompressorProperties',	('_pi_c', '_e_c')),
+		'pi_f'		:	('setFanProperties',		('_pi_f', '_e_f')),
+		'e_f'		:	('setFanProperties',		('_pi_f', '_e_f')),
+		'pi_dmax'	:	('setInletOutletProperties',	('_pi_dmax', '_pi_fn', '_pi_n')),
+		'pi_fn'		:	('setInletOutletProperties',	('_pi_dmax', '_pi_fn', '_pi_n')),
+		'pi_n'		:	('setInletOutletProperties',	('_pi_dmax', '_pi_fn', '_pi_n')),
+		'pi_b'		:	('setBurnerProperties',		('_pi_b', '_eta_b')),
+		'eta_b'		:	('setBurnerProperties',		('_pi_b', '_eta_b')),
+		'alpha'		:	('setBypassRatio',			('_alpha',)),
+		'P0_by_P9'	:	('setExitPressureRatios',	('_P0_by_P9', '_P0_by_P19')),
+		'P0_by_P19'	:	('setExitPressureRatios',	('_P0_by_P9', '_P0_by_P19')),
+	}
+
+	_sweep_flight_axes = ('Mach', 'altitude')
+
+	# Quantities collected into a SweepResult, keyed by the getter exposing them
+	_sweep_quantities = {
+		'getSpecificThrusts'				:	('ST', 'ST_core', 'ST_fan'),
+		'getSpecificFuelConsumtionRates'	:	('TSFC', 'f_0'),
+		'getEfficiencies'					:	('eta_O', 'eta_T', 'eta_P', 'eta_P_core', 'eta_P_fan'),
+		'getReferenceRatios'				:	('pi_r', 'tau_r'),
+		'getTurbineOperatingRatios'			:	('pi_t', 'tau_t'),
+		'getCompressorOperatingRatios'		:	('pi_c', 'tau_c'),
+		'getFanOperatingRatios'				:	('pi_f', 'tau_f'),
+		'getCoreExitState'					:	('M_9', 'P_9', 'T_9'),
+		'getFanExitState'					:	('M_19', 'P_19', 'T_19'),
+		'getBurnerEnthalpyRatio'			:	('tau_l',),
+	}
+
+	# Columns of every getter in the output block, see getOutputBlock()
+	_block_columns = _getBlockColumns(_sweep_quantities)
+
+	# Quantities getSensitivities() returns the Jacobians of
+	_sensitivity_quantities = CycleResult._fields[2:-1] + ('eta_O',)
+
 	def __init__(self) -> None:
 
 		self._initialized = False
 		self._analysis_complete = False
 
+		self._dtype = np.dtype(np.float64)
+
+		self._rectify = False
+		self._rectification_tolerance = 1E-6
+		self._rectification_max_iterations = 50
+
+		# CycleProfiler recording the stages and getters, None when disabled
+		self._profiler = None
+
+		# With lazy analysis the stages are only evaluated once a getter
+		# needs their outputs, see setLazyAnalysis()
+		self._lazy = False
+		self._pending = None
+		self._counted_stages = set()
+
+		# Unrectified result of the last analysis, whose stage outputs
+		# are reused by the next one where they are still valid
+		self._stage_outputs = None
+
+		self._stages_evaluated = 0
+		self._stages_skipped = 0
+		self._last_evaluated_stages = ()
+
+		# With masked validation invalid points are masked instead of raising,
+		# see setMaskedValidation()
+		self._masked = False
+		self._validity = None
+
+		# Parameters of evaluateScalar() as floats, with the values they were
+		# converted from and the indices of those that are arrays
+		self._scalar_parameters = None
+
+		# Contiguous block holding the outputs of every getter of the last
+		# analysis along its last axis, filled per getter on first use
+		self._block = None
+		self._block_filled = set()
+
 		pass
 
 	def setFuelProperties(self, 
@@ -68,7 +232,7 @@ class TurboFanEngine :
 	) :
 		'''Enter heat in J / kg and heat capacity in J / kg - K'''
 
-		if gamma_of_combustion_products > 0 :
+		if self._masked or np.all(gamma_of_combustion_products > 0) :
 
 			self._gamma_t = gamma_of_combustion_products
 			self._analysis_complete = False
@@ -77,7 +241,7 @@ class TurboFanEngine :
 
 			raise ValueError('Gamma must be positive. Given value : ' + str(gamma_of_combustion_products))
 
-		if heat_generated_from_combustion > 0 :
+		if self._masked or np.all(heat_generated_from_combustion > 0) :
 
 			self._h_PR = heat_generated_from_combustion
 			self._analysis_complete = False
@@ -86,7 +250,7 @@ class TurboFanEngine :
 
 			raise ValueError('Heat generated must be positive. Given value : ' + str(heat_generated_from_combustion))
 
-		if heat_capacity_of_combustion_products > 0 :
+		if self._masked or np.all(heat_capacity_of_combustion_products > 0) :
 
 			self._c_pt = heat_capacity_of_combustion_products
 			self._analysis_complete = False
@@ -95,8 +259,6 @@ class TurboFanEngine :
 
 			raise ValueError('Heat capacity must be positive. Given value : ' + str(heat_capacity_of_combustion_products))
 
-		self._R_t = getGasConstant(self._gamma_t, self._c_pt)
-
 		pass
 
 	def setTurbineProperties(self,
@@ -105,7 +267,7 @@ class TurboFanEngine :
 		mechanical_efficiency = 1.0
 	) :
 		'''Enter temperature in kelvin'''
-		if np.all(inlet_total_temperature > 0) :
+		if self._masked or np.all(inlet_total_temperature > 0) :
 
 			self._T_t4 = inlet_total_temperature
 			self._analysis_complete = False
@@ -114,7 +276,7 @@ class TurboFanEngine :
 
 			raise ValueError('Temperature must be positive. Given value : ' + str(inlet_total_temperature))
 
-		if polytropic_efficiency > 0 and polytropic_efficiency <= 1:
+		if self._masked or np.all((polytropic_efficiency > 0) & (polytropic_efficiency <= 1)) :
 
 			self._e_t = polytropic_efficiency
 			self._analysis_complete = False
@@ -123,7 +285,7 @@ class TurboFanEngine :
 
 			raise ValueError('Efficiency must belong to the interval (0, 1]. Given value : ' + str(polytropic_efficiency))
 
-		if mechanical_efficiency > 0 and mechanical_efficiency <= 1:
+		if self._masked or np.all((mechanical_efficiency > 0) & (mechanical_efficiency <= 1)) :
 
 			self._eta_m = mechanical_efficiency
 			self._analysis_complete = False
@@ -139,7 +301,7 @@ class TurboFanEngine :
 		polytropic_efficiency = 1.0
 	) :
 
-		if np.all(compression_ratio >= 1) :
+		if self._masked or np.all(compression_ratio >= 1) :
 
 			self._pi_c = compression_ratio
 			self._analysis_complete = False
@@ -148,7 +310,7 @@ class TurboFanEngine :
 
 			raise ValueError('Compression ratio must be greater than or equal to 1. Given value : ' + str(compression_ratio))
 
-		if polytropic_efficiency > 0 and polytropic_efficiency <= 1:
+		if self._masked or np.all((polytropic_efficiency > 0) & (polytropic_efficiency <= 1)) :
 
 			self._e_c = polytropic_efficiency
 			self._analysis_complete = False
@@ -164,7 +326,7 @@ class TurboFanEngine :
 		polytropic_efficiency = 1.0
 	) :
 
-		if np.all(compression_ratio >= 1) :
+		if self._masked or np.all(compression_ratio >= 1) :
 
 			self._pi_f = compression_ratio
 			self._analysis_complete = False
@@ -173,7 +335,7 @@ class TurboFanEngine :
 
 			raise ValueError('Compression ratio must be greater than or equal to 1. Given value : ' + str(compression_ratio))
 
-		if polytropic_efficiency > 0 and polytropic_efficiency <= 1:
+		if self._masked or np.all((polytropic_efficiency > 0) & (polytropic_efficiency <= 1)) :
 
 			self._e_f = polytropic_efficiency
 			self._analysis_complete = False
@@ -190,7 +352,7 @@ class TurboFanEngine :
 		nozzle_total_pressure_ratio = 1.0
 	) :
 
-		if diffuser_max_total_pressure_ratio > 0 and diffuser_max_total_pressure_ratio <= 1 :
+		if self._masked or np.all((diffuser_max_total_pressure_ratio > 0) & (diffuser_max_total_pressure_ratio <= 1)) :
 
 			self._pi_dmax = diffuser_max_total_pressure_ratio
 			self._analysis_complete = False
@@ -199,7 +361,7 @@ class TurboFanEngine :
 
 			raise ValueError('Pressure ratio must be in the interval (0,1]. Given value : ' + str(diffuser_max_total_pressure_ratio))
 
-		if fan_nozzle_total_pressure_ratio > 0 and fan_nozzle_total_pressure_ratio <= 1 :
+		if self._masked or np.all((fan_nozzle_total_pressure_ratio > 0) & (fan_nozzle_total_pressure_ratio <= 1)) :
 
 			self._pi_fn = fan_nozzle_total_pressure_ratio
 			self._analysis_complete = False
@@ -208,7 +370,7 @@ class TurboFanEngine :
 
 			raise ValueError('Pressure ratio must be in the interval (0,1]. Given value : ' + str(fan_nozzle_total_pressure_ratio))
 
-		if nozzle_total_pressure_ratio > 0 and nozzle_total_pressure_ratio <= 1 :
+		if self._masked or np.all((nozzle_total_pressure_ratio > 0) & (nozzle_total_pressure_ratio <= 1)) :
 
 			self._pi_n = nozzle_total_pressure_ratio
 			self._analysis_complete = False
@@ -224,7 +386,7 @@ class TurboFanEngine :
 		efficiency = 1.0
 	) :
 
-		if total_pressure_ratio > 0 and total_pressure_ratio <= 1 :
+		if self._masked or np.all((total_pressure_ratio > 0) & (total_pressure_ratio <= 1)) :
 
 			self._pi_b = total_pressure_ratio
 			self._analysis_complete = False
@@ -233,7 +395,7 @@ class TurboFanEngine :
 
 			raise ValueError('Pressure ratio must be in the interval (0,1]. Given value : ' + str(total_pressure_ratio))
 
-		if efficiency > 0 and efficiency <= 1:
+		if self._masked or np.all((efficiency > 0) & (efficiency <= 1)) :
 
 			self._eta_b = efficiency
 			self._analysis_complete = False
@@ -246,7 +408,7 @@ class TurboFanEngine :
 
 	def setBypassRatio(self, alpha : np.ndarray) :
 
-		if np.all(alpha >= 0) :
+		if self._masked or np.all(alpha >= 0) :
 
 			self._alpha = alpha
 			self._analysis_complete = False
@@ -259,7 +421,7 @@ class TurboFanEngine :
 
 	def setExitPressureRatios(self, P0_by_P9 : np.ndarray, P0_by_P19 : np.ndarray) :
 
-		if np.all(P0_by_P9 > 0) :
+		if self._masked or np.all(P0_by_P9 > 0) :
 
 			self._P0_by_P9 = P0_by_P9
 			self._analysis_complete = False
@@ -268,7 +430,7 @@ class TurboFanEngine :
 
 			raise ValueError('Pressure ratios (P0 / P9) must be greater than 0. Given value : ' + str(P0_by_P9))
 
-		if np.all(P0_by_P19 > 0) :
+		if self._masked or np.all(P0_by_P19 > 0) :
 
 			self._P0_by_P19 = P0_by_P19
 			self._analysis_complete = False
@@ -279,13 +441,98 @@ class TurboFanEngine :
 
 		pass
 
+	def setExitRectification(self,
+		enabled = True,
+		tolerance = 1E-6,
+		max_iterations = 50
+	) :
+		'''Enables raising the exit Mach numbers of points whose core or fan
+		   propulsive efficiency exceeds 1 until it is 0.99. tolerance applies
+		   to the efficiency and max_iterations bounds the solver per point.'''
+
+		if tolerance > 0 :
+
+			self._rectification_tolerance = tolerance
+			self._analysis_complete = False
+
+		else :
+
+			raise ValueError('Tolerance must be positive. Given value : ' + str(tolerance))
+
+		if max_iterations >= 1 :
+
+			self._rectification_max_iterations = int(max_iterations)
+			self._analysis_complete = False
+
+		else :
+
+			raise ValueError('Maximum number of iterations must be at least 1. Given value : ' + str(max_iterations))
+
+		self._rectify = bool(enabled)
+		self._analysis_complete = False
+
+		pass
+
+	def setPrecision(self, dtype = np.float64) :
+		'''Sets the floating point precision (np.float32 or np.float64) the
+		   cycle is evaluated in. Parameters and flight conditions are cast to
+		   it and every quantity is computed and returned in it, so float32
+		   halves the memory of the results and of the temporaries.
+
+		   Over Mach 0.1 - 1.2, altitudes 0 - 15 km, pi_c 10 - 40, pi_f 1.2 - 3.4,
+		   alpha 1 - 10 and T_t4 1400 - 1800 K the relative error of float32
+		   against float64 is below 5E-6 for ST, TSFC, eta_O and eta_P at
+		   99.9 % of the points and at most 1.2E-4, and at most 4E-6 for eta_T.
+		   It is larger only where a quantity crosses zero, e.g. ST_core of
+		   high bypass ratios at high Mach numbers, where the absolute error
+		   stays below 5E-3 N / (kg/s).'''
+
+		if np.dtype(dtype) in (np.dtype(np.float32), np.dtype(np.float64)) :
+
+			self._dtype = np.dtype(dtype)
+			self._analysis_complete = False
+
+		else :
+
+			raise ValueError('Precision must be np.float32 or np.float64. Given value : ' + str(dtype))
+
+		pass
+
+	def setLazyAnalysis(self, enabled = True) :
+		'''Enables deferring the evaluation of performAnalysis() to the getters,
+		   which then evaluate only the stages their quantities depend on.
+		   E.g. getSpecificThrusts() and getSpecificFuelConsumtionRates() skip
+		   the energy and efficiency stages. Stages evaluated for one getter
+		   are reused by the next ones until the next performAnalysis().'''
+
+		self._lazy = bool(enabled)
+		self._analysis_complete = False
+
+		pass
+
+	def setMaskedValidation(self, enabled = True) :
+		'''Enables validating the inputs per point instead of per array.
+		   The parameter setters then accept values out of range and
+		   performAnalysis() accepts flight speeds that are not positive. The
+		   points with invalid inputs, and those the cycle cannot run (negative
+		   fuel ratio, compressor and fan work beyond the turbine, or a nozzle
+		   pressure not above its exit pressure) are left
+		   out of the evaluation, their quantities are NaN and getValidity()
+		   returns the reasons. Set it before the parameters it should accept.
+		   Every stage is evaluated on the valid points at every analysis.'''
+
+		self._masked = bool(enabled)
+		self._analysis_complete = False
+
+		pass
+
 	def setQuickParameters(self,
 		compressor_compression_ratio,
 		fan_compression_ratio,
 		bypass_ratio
 	) :
 
-		if np.all(compressor_compression_ratio >= 1) :
+		if self._masked or np.all(compressor_compression_ratio >= 1) :
 
 			self._pi_c = compressor_compression_ratio
 			self._analysis_complete = False
@@ -294,7 +541,7 @@ class TurboFanEngine :
 
 			raise ValueError('Compression ratio must be greater than or equal to 1. Given value : ' + str(compressor_compression_ratio))
 
-		if np.all(fan_compression_ratio >= 1) :
+		if self._masked or np.all(fan_compression_ratio >= 1) :
 
 			self._pi_f = fan_compression_ratio
 			self._analysis_complete = False
@@ -303,7 +550,7 @@ class TurboFanEngine :
 
 			raise ValueError('Compression ratio must be greater than or equal to 1. Given value : ' + str(fan_compression_ratio))
 
-		if np.all(bypass_ratio >= 0) :
+		if self._masked or np.all(bypass_ratio >= 0) :
 
 			self._alpha = bypass_ratio
 			self._analysis_complete = False
@@ -345,368 +592,679 @@ class TurboFanEngine :
 
 		pass
 
-	def _initializeRatios(self, M_0, air:Atmosphere) :
+	def getParameters(self) :
+		'''Returns the immutable CycleParameters record of the current settings,
+		   cast to the precision set with setPrecision()'''
 
-		self._tau_r = getStagnationTemperatureRatio(CONST.kappa, M_0)
-		self._pi_r  = getStagnationPressureRatio(CONST.kappa, M_0)
+		if self._initialized :
 
-		self._pi_d  = self._pi_dmax * getRamRecovery(M_0)
-		
-		self._tau_l = self._c_pt * self._T_t4 / (getHeatCapacity(CONST.kappa, CONST.R) * air.temperature)
+			return castInputs(CycleParameters(
+				self._h_PR,
+				self._gamma_t,
+				self._c_pt,
+				self._T_t4,
+				self._e_t,
+				self._eta_m,
+				self._pi_c,
+				self._e_c,
+				self._pi_f,
+				self._e_f,
+				self._pi_dmax,
+				self._pi_fn,
+				self._pi_n,
+				self._pi_b,
+				self._eta_b,
+				self._alpha,
+				getattr(self, '_P0_by_P9', None),
+				getattr(self, '_P0_by_P19', None)
+			), self._dtype)
 
-		self._tau_c = np.float_power(self._pi_c, (CONST.kappa - 1.0) / (CONST.kappa * self._e_c))
-		self._tau_f = np.float_power(self._pi_f, (CONST.kappa - 1.0) / (CONST.kappa * self._e_f))
+		else :
 
-		pass
+			raise ExecError("Analysis needs to be initialized with initializeProblem()")
 
-	def _calculateFuelRatio(self, air:Atmosphere) :
+	def evaluate(self, flight_speed:np.ndarray, flight_conditions:Atmosphere, workspace:CycleWorkspace = None) -> CycleResult :
+		'''Evaluates the cycle and returns the CycleResult without storing it on the engine.
+		   Safe to call concurrently on a shared engine as long as no setter runs meanwhile.
+		   With a CycleWorkspace the results are written into its buffers in place.
+		   With masked validation the quantities of invalid points are NaN.'''
 
-		self._f = (self._tau_l - self._tau_r * self._tau_c) / ((self._eta_b * self._h_PR / (getHeatCapacity(CONST.kappa, CONST.R) * air.temperature)) - self._tau_l)
+		flight_conditions = castInputs(getFlightConditions(flight_speed, flight_conditions, not self._masked), self._dtype)
 
-		pass
+		if self._masked :
 
-	def _performTurbineEnergyBalance(self) :
+			if workspace is not None :
 
-		self._tau_t = 1.0 - (1.0 / (self._eta_m * (1 + self._f))) * (self._tau_r / self._tau_l) * (self._tau_c - 1.0 + self._alpha * (self._tau_f - 1.0))
-		self._pi_t  = np.float_power(self._tau_t, self._gamma_t / ((self._gamma_t - 1.0) * self._e_t))
+				raise ValueError('Masked validation cannot evaluate into a workspace.')
 
-		pass
+			result = evaluateCycleMasked(self.getParameters(), flight_conditions, self._profiler)[0]
 
-	def _getCoreProductPi(self) :
+		elif workspace is None :
 
-		return self._pi_r * self._pi_d * self._pi_c * self._pi_b * self._pi_t * self._pi_n
+			result = evaluateCycle(self.getParameters(), flight_conditions, profiler=self._profiler)
 
-	def _getFanProductPi(self) :
+		elif self._profiler is None :
 
-		return self._pi_r * self._pi_d * self._pi_f * self._pi_fn
+			result = evaluateCycleInto(self.getParameters(), flight_conditions, workspace)
 
-	def _calculateCoreExitConditions(self, air:Atmosphere) :
+		else :
 
-		product_pi = self._getCoreProductPi()
+			result = self._profiler.call('evaluateCycleInto', evaluateCycleInto, self.getParameters(), flight_conditions, workspace)
 
-		if hasattr(self, '_P0_by_P9') :
+		if self._rectify :
 
-			self._P_9 = air.pressure / self._P0_by_P9
-			self._M_9 = np.sqrt(
-				(2.0 / (self._gamma_t - 1.0)) *
-				(np.float_power(product_pi * self._P0_by_P9, (self._gamma_t - 1.0) / self._gamma_t) - 1.0)
-			)
+			result = rectifyExitConditions(result, self._rectification_tolerance, self._rectification_max_iterations, self._profiler)
 
-		else :
+		return result
 
-			self._P_9 = air.pressure * product_pi / getStagnationPressureRatio(self._gamma_t, 1.0)
+	# Attributes of the CycleParameters fields, in order
+	_parameter_attributes = tuple('_' + field for field in CycleParameters._fields)
 
-			condition = self._P_9 < air.pressure
+	def evaluateScalar(self, flight_speed:float, flight_conditions:Atmosphere) -> CyclePoint :
+		'''Evaluates the cycle at a single point with plain floats and returns
+		   a CyclePoint, without storing it on the engine. Every parameter and
+		   the flight speed and conditions must be scalars. Much faster than
+		   evaluate() for one point, and agrees with it to round-off : points
+		   the float evaluation cannot handle (where evaluate() gives NaN or
+		   inf), points needing exit rectification when it is enabled and
+		   every point with masked validation go through evaluate().
+		   Evaluates in double precision whatever the setPrecision().'''
 
-			self._M_9 = np.where(condition,
-							np.sqrt(
-								(2.0 / (self._gamma_t - 1.0)) * 
-								(np.float_power(product_pi, (self._gamma_t - 1.0) / self._gamma_t) - 1.0)
-							),
-						# else
-							1.0
-			)
+		if not self._initialized :
 
-			self._P_9[condition] = air.pressure
-		
-		self._T_9 = air.temperature * (self._tau_l * self._tau_t / getStagnationTemperatureRatio(self._gamma_t, self._M_9)) * (getHeatCapacity(CONST.kappa, CONST.R) / self._c_pt)
-		self._V_9 = self._M_9 * getSonicSpeed(self._gamma_t, self._R_t, self._T_9)
+			raise ExecError("Analysis needs to be initialized with initializeProblem()")
 
-		pass
+		try :
 
-	def _calculateFanExitConditions(self, air:Atmosphere) :
+			values = tuple(map(self.__dict__.get, self._parameter_attributes))
 
-		product_pi = self._pi_r * self._pi_d * self._pi_f * self._pi_fn
+			# The float parameters are kept until a setter replaces any value
+			# or a parameter array is modified in place
+			if (
+				self._scalar_parameters is None or
+				not all(map(operator.is_, values, self._scalar_parameters[0])) or
+				any(values[i].item() != self._scalar_parameters[1][i] for i in self._scalar_parameters[2])
+			) :
 
-		if hasattr(self, '_P0_by_P19') :
+				self._scalar_parameters = (
+					values,
+					CycleParameters._make(None if value is None else _getFloat(value) for value in values),
+					tuple(i for i, value in enumerate(values) if isinstance(value, np.ndarray))
+				)
 
-			self._P_19 = air.pressure / self._P0_by_P19
+			parameters = self._scalar_parameters[1]
 
-			self._M_19 = np.sqrt(
-				(2.0 / (CONST.kappa - 1.0)) *
-				(np.float_power(product_pi * self._P0_by_P19, (CONST.kappa - 1.0) / CONST.kappa) - 1.0)
-			)
+			V_0 = _getFloat(flight_speed)
+			a_0 = _getFloat(flight_conditions.speed_of_sound)
 
-		else :
+			point = FlightConditions(V_0, V_0 / a_0, _getFloat(flight_conditions.temperature), _getFloat(flight_conditions.pressure), a_0)
 
-			self._P_19 = air.pressure * product_pi / getStagnationPressureRatio(CONST.kappa, 1.0)
+		except (TypeError, ValueError) :
 
-			condition = self._P_19 < air.pressure
+			raise ValueError('Scalar evaluation needs scalar parameters and flight conditions, use evaluate() for arrays.')
 
-			self._M_19 = np.where(condition,
-									np.sqrt(
-										(2.0 / (CONST.kappa - 1.0)) * 
-										(np.float_power(product_pi, (CONST.kappa - 1.0) / CONST.kappa) - 1.0)
-									),
-								# else
-									1.0
-			)
+		if self._masked :
 
-			self._P_19[condition] = air.pressure
+			return CyclePoint.fromResult(self.evaluate(flight_speed, flight_conditions))
 
-		self._T_19 = air.temperature * (self._tau_r * self._tau_f / getStagnationTemperatureRatio(CONST.kappa, self._M_19))
-		self._V_19 = self._M_19 * air.speed_of_sound * np.sqrt(self._T_19 / air.temperature)
+		elif V_0 > 0 :
 
-		pass
+			pass
 
-	def _calculateThrust(self, V_0, air:Atmosphere) :
+		else :
 
-		self._ST_core = (1.0 / (1.0 + self._alpha)) * (
-			(1.0 + self._f) * self._V_9 - V_0 +
-			(1.0 + self._f) * self._R_t * (air.speed_of_sound ** 2) * self._T_9 * (1.0 - (air.pressure / self._P_9)) / (CONST.kappa * CONST.R * air.temperature * self._V_9)
-		)
+			raise ValueError('Flight speed must be positive. Given value : ' + str(flight_speed))
 
-		self._ST_fan = (self._alpha / (1.0 + self._alpha)) * (
-			self._V_19 - V_0 +
-			(air.speed_of_sound ** 2) * self._T_19 * (1.0 - (air.pressure / self._P_19)) / (CONST.kappa * air.temperature * self._V_19)
-		)
+		try :
 
-		self._ST = self._ST_core + self._ST_fan
+			if self._profiler is None :
 
-		pass
+				result = evaluateCyclePoint(parameters, point)
 
-	def _calculateEnergies(self, V_0) :
+			else :
 
-		self._thrust_power_core = self._ST_core * V_0
-		self._thrust_power_fan	= self._ST_fan * V_0
+				result = self._profiler.call('evaluateCyclePoint', evaluateCyclePoint, parameters, point)
 
-		self._thrust_power		= self._thrust_power_core + self._thrust_power_fan
+		except (ValueError, ZeroDivisionError, OverflowError) :
 
-		self._Delta_KE_fan	= 0.5 * self._alpha * ((self._V_19 - V_0) ** 2) / (1.0 + self._alpha)
-		self._Delta_KE_core = 0.5 * ((self._V_9 - V_0) ** 2) / (1.0 + self._alpha)
+			return CyclePoint.fromResult(self.evaluate(flight_speed, flight_conditions))
 
-		self._Delta_KE = self._Delta_KE_core + self._Delta_KE_fan
+		if self._rectify and (result.eta_P_core > 1 or result.eta_P_fan > 1) :
 
-		self._thermal_energy = self._f * self._h_PR / (1.0 + self._alpha)
+			return CyclePoint.fromResult(self.evaluate(flight_speed, flight_conditions))
 
-		pass
+		return result
 
-	def _calculatePerformanceParameters(self) :
+	@staticmethod
+	def _snapshot(record) :
 
-		self._TSFC = self._f / ((1.0 + self._alpha) * self._ST)
+		return type(record)(*(np.copy(value) if isinstance(value, np.ndarray) else value for value in record))
 
-		self._eta_P			= self._thrust_power / (self._thrust_power + self._Delta_KE)
-		self._eta_P_fan		= self._thrust_power_fan / (self._thrust_power_fan + self._Delta_KE_fan)
-		self._eta_P_core	= self._thrust_power_core / (self._thrust_power_core + self._Delta_KE_core)
+	def performAnalysis(self, flight_speed:np.ndarray, flight_conditions:Atmosphere, workspace:CycleWorkspace = None) :
+		'''Only the stages invalidated by parameters or flight conditions that
+		   changed since the last analysis are recomputed, see getStageStatistics().
+		   With a workspace every stage is evaluated into its buffers.
+		   With lazy analysis enabled (and no workspace) the evaluation is left
+		   to the getters, see setLazyAnalysis().'''
 
-		self._eta_T = (self._thrust_power + self._Delta_KE) / self._thermal_energy
+		if workspace is None :
 
-		pass
+			# Arrays are snapshotted so that inputs modified in place by the
+			# caller are not mistaken for the ones of the last analysis
+			flight_conditions = self._snapshot(castInputs(getFlightConditions(flight_speed, flight_conditions, not self._masked), self._dtype))
+			parameters = self._snapshot(self.getParameters())
+
+			self._pending = (parameters, flight_conditions)
+			self._counted_stages = set()
+			self._last_evaluated_stages = ()
 
-	def _rectifyCoreExitConditions(self, V_0, air:Atmosphere) :
+			self._block = None
+			self._block_filled = set()
 
-		condition = self._eta_P_core > 1
+			self._analysis_complete = True
+
+			if not self._lazy :
 
-		product_pi = self._getCoreProductPi()
+				self._require()
 
-		M9_l = self._M_9[condition]
-		M9_u = np.ones_like(M9_l) * 2.0
+		elif self._masked :
 
-		self._M_9[condition] = 0.5 * (M9_u + M9_l)
-		
-		self._P_9 = air.pressure * product_pi / getStagnationPressureRatio(self._gamma_t, self._M_9)
-		self._T_9 = air.temperature * (self._tau_l * self._tau_t / getStagnationTemperatureRatio(self._gamma_t, self._M_9)) * (getHeatCapacity(CONST.kappa, CONST.R) / self._c_pt)
-		self._V_9 = self._M_9 * getSonicSpeed(self._gamma_t, self._R_t, self._T_9)
+			raise ValueError('Masked validation cannot evaluate into a workspace.')
 
-		self._calculateThrust(V_0, air)
-		self._calculateEnergies(V_0)
-		self._calculatePerformanceParameters()
+		else :
 
-		while not np.all(np.isclose(self._eta_P_core[condition], 0.99, atol=0.009)) :
+			self._result = self.evaluate(flight_speed, flight_conditions, workspace)
 
-			go_up = self._eta_P_core > 0.99
+			# The workspace buffers are overwritten by its next use
+			self._stage_outputs = None
+			self._pending = None
 
-			M9_l[go_up]	 = self._M_9[go_up]
-			M9_u[~go_up] = self._M_9[~go_up]
+			self._block = None
+			self._block_filled = set()
 
-			self._M_9[condition] = 0.5 * (M9_u + M9_l)
-		
-			self._P_9 = air.pressure * product_pi / getStagnationPressureRatio(self._gamma_t, self._M_9)
-			self._T_9 = air.temperature * (self._tau_l * self._tau_t / getStagnationTemperatureRatio(self._gamma_t, self._M_9)) * (getHeatCapacity(CONST.kappa, CONST.R) / self._c_pt)
-			self._V_9 = self._M_9 * getSonicSpeed(self._gamma_t, self._R_t, self._T_9)
+			self._stages_evaluated += len(CYCLE_STAGES)
+			self._last_evaluated_stages = tuple(name for name, stage in CYCLE_STAGES)
 
-			self._calculateThrust(V_0, air)
-			self._calculateEnergies(V_0)
-			self._calculatePerformanceParameters()
+			self._analysis_complete = True
 
 		pass
 
-	def _rectifyFanExitConditions(self, V_0, air:Atmosphere) :
+	def _require(self, *outputs) -> CycleResult :
+		'''Returns the result of the last performAnalysis(), evaluating the
+		   stages the given quantities depend on (every stage if none are
+		   given) that have not been evaluated yet'''
 
-		condition = self._eta_P_fan > 1
+		if not self._analysis_complete :
 
-		product_pi = self._getFanProductPi()
+			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+
+		if self._pending is None :
 
-		M19_l = self._M_19[condition]
-		M19_u = np.ones_like(M19_l) * 2.0
+			return self._result
 
-		self._M_19[condition] = 0.5 * (M19_u + M19_l)
-		
-		self._P_19 = air.pressure * product_pi / getStagnationPressureRatio(CONST.kappa, self._M_19)
-		self._T_19 = air.temperature * (self._tau_r * self._tau_f / getStagnationTemperatureRatio(CONST.kappa, self._M_19))
-		self._V_19 = self._M_19 * air.speed_of_sound * np.sqrt(self._T_19 / air.temperature)
+		parameters, flight_conditions = self._pending
 
-		self._calculateThrust(V_0, air)
-		self._calculateEnergies(V_0)
-		self._calculatePerformanceParameters()
+		if self._rectify or self._masked or len(outputs) == 0 :
 
-		while not np.all(np.isclose(self._eta_P_fan[condition], 0.99, atol=0.009)) :
+			outputs = None
+			required = tuple(name for name, stage in CYCLE_STAGES)
 
-			go_up = self._eta_P_fan > 0.99
+		else :
 
-			M19_l[go_up]	 = self._M_19[go_up]
-			M19_u[~go_up] = self._M_19[~go_up]
+			required = getRequiredStages(outputs)
 
-			self._M_19[condition] = 0.5 * (M19_u + M19_l)
-		
-			self._M_19[condition] = 0.5 * (M19_u + M19_l)
-		
-			self._P_19 = air.pressure * product_pi / getStagnationPressureRatio(CONST.kappa, self._M_19)
-			self._T_19 = air.temperature * (self._tau_r * self._tau_f / getStagnationTemperatureRatio(CONST.kappa, self._M_19))
-			self._V_19 = self._M_19 * air.speed_of_sound * np.sqrt(self._T_19 / air.temperature)
+		if self._counted_stages.issuperset(required) :
 
-			self._calculateThrust(V_0, air)
-			self._calculateEnergies(V_0)
-			self._calculatePerformanceParameters()
-		
-		pass
+			return self._result
 
-	def performAnalysis(self, flight_speed:np.ndarray, flight_conditions:Atmosphere) :
+		if self._masked :
 
-		if np.all(flight_speed > 0) :
+			# Stage outputs of masked points are not reused
+			stale = required
 
-			M_0 = flight_speed / flight_conditions.speed_of_sound
+			self._stage_outputs = None
+
+			result, self._validity = evaluateCycleMasked(parameters, flight_conditions, self._profiler)
 
 		else :
 
-			raise ValueError('Flight speed must be positive. Given value : ' + str(flight_speed))
+			stale = getStaleStages(self._stage_outputs, parameters, flight_conditions)
 
-		if self._initialized :
+			if outputs is not None :
+
+				# Stages counted earlier are requested again so that their
+				# outputs are carried over instead of being left out
+				outputs = tuple(
+					output
+					for name, stage in CYCLE_STAGES if name in required or name in self._counted_stages
+					for output in STAGE_DEPENDENCIES[name][2]
+				)
 
-			self._initializeRatios(M_0, flight_conditions)
-			self._calculateFuelRatio(flight_conditions)
-			self._performTurbineEnergyBalance()
-			self._calculateCoreExitConditions(flight_conditions)
-			self._calculateFanExitConditions(flight_conditions)
-			self._calculateThrust(flight_speed, flight_conditions)
-			self._calculateEnergies(flight_speed)
-			self._calculatePerformanceParameters()
+			self._stage_outputs = evaluateCycle(parameters, flight_conditions, previous=self._stage_outputs, outputs=outputs, profiler=self._profiler)
 
-			# self._rectifyCoreExitConditions(flight_speed, flight_conditions)
-			# self._rectifyFanExitConditions(flight_speed, flight_conditions)
+			result = self._stage_outputs
+
+		if self._rectify :
+
+			self._result = rectifyExitConditions(result, self._rectification_tolerance, self._rectification_max_iterations, self._profiler)
 
-			self._analysis_complete = True
-			pass
-		
 		else :
 
-			raise ExecError("Analysis needs to be initialized with initializeProblem()")
+			self._result = result
 
-	def getSpecificThrusts(self) :
+		# Every stage is counted once per analysis, when first required
+		evaluated = tuple(name for name in required if name in stale and name not in self._counted_stages)
+		skipped = tuple(name for name in required if name not in stale and name not in self._counted_stages)
 
-		if self._analysis_complete :
+		self._stages_evaluated += len(evaluated)
+		self._stages_skipped += len(skipped)
+		self._last_evaluated_stages += evaluated
 
-			return np.stack((self._ST, self._ST_core, self._ST_fan), -1)
+		self._counted_stages.update(required)
 
-		else :
+		return self._result
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+	def getSensitivities(self, flight_speed:np.ndarray, flight_conditions:Atmosphere, variables = SENSITIVITY_VARIABLES) :
+		'''Returns a dict mapping the name of every quantity of a CycleResult
+		   (and eta_O) to its Jacobian : an ndarray of the shape of the quantity
+		   plus a last axis holding its partial derivatives with respect to the
+		   given variables, in order. variables may be any of pi_c, pi_f, alpha,
+		   T_t4, e_c, e_f, e_t and Mach (at a fixed altitude).
+		   All the derivatives are propagated through a single evaluation of
+		   the cycle, see evaluateCycleSensitivities(). They are those of the
+		   unrectified cycle, even with exit rectification enabled.
+		   Does not affect the result of performAnalysis().'''
 
-	def getSpecificFuelConsumtionRates(self) :
+		flight_conditions = castInputs(getFlightConditions(flight_speed, flight_conditions), self._dtype)
 
-		if self._analysis_complete :
+		if self._profiler is None :
 
-			return np.stack((self._TSFC, self._f / (1.0 + self._alpha)), -1)
+			result = evaluateCycleSensitivities(self.getParameters(), flight_conditions, variables)
 
 		else :
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+			result = self._profiler.call('evaluateCycleSensitivities', evaluateCycleSensitivities, self.getParameters(), flight_conditions, variables)
 
-	def getEfficiencies(self) :
+		quantities = result._asdict()
+		quantities['eta_O'] = result.eta_T * result.eta_P
 
-		if self._analysis_complete :
+		jacobians = {}
 
-			return np.stack((
-				self._eta_T * self._eta_P,
-				self._eta_T,
-				self._eta_P,
-				self._eta_P_core,
-				self._eta_P_fan
-			), -1)
+		for name in self._sensitivity_quantities :
 
-		else :
+			value = quantities[name]
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+			if isinstance(value, Dual) :
 
-	def getReferenceRatios(self) :
+				jacobians[name] = np.array(np.broadcast_to(value.derivative, value.shape + (len(variables),)))
 
-		if self._analysis_complete :
+			else :
 
-			return np.stack((self._pi_r, self._tau_r), -1)
+				# Independent of every variable
+				jacobians[name] = np.zeros(np.shape(value) + (len(variables),), dtype=self._dtype)
 
-		else :
+		return jacobians
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+	def getSweepCoordinates(self, **axes) :
+		'''Validates the sweep axes given as keywords (see performSweep())
+		   and returns a dict mapping every axis name to its 1-D coordinates'''
 
-	def getTurbineOperatingRatios(self) :
+		if not self._initialized :
 
-		if self._analysis_complete :
+			raise ExecError("Analysis needs to be initialized with initializeProblem()")
 
-			return np.stack((self._pi_t, self._tau_t), -1)
+		for axis in self._sweep_flight_axes :
 
-		else :
+			if axis not in axes :
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+				raise ValueError(axis + ' must be given as a sweep axis.')
 
-	def getCompressorOperatingRatios(self) :
+		for axis in axes :
 
-		if self._analysis_complete :
+			if axis not in self._sweep_design_axes and axis not in self._sweep_flight_axes :
 
-			return np.stack((self._pi_c, self._tau_c), -1)
+				raise ValueError('Unknown sweep axis : ' + axis + '. Valid axes : ' + str(tuple(self._sweep_design_axes) + self._sweep_flight_axes))
 
-		else :
+		coordinates = {}
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+		for axis, values in axes.items() :
 
-	def getFanOperatingRatios(self) :
+			values = np.atleast_1d(np.asarray(values, dtype=float))
 
-		if self._analysis_complete :
+			if values.ndim != 1 :
 
-			return np.stack((self._pi_f, self._tau_f), -1)
+				raise ValueError('Coordinates of axis ' + axis + ' must be 1-D. Given shape : ' + str(values.shape))
 
-		else :
+			coordinates[axis] = values
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+		return coordinates
 
-	def getCoreExitState(self) :
+	def getSweepEngine(self, precision = None, **values) :
+		'''Returns a copy of this engine with the design axes given as keywords
+		   (see performSweep()) set to the given arrays, which may be open
+		   meshes. Axes other than design axes are ignored.'''
 
-		if self._analysis_complete :
+		# Parameters are routed through the setters of a copy so that the usual
+		# validation applies and the state of this engine is not disturbed
+		engine = copy.copy(self)
 
-			return np.stack((self._M_9, self._P_9, self._T_9), -1)
+		if precision is not None :
 
-		else :
+			engine.setPrecision(precision)
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+		for axis, value in values.items() :
 
-	def getFanExitState(self) :
+			if axis in self._sweep_design_axes :
 
-		if self._analysis_complete :
+				setter, attributes = self._sweep_design_axes[axis]
 
-			return np.stack((self._M_19, self._P_19, self._T_19), -1)
+				setattr(engine, '_' + axis, value)
 
-		else :
+				arguments = []
+
+				for attribute in attributes :
+
+					if not hasattr(engine, attribute) :
+
+						raise AttributeError(attribute + ' not initialized. Set it before sweeping over ' + axis + '.')
+
+					arguments.append(getattr(engine, attribute))
+
+				getattr(engine, setter)(*arguments)
+
+		return engine
+
+	def evaluatePoints(self, atmosphere = Atmosphere, precision = None, **values) :
+		'''Evaluates the engine at the points given by the sweep axes as
+		   keywords (see performSweep()) mapped to mutually broadcastable arrays,
+		   e.g. evaluatePoints(Mach = M, altitude = h, alpha = a) for 1-D arrays
+		   of points. Parameters that are not given keep the values set on the
+		   engine, which is left unchanged. Returns getQuantities() of the points.'''
+
+		engine = self.getSweepEngine(precision, **values)
+
+		flight_conditions = atmosphere(values['altitude'])
+		flight_speed = values['Mach'] * flight_conditions.speed_of_sound
+
+		engine.performAnalysis(flight_speed, flight_conditions)
+
+		return engine.getQuantities()
+
+	def performSweep(self, atmosphere = Atmosphere, precision = None, **axes) :
+		'''Evaluates the engine over the outer product of the named axes.
+		   Every keyword is an axis name mapped to its 1-D coordinates,
+		   e.g. performSweep(pi_c = ..., alpha = ..., Mach = ..., altitude = ...).
+		   Mach and altitude (in m) are required, design axes are any field
+		   of CycleParameters, e.g. pi_c, alpha, h_PR or e_c. Parameters that
+		   are not swept keep the values set on the engine, which is left unchanged.
+		   atmosphere is called with the altitude grid, e.g. an AtmosphereTable.
+		   precision overrides the one set with setPrecision() for this sweep.
+		   Returns a SweepResult holding every quantity exposed by the getters.'''
+
+		coordinates = self.getSweepCoordinates(**axes)
+
+		grids = {}
+
+		for i, (axis, values) in enumerate(coordinates.items()) :
+
+			grid_shape = [1] * len(coordinates)
+			grid_shape[i] = values.size
+
+			grids[axis] = values.reshape(grid_shape)
+
+		shape = tuple(values.size for values in coordinates.values())
+
+		quantities = {
+			name : np.array(np.broadcast_to(values, shape))
+			for name, values in self.evaluatePoints(atmosphere, precision, **grids).items()
+		}
+
+		return SweepResult(coordinates.keys(), coordinates, quantities)
+
+	def _getOutputs(self, getter, outputs, calculate) :
+		'''Returns a read-only view of the columns of getter in the output block,
+		   filling them on first use with calculate(result), result holding
+		   the given quantities'''
+
+		if not self._analysis_complete :
 
 			raise ExecError("Value not evaluated yet. Run performAnalysis()")
-    
+
+		if getter not in self._block_filled :
+
+			result = self._require(*outputs)
+
+			if self._block is None :
+
+				# Every quantity broadcasts to the shape of the inputs
+				shape = np.broadcast_shapes(*(np.shape(value) for value in result.parameters + result.flight_conditions if value is not None))
+
+				self._block = np.empty(shape + (len(self.getQuantityNames()),), dtype=self._dtype)
+
+			columns = self._block_columns[getter]
+
+			for j, value in enumerate(calculate(result)) :
+
+				self._block[..., columns.start + j] = value
+
+			self._block_filled.add(getter)
+
+		columns = self._block_columns[getter]
+
+		view = self._block[..., columns.start] if columns.stop - columns.start == 1 else self._block[..., columns]
+
+		# The block is shared by every call, so it must not be modified through a view
+		view.flags.writeable = False
+
+		return view
+
+	@_profiled
+	def getSpecificThrusts(self) :
+
+		return self._getOutputs('getSpecificThrusts', ('ST', 'ST_core', 'ST_fan'), lambda result : (result.ST, result.ST_core, result.ST_fan))
+
+	@_profiled
+	def getSpecificFuelConsumtionRates(self) :
+
+		return self._getOutputs('getSpecificFuelConsumtionRates', ('TSFC', 'f'), lambda result : (result.TSFC, result.f / (1.0 + result.parameters.alpha)))
+
+	@_profiled
+	def getEfficiencies(self) :
+
+		return self._getOutputs('getEfficiencies', ('eta_T', 'eta_P', 'eta_P_core', 'eta_P_fan'), lambda result : (
+			result.eta_T * result.eta_P,
+			result.eta_T,
+			result.eta_P,
+			result.eta_P_core,
+			result.eta_P_fan
+		))
+
+	@_profiled
+	def getReferenceRatios(self) :
+
+		return self._getOutputs('getReferenceRatios', ('pi_r', 'tau_r'), lambda result : (result.pi_r, result.tau_r))
+
+	@_profiled
+	def getTurbineOperatingRatios(self) :
+
+		return self._getOutputs('getTurbineOperatingRatios', ('pi_t', 'tau_t'), lambda result : (result.pi_t, result.tau_t))
+
+	@_profiled
+	def getCompressorOperatingRatios(self) :
+
+		return self._getOutputs('getCompressorOperatingRatios', ('tau_c',), lambda result : (result.parameters.pi_c, result.tau_c))
+
+	@_profiled
+	def getFanOperatingRatios(self) :
+
+		return self._getOutputs('getFanOperatingRatios', ('tau_f',), lambda result : (result.parameters.pi_f, result.tau_f))
+
+	@_profiled
+	def getCoreExitState(self) :
+
+		return self._getOutputs('getCoreExitState', ('M_9', 'P_9', 'T_9'), lambda result : (result.M_9, result.P_9, result.T_9))
+
+	@_profiled
+	def getFanExitState(self) :
+
+		return self._getOutputs('getFanExitState', ('M_19', 'P_19', 'T_19'), lambda result : (result.M_19, result.P_19, result.T_19))
+
+	@_profiled
 	def getBurnerEnthalpyRatio(self) :
 
-		if self._analysis_complete :
+		return self._getOutputs('getBurnerEnthalpyRatio', ('tau_l',), lambda result : (result.tau_l,))
+
+	def getValidity(self) :
+		'''Returns the reasons every point of the last analysis is invalid, an
+		   ndarray of POINT_VALID or the bit flags INVALID_INPUT,
+		   NEGATIVE_FUEL_RATIO, TURBINE_OVERLOADED, CORE_NOZZLE_UNDEREXPANDED
+		   and FAN_NOZZLE_UNDEREXPANDED of Turbofan_Cycle,
+		   None if masked validation is disabled (see setMaskedValidation())'''
+
+		if not self._masked :
+
+			return None
+
+		self._require()
+
+		return self._validity
+
+	def getExitRectification(self) :
+		'''Returns the ExitRectification record of the last performAnalysis(),
+		   None if rectification is disabled'''
+
+		result = self._require()
+
+		return result.rectification
+
+	def getQuantities(self) :
+		'''Returns a dict mapping the name of every quantity exposed by the
+		   getters (the quantities of a SweepResult) to its array, a read-only
+		   view into the output block (see getOutputBlock())'''
+
+		quantities = {}
+
+		for getter, names in self._sweep_quantities.items() :
+
+			values = getattr(self, getter)()
+
+			if len(names) == 1 :
+
+				quantities[names[0]] = values
+
+			else :
+
+				for j, name in enumerate(names) :
+
+					quantities[name] = values[..., j]
+
+		return quantities
+
+	def getOutputBlock(self) :
+		'''Returns the outputs of every getter of the last analysis as one
+		   read-only, C-contiguous ndarray whose last axis holds the quantities
+		   of getQuantityNames() in order, e.g. to hand to a file writer or copy
+		   into shared memory. The getters return views into it.'''
+
+		for getter in self._sweep_quantities :
+
+			getattr(self, getter)()
+
+		block = self._block.view()
+		block.flags.writeable = False
+
+		return block
+
+	def getQuantityNames(self) :
+		'''Names of the quantities returned by getQuantities()'''
 
-			return np.copy(self._tau_l)
+		return tuple(name for names in self._sweep_quantities.values() for name in names)
+
+	def getPrecision(self) :
+
+		return self._dtype
+
+	def getSpecification(self) -> EngineSpecification :
+		'''Returns the EngineSpecification of the current settings, from which
+		   setSpecification() rebuilds an equivalent engine, e.g. in another process'''
+
+		return EngineSpecification(
+			self.getParameters(),
+			self._dtype.name,
+			self._rectify,
+			self._rectification_tolerance,
+			self._rectification_max_iterations,
+			self._masked
+		)
+
+	def setSpecification(self, specification:EngineSpecification) :
+		'''Sets every parameter and setting from an EngineSpecification.
+		   The parameters are taken as they are, without the validation
+		   of the individual setters.'''
+
+		self.setMaskedValidation(specification.masked)
+
+		for field, value in specification.parameters._asdict().items() :
+
+			setattr(self, '_' + field, value)
+
+		self.setPrecision(specification.precision)
+		self.setExitRectification(specification.rectify, specification.rectification_tolerance, specification.rectification_max_iterations)
+
+		self.initializeProblem()
+
+		pass
+
+	def setProfiling(self, enabled = True, trace_memory = False) :
+		'''Enables recording the wall time, calls and (with trace_memory) the
+		   memory allocated by every cycle stage, getter and exit rectification,
+		   and the iterations of the latter, see getProfile(). Enabling it
+		   again starts a new profile. Disabled, nothing is recorded. The
+		   profile replaced or disabled is closed, which stops the memory
+		   tracing it started.'''
+
+		if self._profiler is not None :
+
+			self._profiler.close()
+
+		if enabled :
+
+			self._profiler = CycleProfiler(trace_memory)
 
 		else :
 
-			raise ExecError("Value not evaluated yet. Run performAnalysis()")
+			self._profiler = None
+
+		pass
+
+	def getProfile(self) -> CycleProfiler :
+		'''Returns the CycleProfiler of the current profile, whose getStatistics()
+		   and getTable() report it, None if profiling is disabled'''
+
+		return self._profiler
+
+	def getStageStatistics(self) :
+		'''Returns the number of cycle stages evaluated and skipped over all
+		   analyses so far, and the names of the stages the last one evaluated'''
+
+		return {
+			'evaluated'			: self._stages_evaluated,
+			'skipped'			: self._stages_skipped,
+			'last_evaluated'	: self._last_evaluated_stages,
+		}
+
+	def resetStageStatistics(self) :
+
+		self._stages_evaluated = 0
+		self._stages_skipped = 0
+		self._last_evaluated_stages = ()
+
+		pass
+
+	def getResult(self) -> CycleResult :
+		'''Returns the immutable CycleResult of the last performAnalysis()'''
+
+		return self._require()
 
 if __name__ == '__main__' :
 
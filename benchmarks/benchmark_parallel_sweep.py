@@ -0,0 +1,60 @@
+'''Throughput of ParallelSweepExecutor against TurboFanEngine.performSweep()
+   on a 4-D design sweep, for an increasing number of worker processes.
+
+   python benchmarks/benchmark_parallel_sweep.py [points per axis] [workers ...]'''
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Atmosphere_Table import AtmosphereTable
+from Parallel_Sweep import ParallelSweepExecutor
+
+from benchmark_suite import getEngine, timeBest
+
+def getAxes(n) :
+
+	return {
+		'pi_c'		: np.linspace(10, 40, n),
+		'alpha'		: np.linspace(1, 10, n),
+		'Mach'		: np.linspace(0.1, 0.9, n),
+		'altitude'	: np.linspace(0, 12E3, n),
+	}
+
+if __name__ == '__main__' :
+
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+	worker_counts = [int(value) for value in sys.argv[2:]]
+
+	if not worker_counts :
+
+		worker_counts = [workers for workers in (1, 2, 4, 8, 16, 32, 64) if workers <= os.cpu_count()]
+
+	engine = getEngine()
+	atmosphere = AtmosphereTable()
+	axes = getAxes(n)
+
+	points = n ** len(axes)
+
+	serial = timeBest(lambda : engine.performSweep(atmosphere, **axes))
+
+	print('Points :', points, ', CPUs :', os.cpu_count())
+	print('Serial performSweep : {:.3f} s, {:.3g} points / s'.format(serial, points / serial))
+
+	for workers in worker_counts :
+
+		with ParallelSweepExecutor(workers) as executor :
+
+			# Warm up the pool, so process start up is not timed
+			executor.performSweep(engine, atmosphere, **getAxes(2)).close()
+
+			parallel = timeBest(lambda : executor.performSweep(engine, atmosphere, **axes).close())
+
+		print('{:3d} workers : {:.3f} s, {:.3g} points / s, speed up {:.2f}, efficiency {:.2f}'.format(
+			workers, parallel, points / parallel, serial / parallel, serial / (parallel * workers)
+		))
+
+	pass
@@ -0,0 +1,252 @@
+'''Benchmarks of the hot paths : TurboFanEngine.performAnalysis() over array
+   sizes from 1 to 1E7 points, the getters, Aircraft.fly_aircraft() per step
+   and a Mission takeoff and landing. Reports the best time of a few runs,
+   the throughput and the peak memory traced by tracemalloc (in a separate
+   run, so tracing does not affect the timings), and the ratio of every time
+   to the one stored in a baseline JSON file.
+
+   python benchmarks/benchmark_suite.py [--max-points N] [--baseline FILE] [--save]
+
+   The 1E7 point analysis needs about 3 GB of memory, use --max-points to
+   stay below it on smaller machines.'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import warnings
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ambiance import Atmosphere
+
+from Turbofan_Engine import TurboFanEngine
+from Aircraft import Aircraft
+from Mission import Mission
+
+_default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Times slower than the baseline by more than this factor are flagged
+_regression_threshold = 1.2
+
+def getEngine() :
+
+	engine = TurboFanEngine()
+
+	engine.setFuelProperties(42.7984E6, 1.33, 1155.5568)
+	engine.setInletOutletProperties(0.99, 0.99, 0.99)
+	engine.setBurnerProperties(0.96, 0.99)
+	engine.setCompressorProperties(36, 0.9)
+	engine.setFanProperties(1.7, 0.89)
+	engine.setTurbineProperties(1666.67, 0.89, 0.99)
+	engine.setBypassRatio(8)
+
+	engine.initializeProblem()
+
+	return engine
+
+def getAircraft() :
+
+	aircraft = Aircraft()
+
+	aircraft.area_inlet = np.pi * ((2.5 / 2) ** 2)  # m2
+	aircraft.area_wing  = 102.0 # m2
+
+	aircraft.mass_fuel = 21.685E3       # kg
+	aircraft.mass_payload = 20.882E3    # kg
+	aircraft.mass_structure = 41.145E3  # kg
+
+	aircraft.C_D0 = 0.024
+	aircraft.k_1 = 0.0366
+
+	return aircraft
+
+def timeBest(function, repeats = 3, setup = None) :
+	'''Returns the best time in s of repeats calls of function, each one
+	   preceded by an untimed call of setup if given'''
+
+	best = np.inf
+
+	for i in range(repeats) :
+
+		if setup is not None :
+
+			setup()
+
+		start = time.perf_counter()
+		function()
+		best = min(best, time.perf_counter() - start)
+
+	return best
+
+def measure(name, function, points = 1, repeats = 3, setup = None) :
+	'''Returns the record of a benchmark : best time in s of repeats calls
+	   of function (each after setup, see timeBest()), throughput in
+	   points / s and peak traced memory in bytes'''
+
+	seconds = timeBest(function, repeats, setup)
+
+	if setup is not None :
+
+		setup()
+
+	tracemalloc.start()
+	function()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return {
+		'name'			: name,
+		'seconds'		: seconds,
+		'points'		: points,
+		'throughput'	: points / seconds,
+		'peak_bytes'	: peak,
+	}
+
+def benchmarkPerformAnalysis(max_points) :
+
+	records = []
+
+	for exponent in range(8) :
+
+		points = 10 ** exponent
+
+		if points > max_points :
+
+			break
+
+		# Points spread over a Mach number - altitude grid
+		mach_number = np.linspace(0.1, 0.9, points)
+		flight_conditions = Atmosphere(np.linspace(0, 12E3, points))
+		flight_speed = mach_number * flight_conditions.speed_of_sound
+
+		def analyze() :
+
+			# A new engine every call, which has no stage outputs to reuse
+			getEngine().performAnalysis(flight_speed, flight_conditions)
+
+		# More repeats for the small sizes, whose times are noisier
+		repeats = 20 if points <= 10 ** 4 else 3 if points < 10 ** 6 else 1
+
+		records.append(measure('performAnalysis[' + str(points) + ']', analyze, points, repeats))
+
+	return records
+
+def benchmarkGetters(points = 10 ** 5) :
+
+	engine = getEngine()
+
+	flight_conditions = Atmosphere(np.linspace(0, 12E3, points))
+	flight_speed = np.linspace(0.1, 0.9, points) * flight_conditions.speed_of_sound
+
+	def analyze() :
+
+		# The stages are reused, but the getter outputs are dropped, so
+		# every timed call evaluates the getters and fills the result block
+		# instead of returning the views cached by the previous one
+		engine.performAnalysis(flight_speed, flight_conditions)
+
+	return [measure('getQuantities[' + str(points) + ']', engine.getQuantities, points, setup=analyze)]
+
+def benchmarkFlyAircraft(steps = 200) :
+
+	engine = getEngine()
+	aircraft = getAircraft()
+
+	altitude = 12E3
+	speed = 0.8 * Atmosphere(altitude).speed_of_sound
+
+	def fly() :
+
+		aircraft.mass_fuel = 21.685E3
+
+		for i in range(steps) :
+
+			aircraft.fly_aircraft(10.0, speed, altitude, engine, 'cruise')
+
+	return [measure('fly_aircraft[' + str(steps) + ' steps]', fly, steps)]
+
+def benchmarkMission(altitude = 3E3) :
+
+	engine = getEngine()
+
+	def fly() :
+
+		aircraft = getAircraft()
+
+		mission = Mission()
+		mission.altitude = altitude
+
+		mission.takeoff(aircraft, engine)
+		mission.landing(aircraft, engine)
+
+		return mission
+
+	steps = 2 * int(np.ceil(altitude * np.sqrt(10.0) / 150.0))
+
+	return [measure('Mission takeoff and landing[' + str(steps) + ' steps]', fly, steps)]
+
+def compare(records, baseline) :
+	'''Prints every record with its ratio of time to the baseline one'''
+
+	print('{:45s} {:>12s} {:>14s} {:>12s} {:>10s}'.format('Benchmark', 'Time [s]', 'Points / s', 'Peak [MB]', 'Baseline'))
+
+	for record in records :
+
+		if record['name'] in baseline :
+
+			ratio = record['seconds'] / baseline[record['name']]['seconds']
+			comparison = '{:.2f}x'.format(ratio) + (' SLOWER' if ratio > _regression_threshold else '')
+
+		else :
+
+			comparison = '-'
+
+		print('{:45s} {:12.4g} {:14.4g} {:12.1f} {:>10s}'.format(
+			record['name'], record['seconds'], record['throughput'], record['peak_bytes'] / 1E6, comparison
+		))
+
+	pass
+
+if __name__ == '__main__' :
+
+	parser = argparse.ArgumentParser(description='Benchmarks of the cycle, aircraft and mission hot paths')
+
+	parser.add_argument('--max-points', type=float, default=1E7, help='largest array size of the performAnalysis benchmarks')
+	parser.add_argument('--baseline', default=_default_baseline, help='baseline JSON file to compare against')
+	parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+
+	arguments = parser.parse_args()
+
+	# Off-design points of the grids produce NaN, which is expected here
+	warnings.simplefilter('ignore', RuntimeWarning)
+
+	records = []
+
+	records += benchmarkPerformAnalysis(arguments.max_points)
+	records += benchmarkGetters()
+	records += benchmarkFlyAircraft()
+	records += benchmarkMission()
+
+	baseline = {}
+
+	if os.path.exists(arguments.baseline) :
+
+		with open(arguments.baseline) as file :
+
+			baseline = {record['name'] : record for record in json.load(file)['records']}
+
+	compare(records, baseline)
+
+	if arguments.save :
+
+		with open(arguments.baseline, 'w') as file :
+
+			json.dump({'numpy' : np.__version__, 'records' : records}, file, indent='\t')
+
+		print('Baseline saved to', arguments.baseline)
+
+	pass